@@ -1,7 +1,14 @@
 """Legacy helper for extracting tuning parameters from archived economy docs."""
 
+import argparse
+import ast
 import csv
+import hashlib
+import io
+import json
 import re
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 
 
@@ -20,128 +27,414 @@ FILES = [
     ROOT / "docs" / "archive" / "economy" / "economy.md",
     ROOT / "docs" / "normalized_economy.json",
 ]
+OUTPUT_PATH = ROOT / "tuning_parameters.csv"
+FIELDNAMES = ["parameter", "value", "units", "category", "impact", "source"]
+SCAN_SUFFIXES = frozenset({".md", ".json", ".csv", ".mmd"})
+CACHE_PATH = ROOT / ".cache" / "tuning_csv.json"
+# Below this many changed files the process pool costs more than it saves.
+PARALLEL_MIN_FILES = 8
 
 
 citation_pattern = re.compile(r"【[^】]*】")
-number_pattern = re.compile(r"\d+(?:\.\d+)?")
-fraction_pattern = re.compile(r"(\d+(?:\.\d+)?)\s*/\s*(\d+(?:\.\d+)?)")
+heading_pattern = re.compile(r"^\s*#+\s*\d*\.*\s*")
+# One scan per line: a number, optionally followed by "/ denominator".
+value_pattern = re.compile(r"(\d+(?:\.\d+)?)(?:\s*/\s*(\d+(?:\.\d+)?))?")
+token_pattern = re.compile(r"\S+")
+non_alnum_pattern = re.compile(r"[^a-z0-9\s]")
+unit_word_pattern = re.compile(r"[a-z_]+")
+cap_pattern = re.compile(r"limit|cap|max|clamp|capped")
 
+UNIT_PREFIX_CHARS = 12
+UNIT_SUFFIX_CHARS = 32
+WINDOW_CHARS = 40
 
-def detect_units(prefix: str, suffix: str) -> str:
-    prefix_window = prefix[-12:]
-    suffix_window = suffix[:32]
-    prefix_lower = prefix[-40:].lower()
-    suffix_lower = suffix_window.lower()
+MINUTE_WORDS = frozenset({"minutes", "minute", "min"})
+HOUR_WORDS = frozenset({"hours", "hour", "hr", "hrs"})
+DAY_WORDS = frozenset({"days", "day"})
+LEVEL_WORDS = frozenset({"level", "levels"})
+COUNT_WORDS = frozenset({
+    "posts", "chapters", "videos", "shoots", "research", "listings", "ads", "reviews", "seo", "covers",
+    "episodes", "promos", "features", "stability", "edge", "marketing",
+})
+TIME_UNITS = frozenset({"minutes", "hours", "days"})
+TIME_TOKENS = frozenset({"hour", "hours", "time", "minute", "minutes", "day", "days"})
+LIMIT_TOKENS = frozenset({"limit", "cap", "max", "maximum", "clamp", "capped"})
+COST_TOKENS = frozenset({
+    "cost", "tuition", "wage", "wages", "hire", "purchase", "price", "pay", "pays", "spend", "spent",
+    "salary", "salaries",
+})
+INCOME_TOKENS = frozenset({
+    "mult", "multiplier", "bonus", "boost", "variance", "payout", "income", "earn", "earns", "earning",
+    "earnings", "wage", "wages", "salary", "salaries",
+})
+REQUIREMENT_TOKENS = frozenset({
+    "require", "requires", "required", "needs", "minimum", "posts", "chapters", "videos", "shoots",
+    "features", "stability", "marketing", "ads", "reviews", "seo", "edge", "count", "counts", "listing",
+    "listings",
+})
+PROGRESSION_TOKENS = frozenset({"level", "levels", "threshold", "tier", "tiers"})
+
+json_token_pattern = re.compile(
+    r'[ \t\r\n]*(?:(?P<string>"(?:[^"\\]|\\.)*")'
+    r"|(?P<number>-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+    r"|(?P<literal>true|false|null)"
+    r"|(?P<punct>[{}\[\]:,]))"
+)
+
+# Units, category, and impact for every numeric field in normalized_economy.json.
+FIELD_RULES = {
+    "setup_time": ("minutes", "time", "linear"),
+    "maintenance_time": ("minutes", "time", "linear"),
+    "setup_minutes_per_day": ("minutes", "time", "linear"),
+    "minutes_per_day": ("minutes", "time", "linear"),
+    "bonus_minutes_per_day": ("minutes", "time", "linear"),
+    "setup_days": ("days", "time", "linear"),
+    "days": ("days", "time", "linear"),
+    "setup_cost": ("usd", "cost", "linear"),
+    "maintenance_cost": ("usd", "cost", "linear"),
+    "hiring_cost": ("usd", "cost", "linear"),
+    "daily_wage": ("usd", "cost", "linear"),
+    "hourly_wage": ("usd", "cost", "linear"),
+    "base_income": ("usd", "income", "linear"),
+    "income_min": ("usd", "income", "linear"),
+    "income_max": ("usd", "income", "linear"),
+    "variance": ("ratio", "income", "linear"),
+    "daily_limit": ("count", "limit", "cap"),
+    "max_count": ("count", "limit", "cap"),
+    "level": ("level", "progression", "linear"),
+    "base_xp": ("xp", "xp", "linear"),
+    "weight": ("ratio", "xp", "linear"),
+    "count": ("count", "requirement", "linear"),
+}
+REQUIREMENT_RULE = ("count", "requirement", "linear")
+UNKNOWN_RULE = ("", "other", "linear")
+
+# Modifier formulas are reported as one value each: the factor for multipliers and
+# the delta for flat/add modifiers, with units taken from the targeted attribute.
+MODIFIER_ATTRIBUTE_RULES = {
+    "income": ("usd", "income"),
+    "setup_time": ("minutes", "time"),
+    "maintenance_time": ("minutes", "time"),
+    "bonus": ("minutes", "time"),
+    "quality_progress": ("count", "progression"),
+}
+FORMULA_VARIABLES = frozenset({"income", "minutes", "progress", "cash"})
+
+
+class LineText:
+    """One line lowered and tokenized once, sliced for every value found on it."""
+
+    __slots__ = ("text", "lower", "token_starts", "token_ends", "tokens")
+
+    def __init__(self, text: str):
+        self.text = text
+        lower = text.lower()
+        # Case folding can change the length of exotic characters; positions would drift.
+        self.lower = lower if len(lower) == len(text) else None
+        self.token_starts = []
+        self.token_ends = []
+        self.tokens = []
+        if self.lower is not None:
+            normalized = non_alnum_pattern.sub(" ", lower.replace("_", " "))
+            for match in token_pattern.finditer(normalized):
+                self.token_starts.append(match.start())
+                self.token_ends.append(match.end())
+                self.tokens.append(match.group(0))
+
+    def lowered(self, start: int, end: int) -> str:
+        start = max(start, 0)
+        if self.lower is None:
+            return self.text[start:end].lower()
+        return self.lower[start:end]
+
+    def token_set(self, start: int, end: int) -> frozenset:
+        """Tokens of ``text[start:end]``, with tokens cut by the window edges truncated."""
+
+        start = max(start, 0)
+        if self.lower is None:
+            window = self.text[start:end].lower().replace("_", " ")
+            return frozenset(non_alnum_pattern.sub(" ", window).split())
+        first = bisect_right(self.token_ends, start)
+        last = bisect_left(self.token_starts, end)
+        tokens = set()
+        for index in range(first, last):
+            token = self.tokens[index]
+            token_start = self.token_starts[index]
+            if token_start < start or self.token_ends[index] > end:
+                token = token[max(start - token_start, 0):end - token_start]
+            tokens.add(token)
+        return frozenset(tokens)
+
+
+def units_at(line: LineText, start: int, end: int) -> str:
+    """Guess the unit for the value spanning ``line.text[start:end]``."""
 
+    prefix_window = line.text[max(start - UNIT_PREFIX_CHARS, 0):start]
     if "$" in prefix_window:
         return "usd"
+    suffix_lower = line.lowered(end, end + UNIT_SUFFIX_CHARS)
     if suffix_lower.strip().startswith("%") or prefix_window.strip().endswith("%"):
         return "percent"
 
-    cleaned_suffix = suffix_lower.lstrip(" `\"'(")
-    word_match = re.match(r"([a-z_]+)", cleaned_suffix)
-    word = word_match.group(1) if word_match else ""
+    word_match = unit_word_pattern.match(suffix_lower.lstrip(" `\"'("))
+    word = word_match.group(0) if word_match else ""
+    prefix_lower = line.lowered(start - WINDOW_CHARS, start)
 
-    if word in {"minutes", "minute", "min"}:
+    if word in MINUTE_WORDS:
         return "minutes"
-    if word in {"hours", "hour", "hr", "hrs"}:
+    if word in HOUR_WORDS:
         return "hours"
-    if word in {"days", "day"}:
+    if word in DAY_WORDS:
         return "days"
-    if word in {"xp"} or "xp" in prefix_lower:
+    if word == "xp" or "xp" in prefix_lower:
         return "xp"
-    if word in {"level", "levels"}:
+    if word in LEVEL_WORDS:
         return "level"
-    if word in {"posts", "chapters", "videos", "shoots", "research", "listings", "ads", "reviews", "seo", "covers", "episodes", "promos", "features", "stability", "edge", "marketing"}:
+    if word in COUNT_WORDS:
         return "count"
     if "requires" in prefix_lower and word:
         return "count"
     return ""
 
 
-def detect_category(window: str, units: str) -> str:
-    text = window.lower()
-    normalized = re.sub(r"[^a-z0-9\s]", " ", text.replace("_", " "))
-    tokens = set(normalized.split())
+def category_for(tokens: frozenset, units: str) -> str:
     if units == "xp" or "xp" in tokens:
         return "xp"
-    if units in {"minutes", "hours", "days"} or any(word in tokens for word in ["hour", "hours", "time", "minute", "minutes", "day", "days"]):
+    if units in TIME_UNITS or not tokens.isdisjoint(TIME_TOKENS):
         return "time"
-    if any(word in tokens for word in ["limit", "cap", "max", "maximum", "clamp", "capped"]):
+    if not tokens.isdisjoint(LIMIT_TOKENS):
         return "limit"
-    if units == "usd" or any(word in tokens for word in ["cost", "tuition", "wage", "wages", "hire", "purchase", "price", "pay", "pays", "spend", "spent", "salary", "salaries"]):
+    if units == "usd" or not tokens.isdisjoint(COST_TOKENS):
         return "cost"
-    if units == "percent" or any(word in tokens for word in ["mult", "multiplier", "bonus", "boost", "variance", "payout", "income", "earn", "earns", "earning", "earnings", "wage", "wages", "salary", "salaries"]):
+    if units == "percent" or not tokens.isdisjoint(INCOME_TOKENS):
         return "income"
-    if any(word in tokens for word in ["require", "requires", "required", "needs", "minimum", "posts", "chapters", "videos", "shoots", "features", "stability", "marketing", "ads", "reviews", "seo", "edge", "count", "counts", "listing", "listings"]):
+    if not tokens.isdisjoint(REQUIREMENT_TOKENS):
         return "requirement"
-    if any(word in tokens for word in ["level", "levels", "threshold", "tier", "tiers"]):
+    if not tokens.isdisjoint(PROGRESSION_TOKENS):
         return "progression"
     return "other"
 
 
+def impact_for(window_lower: str) -> str:
+    return "cap" if cap_pattern.search(window_lower) else "linear"
+
+
+def detect_units(prefix: str, suffix: str) -> str:
+    return units_at(LineText(prefix + suffix), len(prefix), len(prefix))
+
+
+def detect_category(window: str, units: str) -> str:
+    return category_for(LineText(window).token_set(0, len(window)), units)
+
+
 def detect_impact(window: str) -> str:
-    text = window.lower()
-    if any(word in text for word in ["limit", "cap", "max", "clamp", "capped"]):
-        return "cap"
-    if any(word in text for word in ["mult", "variance", "bonus", "boost", "double", "increase", "decrease", "add", "plus", "minus"]):
-        return "linear"
-    return "linear"
+    return impact_for(window.lower())
 
 
 def clean_context(line: str) -> str:
     return " ".join(line.strip().split())
 
 
-def extract_from_file(path: Path):
+def scan_line(text: str):
+    """Yield ``(value, units, category, impact)`` for every number on ``text``.
+
+    Fractions are reported first and standalone numbers second, matching the
+    historical two-pass export order. A fraction with a zero denominator falls
+    back to its two numbers.
+    """
+
+    line = LineText(text)
+    fractions = []
+    numbers = []
+
+    def describe(value: str, start: int, end: int):
+        units = units_at(line, start, end)
+        window_start = start - WINDOW_CHARS
+        window_end = end + WINDOW_CHARS
+        category = category_for(line.token_set(window_start, window_end), units)
+        impact = impact_for(line.lowered(window_start, window_end))
+        return value, units, category, impact
+
+    for match in value_pattern.finditer(text):
+        denominator = match.group(2)
+        if denominator is not None and float(denominator) != 0:
+            value = float(match.group(1)) / float(denominator)
+            fractions.append(describe(f"{value:.10g}", match.start(), match.end()))
+            continue
+        numbers.append(describe(match.group(1), match.start(1), match.end(1)))
+        if denominator is not None:
+            numbers.append(describe(denominator, match.start(2), match.end(2)))
+
+    return fractions + numbers
+
+
+def iter_json_values(text: str):
+    """Stream ``(path, kind, raw, line)`` for every scalar in a JSON document.
+
+    ``path`` is a tuple of object keys and array indices, ``kind`` is the token
+    group (``string``, ``number``, or ``literal``), and ``line`` is 1-based.
+    """
+
+    stack = []
+    expect_key = False
+    line = 1
+    position = 0
+    length = len(text)
+    while True:
+        match = json_token_pattern.match(text, position)
+        if match is None:
+            if text[position:].strip():
+                raise ValueError(f"Invalid JSON near line {line}")
+            return
+        kind = match.lastgroup
+        start = match.start(kind)
+        line += text.count("\n", position, start)
+        position = match.end()
+        raw = match.group(kind)
+        if kind == "punct":
+            if raw == "{":
+                stack.append(["object", None])
+                expect_key = True
+            elif raw == "[":
+                stack.append(["array", 0])
+                expect_key = False
+            elif raw in "}]":
+                stack.pop()
+                expect_key = False
+            elif raw == ",":
+                if stack[-1][0] == "object":
+                    expect_key = True
+                else:
+                    stack[-1][1] += 1
+        elif kind == "string" and expect_key:
+            stack[-1][1] = json.loads(raw)
+            expect_key = False
+        else:
+            yield tuple(frame[1] for frame in stack), kind, raw, line
+        if position >= length:
+            return
+
+
+def format_json_path(path) -> str:
+    parts = []
+    for part in path:
+        if isinstance(part, int):
+            parts.append(f"[{part}]")
+        else:
+            parts.append(("." if parts else "") + part)
+    return "".join(parts)
+
+
+def field_rule(path):
+    key = path[-1]
+    if isinstance(key, str) and key in FIELD_RULES:
+        return FIELD_RULES[key]
+    if "requirements" in path[:-1]:
+        return REQUIREMENT_RULE
+    return UNKNOWN_RULE
+
+
+def evaluate_formula(formula: str, variable_value: float) -> float:
+    """Evaluate a modifier formula with its variable (income, minutes, ...) bound to ``variable_value``."""
+
+    def evaluate(node):
+        if isinstance(node, ast.Expression):
+            return evaluate(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return node.value
+        if isinstance(node, ast.Name) and node.id in FORMULA_VARIABLES:
+            return variable_value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            return -evaluate(node.operand)
+        if isinstance(node, ast.BinOp):
+            left, right = evaluate(node.left), evaluate(node.right)
+            if isinstance(node.op, ast.Add):
+                return left + right
+            if isinstance(node.op, ast.Sub):
+                return left - right
+            if isinstance(node.op, ast.Mult):
+                return left * right
+            if isinstance(node.op, ast.Div):
+                return left / right
+        raise ValueError(f"Unsupported formula: {formula}")
+
+    return evaluate(ast.parse(formula, mode="eval"))
+
+
+def modifier_entry(fields, source: str):
+    target = fields.get("target", "")
+    attribute = target.split(".", 1)[1] if "." in target else ""
+    units, category = MODIFIER_ATTRIBUTE_RULES.get(attribute, ("", "other"))
+    if fields.get("type") == "multiplier":
+        value = evaluate_formula(fields["formula"], 1.0)
+        units = "multiplier"
+    else:
+        value = evaluate_formula(fields["formula"], 0.0)
+    return {
+        "parameter": f"{fields['path']} ({target})",
+        "value": f"{value:.10g}",
+        "units": units,
+        "category": category,
+        "impact": "linear",
+        "source": source,
+    }
+
+
+def extract_from_json(path: Path):
+    """Emit one entry per numeric field (and modifier formula) with its exact JSON path."""
+
     entries = []
+    source_path = relative_source(path)
+    modifier = None
+    for value_path, kind, raw, line in iter_json_values(path.read_text(encoding="utf-8")):
+        if len(value_path) == 3 and value_path[0] == "modifiers":
+            if modifier is None or modifier["index"] != value_path[1]:
+                if modifier is not None and "formula" in modifier:
+                    entries.append(modifier_entry(modifier, modifier["source"]))
+                modifier = {"index": value_path[1], "path": format_json_path(value_path[:2])}
+            if kind == "string":
+                modifier[value_path[2]] = json.loads(raw)
+                if value_path[2] == "formula":
+                    modifier["source"] = f"{source_path}:L{line}"
+            continue
+        if kind != "number":
+            continue
+        units, category, impact = field_rule(value_path)
+        entries.append(
+            {
+                "parameter": format_json_path(value_path),
+                "value": raw,
+                "units": units,
+                "category": category,
+                "impact": impact,
+                "source": f"{source_path}:L{line}",
+            }
+        )
+    if modifier is not None and "formula" in modifier:
+        entries.append(modifier_entry(modifier, modifier["source"]))
+    return entries
+
+
+def relative_source(path: Path) -> Path:
+    try:
+        return path.relative_to(ROOT)
+    except ValueError:
+        return path
+
+
+def extract_from_file(path: Path, structured_json: bool = True):
+    if structured_json and path.suffix == ".json":
+        return extract_from_json(path)
+    entries = []
+    source_path = relative_source(path)
     with path.open("r", encoding="utf-8") as fh:
         for idx, line in enumerate(fh, start=1):
             filtered = citation_pattern.sub("", line)
-            stripped = filtered.lstrip()
-            if stripped.startswith("#"):
-                filtered = re.sub(r"^\s*#+\s*\d*\.*\s*", "", filtered)
+            if filtered.lstrip().startswith("#"):
+                filtered = heading_pattern.sub("", filtered)
             base_context = clean_context(filtered)
-            line_to_scan = filtered
-            used_spans = []
-            for match in fraction_pattern.finditer(line_to_scan):
-                num = float(match.group(1))
-                den = float(match.group(2))
-                if den == 0:
-                    continue
-                value = num / den
-                start, end = match.span()
-                prefix = line_to_scan[:start]
-                suffix = line_to_scan[end:]
-                units = detect_units(prefix, suffix)
-                window = (prefix[-40:] + match.group(0) + suffix[:40])
-                category = detect_category(window, units)
-                impact = detect_impact(window)
-                entries.append(
-                    {
-                        "parameter": base_context,
-                        "value": f"{value:.10g}",
-                        "units": units,
-                        "category": category,
-                        "impact": impact,
-                        "source": f"{path.relative_to(ROOT)}:L{idx}",
-                    }
-                )
-                used_spans.append((match.start(1), match.end(1)))
-                used_spans.append((match.start(2), match.end(2)))
-
-            for match in number_pattern.finditer(line_to_scan):
-                span = match.span()
-                if any(s <= span[0] < e or s < span[1] <= e for s, e in used_spans):
-                    continue
-                value = match.group(0)
-                start, end = span
-                prefix = line_to_scan[:start]
-                suffix = line_to_scan[end:]
-                units = detect_units(prefix, suffix)
-                window = (prefix[-40:] + value + suffix[:40])
-                category = detect_category(window, units)
-                impact = detect_impact(window)
+            source = f"{source_path}:L{idx}"
+            for value, units, category, impact in scan_line(filtered):
                 entries.append(
                     {
                         "parameter": base_context,
@@ -149,21 +442,38 @@ def extract_from_file(path: Path):
                         "units": units,
                         "category": category,
                         "impact": impact,
-                        "source": f"{path.relative_to(ROOT)}:L{idx}",
+                        "source": source,
                     }
                 )
     return entries
 
 
-def main():
-    all_entries = []
-    for path in FILES:
-        all_entries.extend(extract_from_file(path))
+def expand_paths(paths):
+    """Resolve files and directories (scanned recursively) into a sorted file list."""
 
-    # remove duplicate rows
+    files = []
+    for path in paths:
+        path = Path(path).resolve()
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    candidate
+                    for candidate in path.rglob("*")
+                    if candidate.is_file()
+                    and candidate.suffix in SCAN_SUFFIXES
+                    and candidate.resolve() != OUTPUT_PATH
+                    and candidate.name != OUTPUT_PATH.name
+                )
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def dedupe(entries):
     seen = set()
     deduped = []
-    for entry in all_entries:
+    for entry in entries:
         key = (
             entry["source"],
             entry["value"],
@@ -175,15 +485,166 @@ def main():
             continue
         seen.add(key)
         deduped.append(entry)
+    return deduped
 
-    output_path = ROOT / "tuning_parameters.csv"
+
+def write_csv(entries, output_path: Path = OUTPUT_PATH):
     with output_path.open("w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(
-            csvfile,
-            fieldnames=["parameter", "value", "units", "category", "impact", "source"],
-        )
+        writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
         writer.writeheader()
-        writer.writerows(deduped)
+        writer.writerows(entries)
+
+
+def extractor_version() -> str:
+    """Hash of this script, so editing the extraction rules invalidates cached entries."""
+
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def file_digest(path: Path, structured_json: bool) -> str:
+    digest = hashlib.sha256(path.read_bytes())
+    digest.update(b"structured" if structured_json else b"text")
+    return digest.hexdigest()
+
+
+def load_cache(cache_path: Path, version: str):
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != version:
+        return {}
+    return cache.get("files", {})
+
+
+def save_cache(cache_path: Path, version: str, files) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({"version": version, "files": files}), encoding="utf-8")
+    tmp_path.replace(cache_path)
+
+
+def extract_rows(path: Path, structured_json: bool = True):
+    """Deduplicated entries for one file as CSV rows (lists in ``FIELDNAMES`` order).
+
+    The dedupe key includes ``source``, which names the file, so deduplicating
+    per file matches deduplicating the merged export.
+    """
+
+    entries = dedupe(extract_from_file(path, structured_json=structured_json))
+    return [[entry[field] for field in FIELDNAMES] for entry in entries]
+
+
+def extract_incremental(files, structured_json: bool = True, cache_path: Path = CACHE_PATH, jobs=None):
+    """Return per-file rows for ``files``, re-extracting only files whose content changed.
+
+    Changed files are extracted across a process pool when there are at least
+    ``PARALLEL_MIN_FILES`` of them. A file listed more than once (directly or
+    via overlapping directories) is extracted and returned once, at its first
+    position. Returns ``(rows_by_file, changed_paths)``; ``rows_by_file`` keeps
+    that order.
+    """
+
+    files = list(dict.fromkeys(Path(path).resolve() for path in files))
+    version = extractor_version()
+    cached = load_cache(cache_path, version)
+    digests = {}
+    changed = []
+    for path in files:
+        key = str(path)
+        digests[key] = file_digest(path, structured_json)
+        entry = cached.get(key)
+        if entry is None or entry["digest"] != digests[key]:
+            changed.append(path)
+
+    fresh = {}
+    if len(changed) >= PARALLEL_MIN_FILES and (jobs is None or jobs > 1):
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(extract_rows, changed, [structured_json] * len(changed))
+            fresh = dict(zip(map(str, changed), results))
+    else:
+        for path in changed:
+            fresh[str(path)] = extract_rows(path, structured_json)
+
+    rows_by_file = {}
+    for path in files:
+        key = str(path)
+        rows_by_file[key] = fresh[key] if key in fresh else cached[key]["rows"]
+    if changed or set(cached) != set(digests):
+        save_cache(
+            cache_path,
+            version,
+            {key: {"digest": digests[key], "rows": rows} for key, rows in rows_by_file.items()},
+        )
+    return rows_by_file, changed
+
+
+def write_rows_if_changed(rows, output_path: Path = OUTPUT_PATH) -> bool:
+    """Write the CSV only when its content differs from what is on disk."""
+
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer, lineterminator="\r\n")
+    writer.writerow(FIELDNAMES)
+    writer.writerows(rows)
+    content = buffer.getvalue()
+    try:
+        with output_path.open("r", newline="", encoding="utf-8") as existing:
+            if existing.read() == content:
+                return False
+    except OSError:
+        pass
+    with output_path.open("w", newline="", encoding="utf-8") as csvfile:
+        csvfile.write(content)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="Files or directories to scan (directories are walked for .md/.json/.csv/.mmd). "
+        "Defaults to the archived handbook plus the normalized dataset.",
+    )
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument(
+        "--text-json",
+        action="store_true",
+        help="Scrape JSON files line by line like prose instead of walking their structure.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Reuse cached entries for files whose content hash is unchanged (cache: {CACHE_PATH.relative_to(ROOT)}).",
+    )
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH, help="Cache file used by --incremental.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help=f"Worker processes when at least {PARALLEL_MIN_FILES} files changed (default: CPU count).",
+    )
+    args = parser.parse_args(argv)
+
+    files = expand_paths(args.paths) if args.paths else FILES
+    if args.incremental:
+        rows_by_file, changed = extract_incremental(
+            files,
+            structured_json=not args.text_json,
+            cache_path=args.cache,
+            jobs=args.jobs,
+        )
+        rows = [row for file_rows in rows_by_file.values() for row in file_rows]
+        written = write_rows_if_changed(rows, args.output)
+        print(f"{len(changed)}/{len(rows_by_file)} files re-extracted; {'wrote' if written else 'unchanged'} {args.output}")
+        return
+
+    all_entries = []
+    for path in files:
+        all_entries.extend(extract_from_file(path, structured_json=not args.text_json))
+
+    write_csv(dedupe(all_entries), args.output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+"""Assistant hiring policies evaluated side by side in one batched run.
+
+Each row of the batch pairs a config with a ``HiringPolicy``. Policies start
+with ``initial`` assistants (hired before day 1, exactly like
+``run_simulation``), may hire one more at the start of any day when cash
+clears ``hire_threshold`` plus the hiring cost, and may fire one when the last
+assistant's wage has exceeded the income their extra hours produced for
+``patience`` consecutive days (fired seats are not refilled). The marginal
+income is the day's hustle income per hustle hour times the assistant hours
+that were actually used; idle time at the end of the day earns nothing.
+"""
+
+import argparse
+import dataclasses
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from scripts.economy_batch import BatchState, compile_batch, step_day
+from scripts.economy_simulations import SimulationConfig, load_data
+
+
+@dataclass(frozen=True)
+class HiringPolicy:
+    name: str
+    initial: int = 0
+    hire_threshold: Optional[float] = None
+    max_assistants: int = 3
+    fire_when_unprofitable: bool = False
+    patience: int = 3
+
+
+def fixed_policies(counts: Sequence[int] = range(0, 4)) -> List[HiringPolicy]:
+    """The classic up-front scenarios: hire ``count`` assistants on day 1 and keep them."""
+
+    return [HiringPolicy(f'fixed_{count}', initial=count, max_assistants=count) for count in counts]
+
+
+DEFAULT_POLICIES = fixed_policies() + [
+    HiringPolicy('hire_above_500', hire_threshold=500.0),
+    HiringPolicy('hire_above_500_fire_idle', hire_threshold=500.0, fire_when_unprofitable=True),
+    HiringPolicy('hire_above_1500', hire_threshold=1500.0),
+]
+
+
+@dataclass
+class PolicyEvaluation:
+    policies: List[HiringPolicy]
+    cash_end: np.ndarray  # (policies, days)
+    assistants: np.ndarray  # (policies, days) head count at the end of each day
+    wages: np.ndarray  # (policies, days)
+    hires: np.ndarray  # every assistant hired, including the ``initial`` ones
+    fires: np.ndarray
+    starting_cash: float
+    baseline_cash_end: np.ndarray  # (days,) the no-assistant run
+
+    def break_even_days(self) -> np.ndarray:
+        """First day each policy's cash is back at the starting cash (``NaN`` if never)."""
+
+        return _first_day(self.cash_end >= self.starting_cash)
+
+    def overtake_days(self) -> np.ndarray:
+        """First day from which each policy stays at or above the no-assistant baseline."""
+
+        ahead = self.cash_end >= self.baseline_cash_end
+        stays = np.flip(np.logical_and.accumulate(np.flip(ahead, axis=1), axis=1), axis=1)
+        return _first_day(stays)
+
+    def summary(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                'policy': [policy.name for policy in self.policies],
+                'final_cash': self.cash_end[:, -1],
+                'break_even_day': self.break_even_days(),
+                'overtakes_baseline_day': self.overtake_days(),
+                'hires': self.hires,
+                'fires': self.fires,
+                'peak_assistants': self.assistants.max(axis=1),
+                'total_wages': self.wages.sum(axis=1),
+            }
+        )
+
+
+def _first_day(hits: np.ndarray) -> np.ndarray:
+    return np.where(hits.any(axis=1), hits.argmax(axis=1) + 1, np.nan)
+
+
+def evaluate_policies(
+    data: Dict,
+    policies: Sequence[HiringPolicy] = DEFAULT_POLICIES,
+    days: int = 90,
+    config: Optional[SimulationConfig] = None,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> PolicyEvaluation:
+    """Simulate every policy plus a no-assistant baseline in a single batch.
+
+    Fixed policies reproduce ``run_simulation(..., assistants=count)`` exactly.
+    """
+
+    if days < 1:
+        raise ValueError('days must be at least 1')
+    config = config or SimulationConfig()
+    policies = list(policies)
+    rows = policies + [HiringPolicy('_baseline', max_assistants=0)]
+    size = len(rows)
+
+    initial = np.array([policy.initial for policy in rows], dtype=np.int64)
+    threshold = np.array([np.inf if policy.hire_threshold is None else policy.hire_threshold for policy in rows])
+    ceiling = np.array([policy.max_assistants for policy in rows], dtype=np.int64)
+    fire_enabled = np.array([policy.fire_when_unprofitable for policy in rows])
+    patience = np.array([policy.patience for policy in rows], dtype=np.int64)
+
+    plan = compile_batch(
+        data,
+        [config] * size,
+        assistants=initial,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+    state = BatchState.initial(plan)
+    base_hours = np.full(size, float(config.base_day_hours))
+    hours_per_assistant = float(config.assistant_hours_per_day)
+    wage_per_assistant = hours_per_assistant * float(config.assistant_hourly_rate)
+
+    hourly_rate = float(config.assistant_hourly_rate)
+
+    def staffed(plan, counts):
+        # Same operand order as compile_batch so fixed policies stay bit-exact.
+        return dataclasses.replace(
+            plan,
+            assistants=counts,
+            day_hours=base_hours + counts * hours_per_assistant + plan.time_bonus_minutes / 60,
+            assistant_daily_cost=counts * hours_per_assistant * hourly_rate,
+        )
+
+    counts = initial.copy()
+    hires = initial.copy()
+    fires = np.zeros(size, dtype=np.int64)
+    streak = np.zeros(size, dtype=np.int64)
+    cash_end = np.zeros((size, days))
+    head_count = np.zeros((size, days), dtype=np.int64)
+    wages = np.zeros((size, days))
+
+    for day in range(days):
+        # No new hires while the current last assistant is on an unprofitable streak.
+        hire = (counts < ceiling) & (streak == 0) & (state.cash >= threshold + plan.hire_cost)
+        state.cash = np.where(hire, state.cash - plan.hire_cost, state.cash)
+        counts = counts + hire
+        hires += hire
+        if hire.any():
+            plan = staffed(plan, counts)
+
+        today = step_day(plan, state)
+        cash_end[:, day] = today['cash_end']
+        wages[:, day] = today['assistant_wages']
+
+        if fire_enabled.any():
+            hustle_hours = today['hours_freelance'] + today['hours_survey']
+            used = hustle_hours + today['hours_asset_setup'] + today['hours_asset_maintenance']
+            idle = plan.day_hours - used
+            marginal_hours = np.clip(hours_per_assistant - idle, 0.0, hours_per_assistant)
+            safe_hours = np.where(hustle_hours > 0, hustle_hours, 1.0)
+            hourly_income = np.where(hustle_hours > 0, today['hustle_income'] / safe_hours, 0.0)
+            unprofitable = fire_enabled & (counts > 0) & (wage_per_assistant > marginal_hours * hourly_income)
+            streak = np.where(unprofitable, streak + 1, 0)
+            fire = streak >= patience
+            if fire.any():
+                counts = counts - fire
+                fires += fire
+                streak = np.where(fire, 0, streak)
+                # A fired assistant is not rehired by the threshold rule.
+                ceiling = np.where(fire, np.minimum(ceiling, counts), ceiling)
+                plan = staffed(plan, counts)
+        head_count[:, day] = counts
+
+    return PolicyEvaluation(
+        policies=policies,
+        cash_end=cash_end[:-1],
+        assistants=head_count[:-1],
+        wages=wages[:-1],
+        hires=hires[:-1],
+        fires=fires[:-1],
+        starting_cash=float(config.starting_cash),
+        baseline_cash_end=cash_end[-1],
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Compare assistant hiring policies in one batched run.')
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--threshold', type=float, action='append', default=None,
+                        help='Extra hire-above-cash policies to evaluate (repeatable).')
+    parser.add_argument('--asset', action='append', dest='assets', default=None)
+    parser.add_argument('--upgrade', action='append', dest='upgrades', default=None)
+    args = parser.parse_args(argv)
+
+    policies = list(DEFAULT_POLICIES)
+    for threshold in args.threshold or []:
+        policies.append(HiringPolicy(f'hire_above_{threshold:g}', hire_threshold=threshold))
+        policies.append(HiringPolicy(f'hire_above_{threshold:g}_fire_idle', hire_threshold=threshold,
+                                     fire_when_unprofitable=True))
+    evaluation = evaluate_policies(
+        load_data(),
+        policies,
+        days=args.days,
+        asset_ids=args.assets,
+        upgrade_ids=args.upgrades,
+    )
+    print(evaluation.summary().to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,724 @@
+"""Vectorized batch runner that mirrors ``economy_simulations.run_simulation``.
+
+Every scenario advances through the same day loop as the scalar simulator, but
+the per-asset and per-hustle steps operate on NumPy arrays shaped
+``(scenarios,)`` or ``(scenarios, asset_slots)``. Results match the scalar path
+exactly because the arithmetic is replayed in the same order.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from scripts.economy_simulations import (
+    EntityEffect,
+    SimulationConfig,
+    SimulationMetrics,
+    _average_income,
+    compute_upgrade_effects,
+)
+
+HUSTLE_IDS = ('freelance', 'surveySprint')
+
+DAY_COLUMNS = (
+    'cash_start',
+    'cash_end',
+    'hustle_income',
+    'asset_income',
+    'maintenance_spend',
+    'assistant_wages',
+    'hours_freelance',
+    'hours_survey',
+    'hours_asset_setup',
+    'hours_asset_maintenance',
+    'freelance_runs',
+    'survey_runs',
+    'active_asset_count',
+)
+
+AssistantSpec = Union[int, Sequence[int], np.ndarray]
+
+
+@dataclass
+class BatchPlan:
+    """Per-scenario constants compiled from configs, upgrades, and the dataset."""
+
+    asset_ids: List[Tuple[str, ...]]
+    asset_names: List[Tuple[str, ...]]
+    starting_cash: np.ndarray
+    assistants: np.ndarray
+    hire_cost: np.ndarray
+    day_hours: np.ndarray
+    assistant_daily_cost: np.ndarray
+    time_bonus_minutes: np.ndarray
+    asset_present: np.ndarray
+    setup_cost: np.ndarray
+    setup_days: np.ndarray
+    setup_hours: np.ndarray
+    maintenance_hours: np.ndarray
+    maintenance_cost: np.ndarray
+    daily_income: np.ndarray
+    freelance_hours: np.ndarray
+    freelance_income: np.ndarray
+    survey_hours: np.ndarray
+    survey_income: np.ndarray
+    survey_limit: np.ndarray
+
+    @property
+    def size(self) -> int:
+        return len(self.starting_cash)
+
+    @property
+    def slots(self) -> int:
+        return self.asset_present.shape[1]
+
+    def take(self, index: np.ndarray) -> 'BatchPlan':
+        values = {}
+        for name, value in self.__dict__.items():
+            if isinstance(value, np.ndarray):
+                values[name] = value[index]
+            else:
+                values[name] = [value[i] for i in np.asarray(index)]
+        return BatchPlan(**values)
+
+
+@dataclass
+class BatchState:
+    """Mutable per-scenario state carried from one day to the next."""
+
+    cash: np.ndarray
+    started: np.ndarray
+    active: np.ndarray
+    progress_days: np.ndarray
+    asset_income_total: np.ndarray
+    asset_income_days: np.ndarray
+    hustle_income_total: np.ndarray
+    hustle_runs_total: np.ndarray
+    day: int = 0
+
+    @classmethod
+    def initial(cls, plan: BatchPlan, compact: bool = False) -> 'BatchState':
+        """Fresh state for ``plan``; ``compact`` stores the day counters in small ints.
+
+        ``progress_days`` never exceeds an asset's ``setup_days`` and the run
+        counters grow by at most a few per day, so ``int16``/``int32`` hold
+        them exactly for any realistic horizon.
+        """
+
+        shape = plan.asset_present.shape
+        progress_dtype, counter_dtype = (np.int16, np.int32) if compact else (np.int64, np.int64)
+        return cls(
+            cash=plan.starting_cash - plan.assistants * plan.hire_cost,
+            started=np.zeros(shape, dtype=bool),
+            active=np.zeros(shape, dtype=bool),
+            progress_days=np.zeros(shape, dtype=progress_dtype),
+            asset_income_total=np.zeros(shape),
+            asset_income_days=np.zeros(shape, dtype=counter_dtype),
+            hustle_income_total=np.zeros((plan.size, len(HUSTLE_IDS))),
+            hustle_runs_total=np.zeros((plan.size, len(HUSTLE_IDS)), dtype=counter_dtype),
+        )
+
+    def take(self, index: np.ndarray) -> 'BatchState':
+        values = {
+            name: value[index] if isinstance(value, np.ndarray) else value
+            for name, value in self.__dict__.items()
+        }
+        return BatchState(**values)
+
+
+@dataclass
+class ExponentialFit:
+    """Per-row ``log(cash) = intercept + slope * day`` fits; rows with < 2 usable days are ``NaN``."""
+
+    slope: np.ndarray
+    intercept: np.ndarray
+    points: np.ndarray
+
+    @property
+    def daily_growth(self) -> np.ndarray:
+        return np.expm1(self.slope)
+
+    def fitted(self, days: np.ndarray) -> np.ndarray:
+        return np.exp(self.intercept[:, None] + self.slope[:, None] * np.asarray(days, dtype=float))
+
+
+def fit_exponential_batch(
+    cash: np.ndarray,
+    days: Optional[np.ndarray] = None,
+    mask: Optional[np.ndarray] = None,
+) -> ExponentialFit:
+    """Least-squares log-linear fit of every row of a ``(scenarios, days)`` cash matrix at once.
+
+    Matches ``fit_exponential`` row by row: only days with positive cash (and
+    ``mask``, when given) enter the fit. ``days`` defaults to ``1..n``.
+    """
+
+    cash = np.asarray(cash, dtype=float)
+    x = np.arange(1, cash.shape[1] + 1, dtype=float) if days is None else np.asarray(days, dtype=float)
+    x = np.broadcast_to(x, cash.shape)
+    weight = cash > 0
+    if mask is not None:
+        weight &= mask
+    log_y = np.log(np.where(weight, cash, 1.0))
+
+    points = weight.sum(axis=1)
+    safe_points = np.maximum(points, 1)
+    x_mean = np.where(weight, x, 0.0).sum(axis=1) / safe_points
+    y_mean = np.where(weight, log_y, 0.0).sum(axis=1) / safe_points
+    dx = np.where(weight, x - x_mean[:, None], 0.0)
+    dy = np.where(weight, log_y - y_mean[:, None], 0.0)
+    sxx = (dx * dx).sum(axis=1)
+    sxy = (dx * dy).sum(axis=1)
+
+    solvable = (points >= 2) & (sxx > 0)
+    slope = np.where(solvable, sxy / np.where(solvable, sxx, 1.0), np.nan)
+    intercept = np.where(solvable, y_mean - slope * x_mean, np.nan)
+    return ExponentialFit(slope=slope, intercept=intercept, points=points)
+
+
+def fit_exponential_piecewise(
+    cash: np.ndarray,
+    split_day: np.ndarray,
+    days: Optional[np.ndarray] = None,
+) -> Tuple[ExponentialFit, ExponentialFit]:
+    """Separate fits before and from ``split_day`` on (e.g. the first asset payout).
+
+    Rows whose ``split_day`` is ``NaN`` put every day in the "before" fit.
+    """
+
+    cash = np.asarray(cash, dtype=float)
+    x = np.arange(1, cash.shape[1] + 1, dtype=float) if days is None else np.asarray(days, dtype=float)
+    split = np.where(np.isnan(split_day), np.inf, split_day)[:, None]
+    after = x[None, :] >= split
+    return (
+        fit_exponential_batch(cash, x, mask=~after),
+        fit_exponential_batch(cash, x, mask=after),
+    )
+
+
+@dataclass
+class BatchResult:
+    """Day-by-day columns for every scenario, shaped ``(scenarios, days)``."""
+
+    plan: BatchPlan
+    columns: Dict[str, np.ndarray]
+    earning: np.ndarray
+    state: BatchState
+    days: int = 0
+
+    @property
+    def size(self) -> int:
+        return self.plan.size
+
+    @property
+    def cash_end(self) -> np.ndarray:
+        return self.columns['cash_end']
+
+    @property
+    def final_cash(self) -> np.ndarray:
+        return self.columns['cash_end'][:, -1]
+
+    @property
+    def activation_day(self) -> np.ndarray:
+        """First day any asset paid out, ``NaN`` if none did."""
+
+        paying = self.columns['active_asset_count'] > 0
+        return np.where(paying.any(axis=1), paying.argmax(axis=1) + 1, np.nan)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per scenario: final cash plus whole-run and pre/post-activation growth rates."""
+
+        overall = fit_exponential_batch(self.cash_end)
+        before, after = fit_exponential_piecewise(self.cash_end, self.activation_day)
+        return pd.DataFrame(
+            {
+                'final_cash': self.final_cash,
+                'growth_rate': overall.slope,
+                'activation_day': self.activation_day,
+                'growth_rate_pre_activation': before.slope,
+                'growth_rate_post_activation': after.slope,
+            }
+        )
+
+    def frame(self, index: int) -> pd.DataFrame:
+        """Rebuild the ``run_simulation`` DataFrame for one scenario."""
+
+        asset_ids = self.plan.asset_ids[index]
+        records = []
+        for day in range(self.days):
+            record = {'day': day + 1}
+            for name in DAY_COLUMNS[:-1]:
+                value = self.columns[name][index, day]
+                record[name] = int(value) if name.endswith('_runs') else float(value)
+            earning = [asset_ids[slot] for slot in np.flatnonzero(self.earning[index, day, : len(asset_ids)])]
+            record['active_assets'] = ', '.join(earning)
+            record['active_asset_count'] = len(earning)
+            record['time_bonus_minutes'] = float(self.plan.time_bonus_minutes[index])
+            records.append(record)
+        return pd.DataFrame(records)
+
+    def metrics(self, index: int) -> SimulationMetrics:
+        """Rebuild the ``SimulationMetrics`` totals for one scenario."""
+
+        metrics = SimulationMetrics(total_days=self.days)
+        for slot, asset_id in enumerate(self.plan.asset_ids[index]):
+            if self.state.asset_income_days[index, slot]:
+                metrics.asset_income[asset_id] = float(self.state.asset_income_total[index, slot])
+        for column, hustle_id in enumerate(HUSTLE_IDS):
+            runs = int(self.state.hustle_runs_total[index, column])
+            if runs:
+                metrics.hustle_income[hustle_id] = float(self.state.hustle_income_total[index, column])
+                metrics.hustle_runs[hustle_id] = runs
+        return metrics
+
+
+def _config_array(configs: Sequence[SimulationConfig], name: str) -> np.ndarray:
+    return np.array([getattr(config, name) for config in configs], dtype=float)
+
+
+def _selection(
+    config: SimulationConfig,
+    build_blog: bool,
+    asset_ids: Optional[Sequence[str]],
+    upgrade_ids: Optional[Sequence[str]],
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    if asset_ids is None:
+        assets = tuple(config.asset_ids)
+        if not assets and build_blog:
+            assets = ('blog',)
+    else:
+        assets = tuple(asset_ids)
+    upgrades = tuple(upgrade_ids) if upgrade_ids is not None else tuple(config.upgrade_ids)
+    return assets, upgrades
+
+
+def compile_batch(
+    data: Dict,
+    configs: Sequence[SimulationConfig],
+    assistants: AssistantSpec = 0,
+    build_blog: bool = True,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> BatchPlan:
+    """Resolve upgrades and config multipliers into flat per-scenario arrays.
+
+    ``asset_ids``/``upgrade_ids`` apply to every scenario when given; otherwise
+    each config's own selection is used, exactly like ``run_simulation``.
+    """
+
+    configs = list(configs)
+    size = len(configs)
+    assets = data['assets']
+    hustles = data['hustles']
+
+    assistant_counts = np.broadcast_to(np.asarray(assistants, dtype=np.int64), (size,)).copy()
+
+    selections = [_selection(config, build_blog, asset_ids, upgrade_ids) for config in configs]
+    resolved = [tuple(a for a in selection[0] if a in assets) for selection in selections]
+    slots = max((len(ids) for ids in resolved), default=0)
+
+    effects_cache: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], object] = {}
+
+    def effects_for(selection):
+        if selection not in effects_cache:
+            effects_cache[selection] = compute_upgrade_effects(
+                data, list(selection[0]), list(selection[1]), hustle_ids=list(HUSTLE_IDS)
+            )
+        return effects_cache[selection]
+
+    present = np.zeros((size, slots), dtype=bool)
+    setup_cost = np.zeros((size, slots))
+    setup_days = np.zeros((size, slots), dtype=np.int64)
+    setup_minutes = np.zeros((size, slots))
+    maintenance_minutes = np.zeros((size, slots))
+    maintenance_cost = np.zeros((size, slots))
+    base_income = np.zeros((size, slots))
+    income_mult = np.ones((size, slots))
+    income_flat = np.zeros((size, slots))
+    is_blog = np.zeros((size, slots), dtype=bool)
+
+    hustle_effects = {hustle_id: (np.ones(size), np.zeros(size), np.ones(size)) for hustle_id in HUSTLE_IDS}
+    time_bonus = np.zeros(size)
+
+    for row, (selection, asset_list) in enumerate(zip(selections, resolved)):
+        effects = effects_for(selection)
+        time_bonus[row] = effects.time_bonus_minutes
+        for hustle_id in HUSTLE_IDS:
+            effect = effects.hustle_effects.get(hustle_id, EntityEffect())
+            mult, flat, time_mult = hustle_effects[hustle_id]
+            mult[row] = effect.income_mult
+            flat[row] = effect.income_flat
+            time_mult[row] = effect.setup_time_mult
+        for slot, asset_id in enumerate(asset_list):
+            definition = assets[asset_id]
+            effect = effects.asset_effects.get(asset_id, EntityEffect())
+            present[row, slot] = True
+            is_blog[row, slot] = asset_id == 'blog'
+            setup_cost[row, slot] = definition['setup_cost']
+            setup_days[row, slot] = definition['schedule']['setup_days']
+            setup_minutes[row, slot] = definition['schedule']['setup_minutes_per_day'] * effect.setup_time_mult
+            maintenance_minutes[row, slot] = definition['maintenance_time'] * effect.maintenance_time_mult
+            maintenance_cost[row, slot] = definition['maintenance_cost']
+            base_income[row, slot] = _average_income(definition)
+            income_mult[row, slot] = effect.income_mult
+            income_flat[row, slot] = effect.income_flat
+
+    blog_setup = _config_array(configs, 'blog_setup_cost_multiplier')[:, None]
+    blog_maintenance = _config_array(configs, 'blog_maintenance_cost_multiplier')[:, None]
+    blog_income = _config_array(configs, 'blog_income_multiplier')[:, None]
+    setup_cost = np.where(is_blog, setup_cost * blog_setup, setup_cost)
+    maintenance_cost = np.where(is_blog, maintenance_cost * blog_maintenance, maintenance_cost)
+    base_income = np.where(is_blog, base_income * blog_income, base_income)
+
+    hire_cost = _config_array(configs, 'assistant_hire_cost')
+    hours_per_day = _config_array(configs, 'assistant_hours_per_day')
+    hourly_rate = _config_array(configs, 'assistant_hourly_rate')
+
+    freelance_def = hustles['freelance']
+    freelance_mult, freelance_flat, freelance_time = hustle_effects['freelance']
+    survey_def = hustles['surveySprint']
+    survey_mult, survey_flat, survey_time = hustle_effects['surveySprint']
+    survey_limit = survey_def['daily_limit']
+
+    plan = BatchPlan(
+        asset_ids=list(resolved),
+        asset_names=[tuple(assets[a]['name'] for a in ids) for ids in resolved],
+        starting_cash=_config_array(configs, 'starting_cash'),
+        assistants=assistant_counts,
+        hire_cost=hire_cost,
+        day_hours=(
+            _config_array(configs, 'base_day_hours')
+            + assistant_counts * hours_per_day
+            + time_bonus / 60
+        ),
+        assistant_daily_cost=assistant_counts * hours_per_day * hourly_rate,
+        time_bonus_minutes=time_bonus,
+        asset_present=present,
+        setup_cost=setup_cost,
+        setup_days=setup_days,
+        setup_hours=setup_minutes / 60,
+        maintenance_hours=maintenance_minutes / 60,
+        maintenance_cost=maintenance_cost,
+        daily_income=base_income * income_mult + income_flat,
+        freelance_hours=(freelance_def['setup_time'] / 60) * freelance_time,
+        freelance_income=(
+            freelance_def['base_income'] * _config_array(configs, 'freelance_income_multiplier') * freelance_mult
+            + freelance_flat
+        ),
+        survey_hours=(survey_def['setup_time'] / 60) * survey_time,
+        survey_income=(
+            survey_def['base_income'] * _config_array(configs, 'survey_income_multiplier') * survey_mult
+            + survey_flat
+        ),
+        survey_limit=np.full(size, np.iinfo(np.int64).max if survey_limit is None else survey_limit, dtype=np.int64),
+    )
+    return plan
+
+
+def _hustle_runs(hours_left: np.ndarray, hours_per_run: np.ndarray) -> np.ndarray:
+    runnable = hours_per_run > 0
+    safe = np.where(runnable, hours_per_run, 1.0)
+    return np.where(runnable, np.floor_divide(hours_left, safe), 0).astype(np.int64)
+
+
+def step_day(plan: BatchPlan, state: BatchState) -> Dict[str, np.ndarray]:
+    """Advance every scenario by one day and return that day's columns.
+
+    The returned mapping holds one ``(scenarios,)`` array per ``DAY_COLUMNS``
+    entry plus an ``earning`` mask of the asset slots that paid out today.
+    """
+
+    size = plan.size
+    cash = state.cash
+    cash_start = cash.copy()
+    hours_left = plan.day_hours.copy()
+    hustle_income_today = np.zeros(size)
+    asset_income_today = np.zeros(size)
+    maintenance_spend_today = np.zeros(size)
+    setup_hours_today = np.zeros(size)
+    maintenance_hours_today = np.zeros(size)
+    earning = np.zeros(plan.asset_present.shape, dtype=bool)
+
+    started = state.started
+    active = state.active
+    progress = state.progress_days
+
+    for slot in range(plan.slots):
+        buy = plan.asset_present[:, slot] & ~started[:, slot] & (cash >= plan.setup_cost[:, slot])
+        cash = np.where(buy, cash - plan.setup_cost[:, slot], cash)
+        started[:, slot] |= buy
+        progress[:, slot] = np.where(buy, 0, progress[:, slot])
+        active[:, slot] |= buy & (plan.setup_days[:, slot] == 0)
+
+    for slot in range(plan.slots):
+        pending = started[:, slot] & ~active[:, slot]
+        required = plan.setup_hours[:, slot]
+        instant = pending & ((plan.setup_days[:, slot] == 0) | (required == 0))
+        work = pending & ~instant & (hours_left >= required)
+        hours_left = np.where(work, hours_left - required, hours_left)
+        setup_hours_today = np.where(work, setup_hours_today + required, setup_hours_today)
+        progress[:, slot] += work
+        active[:, slot] |= instant | (work & (progress[:, slot] >= plan.setup_days[:, slot]))
+
+    for slot in range(plan.slots):
+        maintenance_hours = plan.maintenance_hours[:, slot]
+        funded = active[:, slot] & ~((maintenance_hours > hours_left) & (maintenance_hours > 0))
+        spend_time = funded & (maintenance_hours > 0)
+        hours_left = np.where(spend_time, hours_left - maintenance_hours, hours_left)
+        maintenance_hours_today = np.where(
+            spend_time, maintenance_hours_today + maintenance_hours, maintenance_hours_today
+        )
+        cost = plan.maintenance_cost[:, slot]
+        income = plan.daily_income[:, slot]
+        cash = np.where(funded, cash - cost, cash)
+        maintenance_spend_today = np.where(funded, maintenance_spend_today + cost, maintenance_spend_today)
+        cash = np.where(funded, cash + income, cash)
+        asset_income_today = np.where(funded, asset_income_today + income, asset_income_today)
+        state.asset_income_total[:, slot] = np.where(
+            funded, state.asset_income_total[:, slot] + income, state.asset_income_total[:, slot]
+        )
+        state.asset_income_days[:, slot] += funded
+        earning[:, slot] = funded
+
+    hustle_hours = {}
+    hustle_runs = {}
+    hustle_plans = (
+        (plan.freelance_hours, plan.freelance_income, None),
+        (plan.survey_hours, plan.survey_income, plan.survey_limit),
+    )
+    for column, (hours_per_run, income, limit) in enumerate(hustle_plans):
+        runs = _hustle_runs(hours_left, hours_per_run)
+        if limit is not None:
+            runs = np.minimum(runs, limit)
+        spent = np.zeros(size)
+        for run in range(int(runs.max(initial=0))):
+            doing = run < runs
+            hours_left = np.where(doing, hours_left - hours_per_run, hours_left)
+            spent = np.where(doing, spent + hours_per_run, spent)
+            cash = np.where(doing, cash + income, cash)
+            hustle_income_today = np.where(doing, hustle_income_today + income, hustle_income_today)
+            state.hustle_income_total[:, column] = np.where(
+                doing, state.hustle_income_total[:, column] + income, state.hustle_income_total[:, column]
+            )
+        state.hustle_runs_total[:, column] += runs
+        hustle_hours[column] = spent
+        hustle_runs[column] = runs
+
+    wages_today = plan.assistant_daily_cost
+    cash = cash - wages_today
+
+    state.cash = cash
+    state.day += 1
+    return {
+        'cash_start': cash_start,
+        'cash_end': cash,
+        'hustle_income': hustle_income_today,
+        'asset_income': asset_income_today,
+        'maintenance_spend': maintenance_spend_today,
+        'assistant_wages': wages_today,
+        'hours_freelance': hustle_hours[0],
+        'hours_survey': hustle_hours[1],
+        'hours_asset_setup': setup_hours_today,
+        'hours_asset_maintenance': maintenance_hours_today,
+        'freelance_runs': hustle_runs[0],
+        'survey_runs': hustle_runs[1],
+        'active_asset_count': earning.sum(axis=1),
+        'earning': earning,
+    }
+
+
+def run_simulation_batch(
+    data: Dict,
+    configs: Sequence[SimulationConfig],
+    days: int = 30,
+    assistants: AssistantSpec = 0,
+    build_blog: bool = True,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> BatchResult:
+    """Simulate every config in lock-step; row ``i`` equals ``run_simulation`` for ``configs[i]``."""
+
+    plan = compile_batch(
+        data,
+        configs,
+        assistants=assistants,
+        build_blog=build_blog,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+    state = BatchState.initial(plan)
+    columns = {name: np.zeros((plan.size, days)) for name in DAY_COLUMNS}
+    for name in ('freelance_runs', 'survey_runs', 'active_asset_count'):
+        columns[name] = np.zeros((plan.size, days), dtype=np.int64)
+    earning = np.zeros((plan.size, days, plan.slots), dtype=bool)
+
+    for day in range(days):
+        today = step_day(plan, state)
+        for name in DAY_COLUMNS:
+            columns[name][:, day] = today[name]
+        earning[:, day] = today['earning']
+
+    return BatchResult(plan=plan, columns=columns, earning=earning, state=state, days=days)
+
+
+def final_cash_batch(
+    data: Dict,
+    configs: Sequence[SimulationConfig],
+    days: int = 30,
+    assistants: AssistantSpec = 0,
+    build_blog: bool = True,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> np.ndarray:
+    """Return only the last day's ``cash_end`` per config, without keeping daily history."""
+
+    plan = compile_batch(
+        data,
+        configs,
+        assistants=assistants,
+        build_blog=build_blog,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+    state = BatchState.initial(plan)
+    for _ in range(days):
+        step_day(plan, state)
+    return state.cash
+
+
+DEFAULT_MEMORY_BUDGET = 2 * 1024 ** 3
+
+# Compact history dtypes for the integer columns; float columns use ``float_dtype``.
+HISTORY_INT_DTYPES = {'freelance_runs': np.int16, 'survey_runs': np.int16, 'active_asset_count': np.int8}
+
+# Working-set estimate per scenario in bytes: compile_batch and step_day
+# temporaries plus plan and state (tracemalloc peak ~420 + ~110 per asset
+# slot, rounded up for headroom).
+_ROW_BYTES = 768
+_SLOT_BYTES = 192
+
+
+@dataclass
+class BudgetedResult:
+    """Rolling totals for every scenario plus the daily history of any requested columns."""
+
+    days: int
+    final_cash: np.ndarray
+    totals: Dict[str, np.ndarray]  # each DAY_COLUMNS entry summed day by day over the run
+    activation_day: np.ndarray  # first day an asset paid out, ``NaN`` if none did
+    history: Dict[str, np.ndarray]  # (scenarios, days) for the columns asked for
+    chunk_size: int
+
+    @property
+    def size(self) -> int:
+        return len(self.final_cash)
+
+
+def _history_dtype(name: str, float_dtype) -> np.dtype:
+    return np.dtype(HISTORY_INT_DTYPES.get(name, float_dtype))
+
+
+def output_bytes(scenarios: int, days: int, history: Sequence[str] = (), float_dtype=np.float64) -> int:
+    """Bytes held by a ``BudgetedResult`` regardless of chunking."""
+
+    per_row = 8 * (len(DAY_COLUMNS) + 2) + sum(_history_dtype(name, float_dtype).itemsize * days for name in history)
+    return scenarios * per_row
+
+
+def plan_chunk_size(
+    scenarios: int,
+    slots: int,
+    days: int,
+    history: Sequence[str] = (),
+    float_dtype=np.float64,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+) -> int:
+    """Largest chunk whose working set fits in what the outputs leave of ``memory_budget``."""
+
+    available = memory_budget - output_bytes(scenarios, days, history, float_dtype)
+    per_scenario = _ROW_BYTES + _SLOT_BYTES * max(slots, 1)
+    if available < per_scenario:
+        needed = output_bytes(scenarios, days, history, float_dtype) + per_scenario
+        raise MemoryError(
+            f'A memory budget of {memory_budget:,} bytes cannot hold {scenarios:,} scenarios '
+            f'(needs at least {needed:,}); request fewer history columns, float32, or fewer scenarios'
+        )
+    return int(min(scenarios, available // per_scenario))
+
+
+def run_simulation_budgeted(
+    data: Dict,
+    configs: Sequence[SimulationConfig],
+    days: int = 30,
+    assistants: AssistantSpec = 0,
+    build_blog: bool = True,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    history: Sequence[str] = (),
+    float_dtype=np.float64,
+    chunk_size: Optional[int] = None,
+) -> BudgetedResult:
+    """``run_simulation_batch`` in chunks sized to ``memory_budget``, keeping only rolling state.
+
+    Only the ``history`` columns are stored per day, in ``float_dtype`` (or a
+    small int type for counters); everything else is folded into per-scenario
+    totals as the days pass. The arithmetic itself stays in float64, so
+    ``final_cash`` and ``activation_day`` match ``run_simulation_batch``
+    exactly (totals equal a left-to-right sum of its daily columns).
+    """
+
+    configs = list(configs)
+    size = len(configs)
+    history = tuple(history)
+    unknown = [name for name in history if name not in DAY_COLUMNS]
+    if unknown:
+        raise ValueError(f'Unknown history columns: {unknown}')
+    counts = np.broadcast_to(np.asarray(assistants, dtype=np.int64), (size,))
+    if chunk_size is None:
+        slots = max(
+            (len(_selection(config, build_blog, asset_ids, upgrade_ids)[0]) for config in configs),
+            default=0,
+        )
+        chunk_size = max(plan_chunk_size(size, slots, days, history, float_dtype, memory_budget), 1)
+    elif chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+
+    final_cash = np.zeros(size)
+    totals = {name: np.zeros(size) for name in DAY_COLUMNS}
+    activation_day = np.full(size, np.nan)
+    kept = {name: np.zeros((size, days), dtype=_history_dtype(name, float_dtype)) for name in history}
+
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        plan = compile_batch(
+            data,
+            configs[start:stop],
+            assistants=counts[start:stop],
+            build_blog=build_blog,
+            asset_ids=asset_ids,
+            upgrade_ids=upgrade_ids,
+        )
+        state = BatchState.initial(plan, compact=True)
+        chunk_totals = {name: totals[name][start:stop] for name in DAY_COLUMNS}
+        chunk_activation = activation_day[start:stop]
+        for day in range(days):
+            today = step_day(plan, state)
+            for name in DAY_COLUMNS:
+                chunk_totals[name] += today[name]
+            for name in history:
+                kept[name][start:stop, day] = today[name]
+            first = np.isnan(chunk_activation) & (today['active_asset_count'] > 0)
+            chunk_activation[first] = day + 1
+        final_cash[start:stop] = state.cash
+
+    return BudgetedResult(
+        days=days,
+        final_cash=final_cash,
+        totals=totals,
+        activation_day=activation_day,
+        history=kept,
+        chunk_size=chunk_size,
+    )
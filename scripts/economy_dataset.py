@@ -0,0 +1,150 @@
+"""Schema-validated loading of ``normalized_economy.json``.
+
+``load_dataset`` checks the dataset against ``SCHEMA`` and reports every
+problem at once. Each file version is parsed and validated once per process.
+The attached ``digest`` is ``dataset_hash`` of the parsed data, the same key
+the surrogate, warehouse and queue caches use.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from scripts.economy_simulations import DATA_PATH, _evaluate_formula, dataset_hash
+
+# In-process memo keyed by (path, mtime_ns, size).
+_LOADED: Dict[tuple, 'EconomyDataset'] = {}
+
+NUMBER = (int, float)
+OPTIONAL_NUMBER = (int, float, type(None))
+
+_ENTITY_FIELDS = {
+    'name': str,
+    'base_income': NUMBER,
+    'variance': NUMBER,
+    'setup_time': NUMBER,
+    'setup_cost': NUMBER,
+    'maintenance_time': NUMBER,
+    'maintenance_cost': NUMBER,
+    'quality_curve': list,
+}
+
+# Required fields per section; nested dicts describe required sub-objects.
+SCHEMA = {
+    'assets': dict(
+        _ENTITY_FIELDS,
+        schedule={'setup_days': NUMBER, 'setup_minutes_per_day': NUMBER},
+        tags=list,
+    ),
+    'hustles': dict(_ENTITY_FIELDS, daily_limit=OPTIONAL_NUMBER, tags=list),
+    'tracks': dict(
+        _ENTITY_FIELDS,
+        schedule={'days': NUMBER, 'minutes_per_day': NUMBER},
+        rewards={'base_xp': NUMBER, 'skill_split': list},
+    ),
+    'upgrades': dict(_ENTITY_FIELDS),
+}
+QUALITY_LEVEL_FIELDS = {'level': NUMBER, 'income_min': NUMBER, 'income_max': NUMBER}
+MODIFIER_FIELDS = {'source': str, 'target': str, 'type': str, 'formula': str}
+MODIFIER_TYPES = ('multiplier', 'flat', 'add')
+
+
+class DatasetError(ValueError):
+    """Raised when the dataset does not match ``SCHEMA``; lists every problem found."""
+
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        super().__init__('Invalid economy dataset:\n  ' + '\n  '.join(problems))
+
+
+def _check_fields(record: Dict, fields: Dict, where: str, problems: List[str]) -> None:
+    for name, expected in fields.items():
+        if name not in record:
+            problems.append(f'{where}: missing {name!r}')
+            continue
+        value = record[name]
+        if isinstance(expected, dict):
+            if not isinstance(value, dict):
+                problems.append(f'{where}.{name}: expected an object')
+            else:
+                _check_fields(value, expected, f'{where}.{name}', problems)
+        elif isinstance(value, bool) or not isinstance(value, expected):
+            problems.append(f'{where}.{name}: unexpected {type(value).__name__}')
+
+
+def validate_dataset(data: Dict) -> None:
+    """Raise ``DatasetError`` unless ``data`` satisfies ``SCHEMA``."""
+
+    problems: List[str] = []
+    for section, fields in SCHEMA.items():
+        entries = data.get(section)
+        if not isinstance(entries, dict):
+            problems.append(f'{section}: expected an object of entities')
+            continue
+        for entity_id, record in entries.items():
+            where = f'{section}.{entity_id}'
+            if not isinstance(record, dict):
+                problems.append(f'{where}: expected an object')
+                continue
+            _check_fields(record, fields, where, problems)
+            for index, level in enumerate(record.get('quality_curve') or []):
+                _check_fields(level, QUALITY_LEVEL_FIELDS, f'{where}.quality_curve[{index}]', problems)
+
+    modifiers = data.get('modifiers')
+    if not isinstance(modifiers, list):
+        problems.append('modifiers: expected a list')
+        modifiers = []
+    for index, modifier in enumerate(modifiers):
+        where = f'modifiers[{index}]'
+        _check_fields(modifier, MODIFIER_FIELDS, where, problems)
+        if modifier.get('type') not in MODIFIER_TYPES:
+            problems.append(f'{where}.type: expected one of {MODIFIER_TYPES}')
+        elif isinstance(modifier.get('formula'), str):
+            try:
+                _evaluate_formula(modifier['formula'], 1.0)
+            except (SyntaxError, ValueError):
+                problems.append(f'{where}.formula: cannot evaluate {modifier["formula"]!r}')
+
+    if problems:
+        raise DatasetError(problems)
+
+
+class EconomyDataset:
+    """A validated dataset plus its content hash (``dataset_hash`` of ``raw``, computed on first use)."""
+
+    __slots__ = ('raw', '_digest')
+
+    def __init__(self, raw: Dict):
+        self.raw = raw
+        self._digest = None
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = dataset_hash(self.raw)
+        return self._digest
+
+
+def parse_dataset(data: Dict) -> EconomyDataset:
+    """Validate ``data`` and wrap it."""
+
+    validate_dataset(data)
+    return EconomyDataset(data)
+
+
+def load_dataset(path: Path = DATA_PATH) -> EconomyDataset:
+    """Load and validate the dataset at ``path``, once per file version per process.
+
+    Repeat loads are served from memory until the file's mtime or size
+    changes. The result is shared between callers and must be treated as
+    read-only.
+    """
+
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    dataset = _LOADED.get(memo_key)
+    if dataset is None:
+        dataset = parse_dataset(json.loads(path.read_bytes()))
+        _LOADED[memo_key] = dataset
+    return dataset
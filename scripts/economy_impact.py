@@ -0,0 +1,277 @@
+"""Work out which simulations a dataset edit can actually change.
+
+``diff_datasets`` compares two versions of ``normalized_economy.json`` entity by
+entity and modifier source by modifier source. ``DatasetImpact`` then resolves
+every changed modifier through the same target rules the simulator uses (the
+graph ``docs/archive/economy/economy_graph.mmd`` draws), so a scenario, i.e. a
+selection of assets and upgrades, is only flagged when something it reads
+changed. ``migrate_surrogates`` re-keys cached surrogates for unaffected
+selections to the new dataset hash. Affected ones are rebuilt against the new
+dataset, or deleted when ``rebuild=False``.
+
+Other caches need no migration. ``economy_report`` rewrites only the outputs
+whose input frames changed. Warehouse rows keep the dataset hash they were
+recorded against, as a history across revisions.
+"""
+
+import argparse
+import itertools
+import json
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from scripts.economy_batch import HUSTLE_IDS
+from scripts.economy_simulations import (
+    DATA_PATH,
+    _resolve_asset_targets,
+    _resolve_hustle_targets,
+    dataset_hash,
+    load_data,
+)
+
+ENTITY_SECTIONS = ('assets', 'hustles', 'tracks', 'upgrades')
+# Modifier fields the simulator reads; ``notes`` edits never change results.
+MODIFIER_KEYS = ('target', 'type', 'formula')
+TIME_TARGET = ('state', 'time')
+
+Target = Tuple[str, str]
+
+
+@dataclass
+class EntityChange:
+    section: str
+    entity_id: str
+    status: str  # 'added', 'removed', or 'changed'
+    fields: Tuple[str, ...] = ()
+
+
+@dataclass
+class DatasetDiff:
+    entities: List[EntityChange] = field(default_factory=list)
+    # Modifier sources whose ordered modifier list differs between versions.
+    modifier_sources: Set[str] = field(default_factory=set)
+
+    @property
+    def empty(self) -> bool:
+        return not self.entities and not self.modifier_sources
+
+    def changed(self, section: str) -> Set[str]:
+        return {change.entity_id for change in self.entities if change.section == section}
+
+
+@dataclass
+class DatasetImpact:
+    diff: DatasetDiff
+    assets: Set[str]
+    hustles: Set[str]
+    # Changed modifier source -> every (kind, id) target it reaches in either version.
+    source_targets: Dict[str, Set[Target]]
+
+    def affects(
+        self,
+        asset_ids: Sequence[str],
+        upgrade_ids: Sequence[str],
+        hustle_ids: Sequence[str] = HUSTLE_IDS,
+    ) -> bool:
+        """True when a run over this asset/upgrade selection can differ between versions."""
+
+        if self.assets.intersection(asset_ids) or self.hustles.intersection(hustle_ids):
+            return True
+        reads = {('asset', a) for a in asset_ids} | {('hustle', h) for h in hustle_ids} | {TIME_TARGET}
+        return any(self.source_targets.get(source, set()) & reads for source in upgrade_ids)
+
+    def affected_mask(self, selections: Iterable[Tuple[Sequence[str], Sequence[str]]]) -> List[bool]:
+        return [self.affects(asset_ids, upgrade_ids) for asset_ids, upgrade_ids in selections]
+
+
+def _modifiers_by_source(data: Dict) -> Dict[str, List[Tuple]]:
+    grouped: Dict[str, List[Tuple]] = {}
+    for modifier in data.get('modifiers', []):
+        grouped.setdefault(modifier['source'], []).append(tuple(modifier.get(key) for key in MODIFIER_KEYS))
+    return grouped
+
+
+def diff_datasets(old: Dict, new: Dict) -> DatasetDiff:
+    """Compare two dataset versions per entity and per modifier source."""
+
+    diff = DatasetDiff()
+    for section in ENTITY_SECTIONS:
+        before = old.get(section, {})
+        after = new.get(section, {})
+        for entity_id in sorted(before.keys() | after.keys()):
+            if entity_id not in after:
+                diff.entities.append(EntityChange(section, entity_id, 'removed'))
+            elif entity_id not in before:
+                diff.entities.append(EntityChange(section, entity_id, 'added'))
+            elif before[entity_id] != after[entity_id]:
+                fields = tuple(
+                    sorted(
+                        key
+                        for key in before[entity_id].keys() | after[entity_id].keys()
+                        if before[entity_id].get(key) != after[entity_id].get(key)
+                    )
+                )
+                diff.entities.append(EntityChange(section, entity_id, 'changed', fields))
+
+    old_modifiers = _modifiers_by_source(old)
+    new_modifiers = _modifiers_by_source(new)
+    for source in old_modifiers.keys() | new_modifiers.keys():
+        if old_modifiers.get(source) != new_modifiers.get(source):
+            diff.modifier_sources.add(source)
+    return diff
+
+
+def modifier_targets(data: Dict, target: str) -> Set[Target]:
+    """Resolve one modifier target against every asset and hustle in ``data``."""
+
+    entity_key = target.split('.', 1)[0]
+    if entity_key.startswith('asset'):
+        assets = data.get('assets', {})
+        return {('asset', a) for a in _resolve_asset_targets(entity_key, list(assets), assets)}
+    if entity_key.startswith('hustle'):
+        hustles = data.get('hustles', {})
+        return {('hustle', h) for h in _resolve_hustle_targets(entity_key, list(hustles), hustles)}
+    if entity_key.startswith('state:'):
+        return {('state', entity_key.split(':', 1)[1])}
+    return set()
+
+
+def modifier_graph(data: Dict) -> Dict[str, Set[Target]]:
+    """Map each modifier source to the entities its modifiers resolve to."""
+
+    graph: Dict[str, Set[Target]] = {}
+    for modifier in data.get('modifiers', []):
+        graph.setdefault(modifier['source'], set()).update(modifier_targets(data, modifier['target']))
+    return graph
+
+
+def analyze_impact(old: Dict, new: Dict) -> DatasetImpact:
+    diff = diff_datasets(old, new)
+    old_graph = modifier_graph(old)
+    new_graph = modifier_graph(new)
+    source_targets = {
+        source: old_graph.get(source, set()) | new_graph.get(source, set())
+        for source in diff.modifier_sources
+    }
+    return DatasetImpact(
+        diff=diff,
+        assets=diff.changed('assets'),
+        hustles=diff.changed('hustles'),
+        source_targets=source_targets,
+    )
+
+
+def migrate_surrogates(
+    old: Dict,
+    new: Dict,
+    impact: Optional[DatasetImpact] = None,
+    cache_dir: Optional[Path] = None,
+    rebuild: bool = True,
+) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """Carry surrogates built from ``old`` over to ``new``.
+
+    Unaffected surrogates are re-keyed to the new dataset hash. Affected ones
+    are rebuilt from ``new`` with the same selection and grid size, or only
+    deleted with ``rebuild=False``. Returns ``(kept, rebuilt, dropped)`` lists
+    of payloads. Surrogates saved before payloads were recorded cannot be
+    matched and are left untouched, and nothing happens when both versions
+    hash the same.
+    """
+
+    from scripts.economy_surrogate import CACHE_DIR, Surrogate, build_surrogate, payload_key, surrogate_path
+
+    cache_dir = cache_dir or CACHE_DIR
+    old_hash = dataset_hash(old)
+    new_hash = dataset_hash(new)
+    kept: List[Dict] = []
+    rebuilt: List[Dict] = []
+    dropped: List[Dict] = []
+    if old_hash == new_hash:
+        return kept, rebuilt, dropped
+    impact = impact or analyze_impact(old, new)
+    for path in sorted(cache_dir.glob('*.npz')):
+        surrogate = Surrogate.load(path.stem, path=path)
+        payload = surrogate.payload if surrogate else None
+        if not payload or payload.get('dataset') != old_hash:
+            continue
+        if impact.affects(payload['assets'], payload['upgrades']):
+            if rebuild:
+                surrogate = build_surrogate(
+                    new,
+                    payload['days'],
+                    payload['assistants'],
+                    payload['assets'],
+                    payload['upgrades'],
+                    max_points=payload['max_points'],
+                )
+                rebuilt.append(surrogate.payload)
+            else:
+                dropped.append(payload)
+                surrogate = None
+        else:
+            surrogate.payload = dict(payload, dataset=new_hash)
+            surrogate.key = payload_key(surrogate.payload)
+            kept.append(surrogate.payload)
+        target = None
+        if surrogate is not None:
+            target = cache_dir / surrogate_path(surrogate.key).name
+            surrogate.save(target)
+        if target != path:
+            path.unlink()
+    return kept, rebuilt, dropped
+
+
+def single_selection_space(data: Dict) -> List[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """Every one-asset selection with no upgrade or exactly one upgrade."""
+
+    upgrades = [()] + [(upgrade_id,) for upgrade_id in sorted(data.get('upgrades', {}))]
+    return [((asset_id,), upgrade) for asset_id, upgrade in itertools.product(sorted(data.get('assets', {})), upgrades)]
+
+
+def load_revision(revision: str, path: Path = DATA_PATH) -> Dict:
+    output = subprocess.run(
+        ['git', 'show', f'{revision}:{path.as_posix()}'],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Report which scenarios a dataset edit affects.')
+    parser.add_argument('old', nargs='?', help='Previous dataset file (default: --base revision of the live file).')
+    parser.add_argument('new', nargs='?', help='Edited dataset file (default: the working-tree dataset).')
+    parser.add_argument('--base', default='HEAD', help='Git revision to diff against when OLD is omitted.')
+    parser.add_argument('--migrate-surrogates', action='store_true',
+                        help='Re-key unaffected cached surrogates and rebuild affected ones.')
+    parser.add_argument('--no-rebuild', action='store_true',
+                        help='With --migrate-surrogates, delete affected surrogates instead of rebuilding them.')
+    args = parser.parse_args(argv)
+
+    old = json.loads(Path(args.old).read_text()) if args.old else load_revision(args.base)
+    new = json.loads(Path(args.new).read_text()) if args.new else load_data()
+    impact = analyze_impact(old, new)
+
+    if impact.diff.empty:
+        print('No simulation-relevant changes.')
+    for change in impact.diff.entities:
+        detail = f" ({', '.join(change.fields)})" if change.fields else ''
+        print(f'{change.section}.{change.entity_id}: {change.status}{detail}')
+    for source in sorted(impact.source_targets):
+        targets = ', '.join(f'{kind}:{entity}' for kind, entity in sorted(impact.source_targets[source])) or 'nothing'
+        print(f'modifiers from {source}: reach {targets}')
+
+    space = single_selection_space(new)
+    affected = sum(impact.affected_mask(space))
+    print(f'Affected single-asset scenarios: {affected}/{len(space)}')
+
+    if args.migrate_surrogates:
+        kept, rebuilt, dropped = migrate_surrogates(old, new, impact, rebuild=not args.no_rebuild)
+        print(f'Surrogates re-keyed: {len(kept)}, rebuilt: {len(rebuilt)}, deleted: {len(dropped)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,470 @@
+"""One simulated day for one scenario, as a kernel over flat numeric arrays.
+
+``run_simulation`` compiles its assets into an ``(assets, ASSET_FIELDS)``
+float matrix and its hustles, hours and wages into a ``PARAM_FIELDS`` vector,
+then runs every day in one ``run_days_kernel`` call. Callers that branch
+between days, such as build-order searches, can step one day at a time
+through ``KernelState.step``. The kernel only touches scalars and indexable
+buffers, so when numba is installed the same source is JIT-compiled over the
+NumPy arrays (``JIT_AVAILABLE``). Otherwise ``step_day_python`` runs as plain
+Python, over list copies of the buffers in ``run_days_python``. Both replay
+the arithmetic of the original per-asset dict loop, kept as
+``run_days_reference``, in the same order, so their results are identical.
+``check_parity`` compares all of them on random scenarios and is what
+``python -m scripts.economy_kernel`` runs; it exits non-zero on any mismatch.
+
+Set ``ECONOMY_DISABLE_JIT=1`` to force the fallback.
+"""
+
+import argparse
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:  # numba is optional; without it the kernel runs as plain Python
+    import numba
+except ImportError:  # pragma: no cover - depends on the environment
+    numba = None
+
+# Columns of the per-asset parameter matrix.
+SETUP_COST, SETUP_DAYS, SETUP_HOURS, MAINTENANCE_HOURS, MAINTENANCE_COST, DAILY_INCOME = range(6)
+ASSET_FIELDS = 6
+
+# Entries of the scenario parameter vector.
+DAY_HOURS, WAGES, FREELANCE_HOURS, FREELANCE_INCOME, SURVEY_HOURS, SURVEY_INCOME, SURVEY_LIMIT = range(7)
+PARAM_FIELDS = 7
+
+# Entries of the per-day output vector, in ``run_simulation`` record order.
+OUTPUT_COLUMNS = (
+    'cash_start',
+    'cash_end',
+    'hustle_income',
+    'asset_income',
+    'maintenance_spend',
+    'assistant_wages',
+    'hours_freelance',
+    'hours_survey',
+    'hours_asset_setup',
+    'hours_asset_maintenance',
+    'freelance_runs',
+    'survey_runs',
+    'active_asset_count',
+)
+
+# Running totals: freelance income, survey income, freelance runs, survey runs.
+TOTAL_FIELDS = 4
+
+
+def step_day_python(cash, params, assets, started, active, progress, asset_income_total, totals, earning, out):
+    """Advance one day in place and return the closing cash.
+
+    ``started``/``active``/``earning`` are bool arrays and ``progress`` an int
+    array, one entry per asset (NumPy arrays or plain lists both work). ``asset_income_total`` and ``totals``
+    accumulate across days. ``out`` receives the day's ``OUTPUT_COLUMNS``.
+    """
+
+    count = len(assets)
+    cash_start = cash
+    hours_left = params[DAY_HOURS]
+    hustle_income_today = 0.0
+    asset_income_today = 0.0
+    maintenance_spend_today = 0.0
+    setup_hours_today = 0.0
+    maintenance_hours_today = 0.0
+
+    for slot in range(count):
+        if not started[slot] and cash >= assets[slot][SETUP_COST]:
+            cash -= assets[slot][SETUP_COST]
+            started[slot] = True
+            progress[slot] = 0
+            if assets[slot][SETUP_DAYS] == 0:
+                active[slot] = True
+
+    for slot in range(count):
+        if started[slot] and not active[slot]:
+            if assets[slot][SETUP_DAYS] == 0 or assets[slot][SETUP_HOURS] == 0:
+                active[slot] = True
+                continue
+            required_hours = assets[slot][SETUP_HOURS]
+            if hours_left >= required_hours:
+                hours_left -= required_hours
+                setup_hours_today += required_hours
+                progress[slot] += 1
+                if progress[slot] >= assets[slot][SETUP_DAYS]:
+                    active[slot] = True
+
+    active_count = 0
+    for slot in range(count):
+        earning[slot] = False
+        if not active[slot]:
+            continue
+        maintenance_hours = assets[slot][MAINTENANCE_HOURS]
+        if maintenance_hours > hours_left and maintenance_hours > 0:
+            continue
+        if maintenance_hours > 0:
+            hours_left -= maintenance_hours
+            maintenance_hours_today += maintenance_hours
+        cash -= assets[slot][MAINTENANCE_COST]
+        maintenance_spend_today += assets[slot][MAINTENANCE_COST]
+        cash += assets[slot][DAILY_INCOME]
+        asset_income_today += assets[slot][DAILY_INCOME]
+        asset_income_total[slot] += assets[slot][DAILY_INCOME]
+        earning[slot] = True
+        active_count += 1
+
+    freelance_hours = params[FREELANCE_HOURS]
+    freelance_income = params[FREELANCE_INCOME]
+    freelance_runs = int(hours_left // freelance_hours) if freelance_hours > 0 else 0
+    freelance_spent = 0.0
+    for _ in range(freelance_runs):
+        hours_left -= freelance_hours
+        freelance_spent += freelance_hours
+        cash += freelance_income
+        hustle_income_today += freelance_income
+        totals[0] += freelance_income
+    totals[2] += freelance_runs
+
+    survey_hours = params[SURVEY_HOURS]
+    survey_income = params[SURVEY_INCOME]
+    survey_runs = int(hours_left // survey_hours) if survey_hours > 0 else 0
+    if survey_runs > params[SURVEY_LIMIT]:
+        survey_runs = int(params[SURVEY_LIMIT])
+    survey_spent = 0.0
+    for _ in range(survey_runs):
+        hours_left -= survey_hours
+        survey_spent += survey_hours
+        cash += survey_income
+        hustle_income_today += survey_income
+        totals[1] += survey_income
+    totals[3] += survey_runs
+
+    wages_today = params[WAGES]
+    cash -= wages_today
+
+    out[0] = cash_start
+    out[1] = cash
+    out[2] = hustle_income_today
+    out[3] = asset_income_today
+    out[4] = maintenance_spend_today
+    out[5] = wages_today
+    out[6] = freelance_spent
+    out[7] = survey_spent
+    out[8] = setup_hours_today
+    out[9] = maintenance_hours_today
+    out[10] = freelance_runs
+    out[11] = survey_runs
+    out[12] = active_count
+    return cash
+
+
+def run_days_python(days, cash, params, assets, started, active, progress, asset_income_total, totals, earning, out):
+    """Run ``days`` consecutive days; row ``d`` of ``earning``/``out`` receives day ``d + 1``.
+
+    Without the JIT, indexing NumPy scalars one at a time is the bottleneck,
+    so the loop runs over list copies of the buffers and writes them back at
+    the end. Python floats are IEEE doubles, so the results do not change.
+    """
+
+    buffers = [started, active, progress, asset_income_total, totals, earning, out]
+    lists = [buffer.tolist() for buffer in buffers]
+    values, fixed = assets.tolist(), params.tolist()
+    day_earning, day_out = lists[5], lists[6]
+    for day in range(days):
+        cash = step_day_python(cash, fixed, values, *lists[:5], day_earning[day], day_out[day])
+    for buffer, values_back in zip(buffers, lists):
+        buffer[...] = values_back
+    return cash
+
+
+JIT_AVAILABLE = numba is not None and os.environ.get('ECONOMY_DISABLE_JIT') != '1'
+step_day_jit = numba.njit(cache=True)(step_day_python) if JIT_AVAILABLE else None
+
+if JIT_AVAILABLE:
+    @numba.njit(cache=True)
+    def run_days_jit(days, cash, params, assets, started, active, progress, asset_income_total, totals, earning, out):
+        for day in range(days):
+            cash = step_day_jit(
+                cash, params, assets, started, active, progress, asset_income_total, totals, earning[day], out[day]
+            )
+        return cash
+else:
+    run_days_jit = None
+
+step_day_kernel = step_day_jit if JIT_AVAILABLE else step_day_python
+run_days_kernel = run_days_jit if JIT_AVAILABLE else run_days_python
+
+
+class KernelState:
+    """Mutable buffers for one scenario, in the layout the kernel expects."""
+
+    def __init__(self, assets: np.ndarray, cash: float):
+        count = len(assets)
+        self.cash = float(cash)
+        self.started = np.zeros(count, dtype=np.bool_)
+        self.active = np.zeros(count, dtype=np.bool_)
+        self.progress = np.zeros(count, dtype=np.int64)
+        self.asset_income_total = np.zeros(count)
+        self.totals = np.zeros(TOTAL_FIELDS)
+        self.earning = np.zeros(count, dtype=np.bool_)
+        self.out = np.zeros(len(OUTPUT_COLUMNS))
+
+    def step(self, params: np.ndarray, assets: np.ndarray, kernel=None) -> np.ndarray:
+        """Advance one day; returns the day's ``OUTPUT_COLUMNS`` (``earning`` holds today's payers)."""
+
+        kernel = kernel or step_day_kernel
+        self.cash = kernel(
+            self.cash, params, assets, self.started, self.active, self.progress,
+            self.asset_income_total, self.totals, self.earning, self.out,
+        )
+        return self.out
+
+    def run(self, days: int, params: np.ndarray, assets: np.ndarray, kernel=None):
+        """Advance ``days`` days in one kernel call; returns ``(outputs, earning)`` shaped per day."""
+
+        kernel = kernel or run_days_kernel
+        out = np.zeros((days, len(OUTPUT_COLUMNS)))
+        earning = np.zeros((days, len(assets)), dtype=np.bool_)
+        self.cash = kernel(
+            days, self.cash, params, assets, self.started, self.active, self.progress,
+            self.asset_income_total, self.totals, earning, out,
+        )
+        if days:
+            self.earning[:] = earning[-1]
+            self.out[:] = out[-1]
+        return out, earning
+
+
+def random_scenario(rng: np.random.Generator, max_assets: int = 6):
+    """A random but plausible ``(params, assets, starting cash)`` triple for parity checks."""
+
+    count = int(rng.integers(0, max_assets + 1))
+    assets = np.zeros((count, ASSET_FIELDS))
+    assets[:, SETUP_COST] = rng.choice([0.0, 25.0, 60.0, 180.0, 450.0], count)
+    assets[:, SETUP_DAYS] = rng.integers(0, 8, count)
+    assets[:, SETUP_HOURS] = rng.choice([0.0, 0.5, 1.25, 3.0], count)
+    assets[:, MAINTENANCE_HOURS] = rng.choice([0.0, 0.25, 0.75, 2.0], count)
+    assets[:, MAINTENANCE_COST] = rng.uniform(0, 6, count)
+    assets[:, DAILY_INCOME] = rng.uniform(0, 40, count)
+    params = np.array(
+        [
+            rng.uniform(2, 20),
+            rng.uniform(0, 80),
+            rng.choice([0.0, 0.75, 2.0]),
+            rng.uniform(5, 40),
+            rng.choice([0.0, 0.25, 0.5]),
+            rng.uniform(0.5, 6),
+            float(rng.choice([np.inf, 2, 5])),
+        ]
+    )
+    return params, assets, float(rng.uniform(0, 400))
+
+
+def run_days_reference(days: int, cash: float, params: np.ndarray, assets: np.ndarray):
+    """The day loop as ``run_simulation`` wrote it before the kernel, over one dict per asset.
+
+    Only ``check_parity`` calls it. Returns ``(cash, out, asset_income_total,
+    totals)`` with one ``OUTPUT_COLUMNS`` row of ``out`` per day.
+    """
+
+    asset_states = [
+        {
+            'setup_cost': row[SETUP_COST],
+            'setup_days_required': row[SETUP_DAYS],
+            'setup_hours': row[SETUP_HOURS],
+            'maintenance_hours': row[MAINTENANCE_HOURS],
+            'maintenance_cost': row[MAINTENANCE_COST],
+            'daily_income': row[DAILY_INCOME],
+            'started': False,
+            'progress_days': 0,
+            'active': False,
+            'income_total': 0.0,
+        }
+        for row in assets.tolist()
+    ]
+    day_hours, wages, freelance_hours, freelance_income, survey_hours, survey_income, survey_limit = params.tolist()
+    hustle_income = {'freelance': 0.0, 'surveySprint': 0.0}
+    hustle_runs = {'freelance': 0, 'surveySprint': 0}
+    rows = []
+
+    for _ in range(days):
+        cash_start = cash
+        hours_left = day_hours
+        hustle_income_today = 0.0
+        asset_income_today = 0.0
+        maintenance_spend_today = 0.0
+        setup_hours_today = 0.0
+        maintenance_hours_today = 0.0
+        hours_spent_hustles = {'freelance': 0.0, 'surveySprint': 0.0}
+        hustle_runs_today = {'freelance': 0, 'surveySprint': 0}
+
+        for asset in asset_states:
+            if not asset['started'] and cash >= asset['setup_cost']:
+                cash -= asset['setup_cost']
+                asset['started'] = True
+                asset['progress_days'] = 0
+                if asset['setup_days_required'] == 0:
+                    asset['active'] = True
+
+        for asset in asset_states:
+            if asset['started'] and not asset['active']:
+                if asset['setup_days_required'] == 0 or asset['setup_hours'] == 0:
+                    asset['active'] = True
+                    continue
+                required_hours = asset['setup_hours']
+                if hours_left >= required_hours:
+                    hours_left -= required_hours
+                    setup_hours_today += required_hours
+                    asset['progress_days'] += 1
+                    if asset['progress_days'] >= asset['setup_days_required']:
+                        asset['active'] = True
+
+        active_asset_count = 0
+        for asset in asset_states:
+            if not asset['active']:
+                continue
+            maintenance_hours = asset['maintenance_hours']
+            if maintenance_hours > hours_left and maintenance_hours > 0:
+                continue
+            if maintenance_hours > 0:
+                hours_left -= maintenance_hours
+                maintenance_hours_today += maintenance_hours
+            cash -= asset['maintenance_cost']
+            maintenance_spend_today += asset['maintenance_cost']
+            cash += asset['daily_income']
+            asset_income_today += asset['daily_income']
+            asset['income_total'] += asset['daily_income']
+            active_asset_count += 1
+
+        if freelance_hours > 0:
+            freelance_runs = int(hours_left // freelance_hours)
+        else:
+            freelance_runs = 0
+        for _ in range(freelance_runs):
+            hours_left -= freelance_hours
+            hours_spent_hustles['freelance'] += freelance_hours
+            cash += freelance_income
+            hustle_income_today += freelance_income
+            hustle_income['freelance'] += freelance_income
+            hustle_runs['freelance'] += 1
+            hustle_runs_today['freelance'] += 1
+
+        if survey_hours > 0:
+            survey_runs_possible = int(hours_left // survey_hours)
+        else:
+            survey_runs_possible = 0
+        survey_runs = min(survey_runs_possible, survey_limit)
+        for _ in range(int(survey_runs)):
+            hours_left -= survey_hours
+            hours_spent_hustles['surveySprint'] += survey_hours
+            cash += survey_income
+            hustle_income_today += survey_income
+            hustle_income['surveySprint'] += survey_income
+            hustle_runs['surveySprint'] += 1
+            hustle_runs_today['surveySprint'] += 1
+
+        cash -= wages
+
+        rows.append(
+            [
+                cash_start,
+                cash,
+                hustle_income_today,
+                asset_income_today,
+                maintenance_spend_today,
+                wages,
+                hours_spent_hustles['freelance'],
+                hours_spent_hustles['surveySprint'],
+                setup_hours_today,
+                maintenance_hours_today,
+                hustle_runs_today['freelance'],
+                hustle_runs_today['surveySprint'],
+                active_asset_count,
+            ]
+        )
+
+    out = np.array(rows, dtype=np.float64).reshape(days, len(OUTPUT_COLUMNS))
+    asset_income_total = np.array([asset['income_total'] for asset in asset_states], dtype=np.float64)
+    totals = np.array(
+        [hustle_income['freelance'], hustle_income['surveySprint'], hustle_runs['freelance'], hustle_runs['surveySprint']],
+        dtype=np.float64,
+    )
+    return cash, out, asset_income_total, totals
+
+
+_STATE_BUFFERS = ('started', 'active', 'progress', 'asset_income_total', 'totals', 'earning', 'out')
+
+
+def _assert_same(label: str, actual, expected) -> None:
+    if not np.array_equal(actual, expected):
+        raise AssertionError(f'{label}: {actual!r} != {expected!r}')
+
+
+def check_parity(
+    scenarios: int = 200, days: int = 60, seed: Optional[int] = 0, require_jit: bool = False
+) -> Dict[str, int]:
+    """Assert every kernel path reproduces ``run_days_reference`` on random scenarios.
+
+    ``step_day_python`` is stepped one day at a time and checked against the
+    reference's row for that day; ``run_days_python`` is checked over the whole
+    horizon. With numba, ``step_day_jit`` is stepped alongside and must match
+    every state buffer, and ``run_days_jit`` must match the horizon result.
+    Raises ``AssertionError`` naming the first scenario, day and value that
+    diverge, and ``RuntimeError`` if ``require_jit`` is set without the JIT.
+    """
+
+    if require_jit and not JIT_AVAILABLE:
+        raise RuntimeError('numba is not installed (or ECONOMY_DISABLE_JIT=1), so the JIT kernel cannot be checked')
+    rng = np.random.default_rng(seed)
+    steps = jit_steps = 0
+    for scenario in range(scenarios):
+        params, assets, cash = random_scenario(rng)
+        expected_cash, expected_out, expected_income, expected_totals = run_days_reference(days, cash, params, assets)
+        stepped = KernelState(assets, cash)
+        compiled = KernelState(assets, cash) if JIT_AVAILABLE else None
+        for day in range(days):
+            label = f'scenario {scenario} day {day + 1}'
+            _assert_same(f'{label}: python out', stepped.step(params, assets, step_day_python), expected_out[day])
+            steps += 1
+            if compiled is not None:
+                compiled.step(params, assets, step_day_jit)
+                jit_steps += 1
+                _assert_same(f'{label}: jit cash', compiled.cash, stepped.cash)
+                for name in _STATE_BUFFERS:
+                    _assert_same(f'{label}: jit {name}', getattr(compiled, name), getattr(stepped, name))
+
+        kernels = [('python', run_days_python)] + ([('jit', run_days_jit)] if JIT_AVAILABLE else [])
+        for name, run_days in kernels:
+            label = f'scenario {scenario}: {name} run of {days} days'
+            state = KernelState(assets, cash)
+            out, _ = state.run(days, params, assets, run_days)
+            _assert_same(f'{label} cash', state.cash, expected_cash)
+            _assert_same(f'{label} out', out, expected_out)
+            _assert_same(f'{label} asset_income_total', state.asset_income_total, expected_income)
+            _assert_same(f'{label} totals', state.totals, expected_totals)
+    return {'scenarios': scenarios, 'steps': steps, 'jit_steps': jit_steps}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Check the day kernels against the original per-asset loop, step by step.'
+    )
+    parser.add_argument('--scenarios', type=int, default=200)
+    parser.add_argument('--days', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--require-jit', action='store_true', help='Fail instead of skipping the JIT when numba is missing.')
+    args = parser.parse_args(argv)
+
+    try:
+        result = check_parity(args.scenarios, args.days, args.seed, require_jit=args.require_jit)
+    except (AssertionError, RuntimeError) as error:
+        parser.exit(1, f'Kernel parity check failed: {error}\n')
+    print(f"Python kernel matches the reference loop on {result['steps']} steps across {result['scenarios']} scenarios.")
+    if result['jit_steps']:
+        print(f"JIT kernel matches it on {result['jit_steps']} steps.")
+    else:
+        print('JIT kernel not checked: numba is not installed (or ECONOMY_DISABLE_JIT=1); pass --require-jit to fail instead.')
+
+
+if __name__ == '__main__':
+    main()
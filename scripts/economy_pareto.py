@@ -0,0 +1,223 @@
+"""Non-dominated (Pareto) sets over sweep results.
+
+Every objective is turned into "smaller is better" (maximised columns are
+negated, ``NaN`` becomes ``+inf``) and rows are sorted lexicographically. A
+point can only be dominated by a point that sorts before it, and dominance is
+transitive, so it is enough to find each small block's local front and then
+merge neighbouring groups, dropping the later group's rows that the earlier
+group's front dominates. Dominated rows are discarded against small local
+fronts, so the cost grows with the size of the final front rather than every
+row scanning it; a front of tens of thousands of rows still costs seconds.
+``ParetoFront`` applies the same test incrementally as sweep chunks arrive.
+"""
+
+import argparse
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from scripts.economy_batch import BatchResult, run_simulation_batch
+from scripts.economy_sensitivity import DEFAULT_BOUNDS
+from scripts.economy_simulations import SimulationConfig, load_data
+from scripts.economy_sweep import sample_configs
+
+OBJECTIVES: Dict[str, str] = {
+    'final_cash': 'max',
+    'total_hours': 'min',
+    'days_to_first_asset': 'min',
+    'assistant_wages': 'min',
+}
+
+BLOCK_SIZE = 128
+
+HOUR_COLUMNS = ('hours_freelance', 'hours_survey', 'hours_asset_setup', 'hours_asset_maintenance')
+
+
+def _minimization_matrix(frame: pd.DataFrame, objectives: Mapping[str, str]) -> np.ndarray:
+    columns = []
+    for name, sense in objectives.items():
+        if sense not in ('min', 'max'):
+            raise ValueError(f"Objective {name!r} must be 'min' or 'max', got {sense!r}")
+        values = frame[name].to_numpy(dtype=float)
+        values = -values if sense == 'max' else values
+        columns.append(np.where(np.isnan(values), np.inf, values))
+    return np.column_stack(columns) if columns else np.empty((len(frame), 0))
+
+
+def _dominated_by(front: np.ndarray, points: np.ndarray, chunk: int = 32) -> np.ndarray:
+    """For each row of ``points``, whether any row of ``front`` dominates it.
+
+    The front is scanned in small chunks and points drop out as soon as one
+    dominates them, so the work shrinks quickly when most points are beaten.
+    """
+
+    dominated = np.zeros(len(points), dtype=bool)
+    pending = np.arange(len(points))
+    for start in range(0, len(front), chunk):
+        if not len(pending):
+            break
+        hit = _dominance(front[start:start + chunk], points[pending]).any(axis=1)
+        dominated[pending[hit]] = True
+        pending = pending[~hit]
+    return dominated
+
+
+def _dominance(rows: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """``(points, rows)`` matrix: whether ``rows[j]`` dominates ``points[i]``.
+
+    Built one objective at a time on 2-D arrays; reducing over a trailing axis
+    of only a few objectives is several times slower in NumPy.
+    """
+
+    no_worse = np.ones((len(points), len(rows)), dtype=bool)
+    better = np.zeros((len(points), len(rows)), dtype=bool)
+    for column in range(points.shape[1]):
+        mine, theirs = points[:, column, None], rows[None, :, column]
+        no_worse &= theirs <= mine
+        better |= theirs < mine
+    return no_worse & better
+
+
+def pareto_mask_values(values: np.ndarray, block_size: int = BLOCK_SIZE) -> np.ndarray:
+    """Non-dominated mask for a ``(points, objectives)`` matrix where smaller is better."""
+
+    values = np.asarray(values, dtype=float)
+    count = len(values)
+    keep = np.zeros(count, dtype=bool)
+    if not count:
+        return keep
+    order = np.lexsort(values.T[::-1])
+    ordered = values[order]
+
+    if values.shape[1] == 2:
+        # Two objectives: beat the running minimum of the second column. Exact
+        # duplicates sort next to each other and share the fate of the first copy.
+        first, second = ordered[:, 0], ordered[:, 1]
+        best_before = np.minimum.accumulate(np.concatenate(([np.inf], second[:-1])))
+        duplicate = np.concatenate(([False], (first[1:] == first[:-1]) & (second[1:] == second[:-1])))
+        leads = second < best_before
+        leads[0] = True
+        group = np.cumsum(~duplicate) - 1
+        survivors = leads[np.flatnonzero(~duplicate)][group]
+        keep[order[survivors]] = True
+        return keep
+
+    # Only the later group of a merged pair can lose rows, and only to the
+    # earlier group's front.
+    groups = []
+    for start in range(0, count, block_size):
+        block = ordered[start:start + block_size]
+        # Sorted order means only earlier rows can dominate, so no mask is needed.
+        beaten = _dominance(block, block).any(axis=1)
+        groups.append(start + np.flatnonzero(~beaten))
+    while len(groups) > 1:
+        merged = []
+        for pair in range(0, len(groups) - 1, 2):
+            head, tail = groups[pair], groups[pair + 1]
+            tail = tail[~_dominated_by(ordered[head], ordered[tail])]
+            merged.append(np.concatenate([head, tail]))
+        if len(groups) % 2:
+            merged.append(groups[-1])
+        groups = merged
+    keep[order[groups[0]]] = True
+    return keep
+
+
+def pareto_mask(frame: pd.DataFrame, objectives: Mapping[str, str] = OBJECTIVES) -> np.ndarray:
+    return pareto_mask_values(_minimization_matrix(frame, objectives))
+
+
+def pareto_frontier(frame: pd.DataFrame, objectives: Mapping[str, str] = OBJECTIVES) -> pd.DataFrame:
+    """Rows of ``frame`` that no other row beats on every objective."""
+
+    return frame[pareto_mask(frame, objectives)]
+
+
+class ParetoFront:
+    """Running non-dominated set that absorbs sweep results chunk by chunk."""
+
+    def __init__(self, objectives: Mapping[str, str] = OBJECTIVES):
+        self.objectives = dict(objectives)
+        self._values = np.empty((0, len(self.objectives)))
+        self._rows: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self._rows if self._rows is not None else pd.DataFrame(columns=list(self.objectives))
+
+    def add(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Merge new rows; returns the ones that joined the front."""
+
+        values = _minimization_matrix(frame, self.objectives)
+        survivors = pareto_mask_values(values)
+        survivors[survivors] = ~_dominated_by(self._values, values[survivors])
+        newcomers = values[survivors]
+        retained = ~_dominated_by(newcomers, self._values)
+        accepted = frame[survivors]
+        previous = self._rows.iloc[np.flatnonzero(retained)] if self._rows is not None else None
+        self._rows = accepted if previous is None else pd.concat([previous, accepted])
+        self._values = np.concatenate([self._values[retained], newcomers])
+        return accepted
+
+
+def sweep_objectives(result: BatchResult) -> pd.DataFrame:
+    """The default objective columns for every scenario of a batch run."""
+
+    hours = sum(result.columns[name] for name in HOUR_COLUMNS)
+    return pd.DataFrame(
+        {
+            'final_cash': result.final_cash,
+            'total_hours': hours.sum(axis=1),
+            'days_to_first_asset': result.activation_day,
+            'assistant_wages': result.columns['assistant_wages'].sum(axis=1),
+        }
+    )
+
+
+def sample_sweep(
+    data: Dict,
+    bounds: Mapping[str, tuple],
+    samples: int,
+    base_config: Optional[SimulationConfig] = None,
+    days: int = 30,
+    max_assistants: int = 3,
+    seed: Optional[int] = 0,
+    asset_ids: Optional[List[str]] = None,
+    upgrade_ids: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """Random configs inside ``bounds`` (plus a random assistant count) with their objectives."""
+
+    configs, params, assistants = sample_configs(bounds, samples, base_config, max_assistants, seed)
+    result = run_simulation_batch(
+        data,
+        configs,
+        days=days,
+        assistants=assistants,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+    frame = pd.DataFrame(params)
+    frame['assistants'] = assistants
+    return pd.concat([frame, sweep_objectives(result)], axis=1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Sample configs and print the Pareto frontier of the results.')
+    parser.add_argument('--samples', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bounds = {name: value for name, value in DEFAULT_BOUNDS.items() if name != 'assistants'}
+    sweep = sample_sweep(load_data(), bounds, args.samples, days=args.days, seed=args.seed)
+    front = pareto_frontier(sweep).sort_values('final_cash', ascending=False)
+    print(f'{len(front)} of {len(sweep)} configs are non-dominated')
+    print(front.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""Simulate a heterogeneous population of synthetic players as one batch.
+
+``run_simulation`` follows a single idealised player. Here every player gets a
+persona drawn from ``PersonaDistribution``:
+
+- hours available per day;
+- an ordered asset wishlist, sampled without replacement from preference weights;
+- an upgrade-purchase propensity;
+- a chance of skipping any given day.
+
+All players then advance through ``step_day`` together.
+
+Upgrades come from an ordered ``upgrade_pool``. Unlike ``run_simulation``,
+which treats selected upgrades as owned from day one, players buy the next
+pool upgrade for its ``setup_cost`` once their cash reaches
+``setup_cost / propensity``. Eager players buy as soon as they can afford it;
+cautious ones wait for a cushion. On a skipped day a player spends no hours:
+setup stalls, assets that need maintenance earn nothing, and passive assets
+keep paying.
+
+Every (wishlist, upgrades owned) combination is compiled once. Each player
+row just points into that table, so a purchase re-gathers only the rows that
+changed.
+"""
+
+import argparse
+import dataclasses
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scripts.economy_batch import BatchPlan, BatchState, compile_batch, step_day
+from scripts.economy_simulations import SimulationConfig, load_data
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+DEFAULT_UPGRADE_POOL = ('coffee', 'studioLaptop', 'course', 'camera', 'studio')
+
+
+@dataclass
+class PersonaDistribution:
+    hours_mean: float = 6.0
+    hours_sd: float = 2.5
+    hours_min: float = 1.0
+    hours_max: float = 16.0
+    # Relative preference per asset id; ``None`` weights every asset equally.
+    asset_weights: Optional[Dict[str, float]] = None
+    # Probability of wanting 1, 2, 3, ... assets.
+    wishlist_sizes: Dict[int, float] = field(default_factory=lambda: {1: 0.5, 2: 0.3, 3: 0.2})
+    upgrade_pool: Tuple[str, ...] = DEFAULT_UPGRADE_POOL
+    # Beta(alpha, beta) draws for the purchase propensity and the daily skip chance.
+    propensity_alpha: float = 2.0
+    propensity_beta: float = 3.0
+    skip_alpha: float = 1.5
+    skip_beta: float = 8.5
+
+
+@dataclass
+class Personas:
+    hours: np.ndarray  # (players,)
+    wishlists: np.ndarray  # (players, slots) asset codes, -1 for empty slots
+    propensity: np.ndarray
+    skip_chance: np.ndarray
+    asset_ids: Tuple[str, ...]  # code -> asset id
+
+    @property
+    def size(self) -> int:
+        return len(self.hours)
+
+    def frame(self) -> pd.DataFrame:
+        # Code -1 (empty slot) indexes the trailing '' label.
+        labels = np.array(self.asset_ids + ('',), dtype=object)
+        return pd.DataFrame(
+            {
+                'hours': self.hours,
+                'wishlist': [','.join(item for item in row if item) for row in labels[self.wishlists]],
+                'propensity': self.propensity,
+                'skip_chance': self.skip_chance,
+            }
+        )
+
+
+def draw_personas(
+    data: Dict,
+    players: int,
+    distribution: Optional[PersonaDistribution] = None,
+    seed: Optional[int] = 0,
+) -> Personas:
+    distribution = distribution or PersonaDistribution()
+    rng = np.random.default_rng(seed)
+    asset_ids = tuple(data['assets'])
+    weights = distribution.asset_weights or {asset_id: 1.0 for asset_id in asset_ids}
+    weight_vector = np.array([float(weights.get(asset_id, 0.0)) for asset_id in asset_ids])
+    if not (weight_vector > 0).any():
+        raise ValueError('asset_weights must give at least one known asset a positive weight')
+
+    hours = np.clip(
+        rng.normal(distribution.hours_mean, distribution.hours_sd, players),
+        distribution.hours_min,
+        distribution.hours_max,
+    )
+
+    sizes = np.array(sorted(distribution.wishlist_sizes), dtype=np.int64)
+    if not len(sizes) or sizes.min() < 1:
+        raise ValueError('wishlist_sizes must only list sizes of at least 1')
+    size_probs = np.array([distribution.wishlist_sizes[size] for size in sizes], dtype=float)
+    wanted = np.minimum(rng.choice(sizes, players, p=size_probs / size_probs.sum()), (weight_vector > 0).sum())
+    # Gumbel top-k: ordering by log-weight plus Gumbel noise samples without replacement.
+    with np.errstate(divide='ignore'):
+        keys = np.log(weight_vector)[None, :] + rng.gumbel(size=(players, len(asset_ids)))
+    ranked = np.argsort(-keys, axis=1)[:, : int(wanted.max(initial=1))]
+    wishlists = np.where(np.arange(ranked.shape[1])[None, :] < wanted[:, None], ranked, -1)
+
+    return Personas(
+        hours=hours,
+        wishlists=wishlists,
+        propensity=rng.beta(distribution.propensity_alpha, distribution.propensity_beta, players),
+        skip_chance=rng.beta(distribution.skip_alpha, distribution.skip_beta, players),
+        asset_ids=asset_ids,
+    )
+
+
+@dataclass
+class PopulationResult:
+    days: int
+    asset_ids: Tuple[str, ...]
+    upgrade_pool: Tuple[str, ...]
+    asset_owners: np.ndarray  # (days, assets) players who have bought each asset by day end
+    upgrade_owners: np.ndarray  # (days, pool) players who own each pool upgrade by day end
+    no_asset: np.ndarray  # (days,) players who have not bought any asset yet
+    cash_percentiles: np.ndarray  # (days, len(PERCENTILES))
+    final_cash: np.ndarray
+    players: int
+
+    def ownership(self) -> pd.DataFrame:
+        """Share of players owning each asset and pool upgrade, one row per day."""
+
+        frame = pd.DataFrame(self.asset_owners / self.players, columns=list(self.asset_ids))
+        for column, upgrade_id in enumerate(self.upgrade_pool):
+            frame[f'upgrade:{upgrade_id}'] = self.upgrade_owners[:, column] / self.players
+        frame['no_asset'] = self.no_asset / self.players
+        frame.insert(0, 'day', np.arange(1, self.days + 1))
+        return frame
+
+    def cash_distribution(self) -> pd.DataFrame:
+        frame = pd.DataFrame(self.cash_percentiles, columns=[f'p{p}' for p in PERCENTILES])
+        frame.insert(0, 'day', np.arange(1, self.days + 1))
+        return frame
+
+    def checkpoints(self, days: Sequence[int] = (1, 7, 14, 30)) -> pd.DataFrame:
+        """Ownership shares and cash percentiles side by side for a few days."""
+
+        rows = [day for day in days if 1 <= day <= self.days]
+        merged = self.ownership().merge(self.cash_distribution(), on='day')
+        return merged[merged['day'].isin(rows)].reset_index(drop=True)
+
+
+def _combination_table(
+    data: Dict,
+    config: SimulationConfig,
+    wishlists: np.ndarray,
+    asset_ids: Tuple[str, ...],
+    upgrade_pool: Tuple[str, ...],
+) -> Tuple[BatchPlan, np.ndarray]:
+    """Compile every unique wishlist with every owned-upgrade prefix.
+
+    Returns the table plan plus the wishlist index of every player; row
+    ``wishlist * (len(pool) + 1) + owned`` of the table is that combination.
+    """
+
+    unique, inverse = np.unique(wishlists, axis=0, return_inverse=True)
+    configs = []
+    for row in unique:
+        selection = tuple(asset_ids[code] for code in row if code >= 0)
+        for owned in range(len(upgrade_pool) + 1):
+            configs.append(
+                dataclasses.replace(config, asset_ids=selection, upgrade_ids=tuple(upgrade_pool[:owned]))
+            )
+    return compile_batch(data, configs), inverse.reshape(-1)
+
+
+def _gather(plan: BatchPlan, table: BatchPlan, rows: np.ndarray, combos: np.ndarray) -> None:
+    for name, value in table.__dict__.items():
+        if isinstance(value, np.ndarray):
+            getattr(plan, name)[rows] = value[combos]
+
+
+def simulate_population(
+    data: Dict,
+    personas: Personas,
+    days: int = 30,
+    config: Optional[SimulationConfig] = None,
+    upgrade_pool: Sequence[str] = DEFAULT_UPGRADE_POOL,
+    seed: Optional[int] = 0,
+) -> PopulationResult:
+    """Advance every persona through ``days`` and aggregate ownership and cash distributions."""
+
+    config = config or SimulationConfig()
+    # Skip draws use their own stream so they are independent of the persona draws for the same seed.
+    rng = np.random.default_rng(None if seed is None else [seed, 1])
+    upgrade_pool = tuple(upgrade_id for upgrade_id in upgrade_pool if upgrade_id in data['upgrades'])
+    levels = len(upgrade_pool) + 1
+    prices = np.array([float(data['upgrades'][upgrade_id]['setup_cost']) for upgrade_id in upgrade_pool] + [np.inf])
+
+    table, wishlist_index = _combination_table(data, config, personas.wishlists, personas.asset_ids, upgrade_pool)
+    owned = np.zeros(personas.size, dtype=np.int64)
+    plan = table.take(wishlist_index * levels)
+    state = BatchState.initial(plan)
+    slot_codes = personas.wishlists[:, : plan.slots]
+    threshold = 1.0 / np.maximum(personas.propensity, 1e-9)
+
+    asset_owners = np.zeros((days, len(personas.asset_ids)), dtype=np.int64)
+    upgrade_owners = np.zeros((days, len(upgrade_pool)), dtype=np.int64)
+    no_asset = np.zeros(days, dtype=np.int64)
+    cash_percentiles = np.zeros((days, len(PERCENTILES)))
+
+    for day in range(days):
+        price = prices[np.minimum(owned, levels - 1)]
+        buy = (owned < levels - 1) & (state.cash >= price * threshold)
+        if buy.any():
+            state.cash = np.where(buy, state.cash - price, state.cash)
+            owned = owned + buy
+            rows = np.flatnonzero(buy)
+            _gather(plan, table, rows, wishlist_index[rows] * levels + owned[rows])
+
+        skipping = rng.random(personas.size) < personas.skip_chance
+        plan.day_hours = np.where(skipping, 0.0, personas.hours + plan.time_bonus_minutes / 60)
+        step_day(plan, state)
+
+        asset_owners[day] = np.bincount(slot_codes[state.started], minlength=len(personas.asset_ids))
+        upgrade_owners[day] = (owned[:, None] > np.arange(len(upgrade_pool))[None, :]).sum(axis=0)
+        no_asset[day] = (~state.started.any(axis=1)).sum()
+        cash_percentiles[day] = np.percentile(state.cash, PERCENTILES)
+
+    return PopulationResult(
+        days=days,
+        asset_ids=personas.asset_ids,
+        upgrade_pool=upgrade_pool,
+        asset_owners=asset_owners,
+        upgrade_owners=upgrade_owners,
+        no_asset=no_asset,
+        cash_percentiles=cash_percentiles,
+        final_cash=state.cash,
+        players=personas.size,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Simulate a synthetic player population and report distributions.')
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--hours-mean', type=float, default=PersonaDistribution.hours_mean)
+    parser.add_argument('--skip-mean', type=float, default=None,
+                        help='Mean daily skip chance (keeps the default Beta concentration).')
+    parser.add_argument('--checkpoint', type=int, action='append', default=None, help='Days to report (repeatable).')
+    args = parser.parse_args(argv)
+
+    distribution = PersonaDistribution(hours_mean=args.hours_mean)
+    if args.skip_mean is not None:
+        concentration = distribution.skip_alpha + distribution.skip_beta
+        distribution.skip_alpha = args.skip_mean * concentration
+        distribution.skip_beta = (1 - args.skip_mean) * concentration
+
+    data = load_data()
+    personas = draw_personas(data, args.players, distribution, seed=args.seed)
+    result = simulate_population(data, personas, days=args.days, upgrade_pool=distribution.upgrade_pool, seed=args.seed)
+    checkpoints = args.checkpoint or [1, 7, 14, args.days]
+    print(result.checkpoints(checkpoints).T.to_string(header=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,415 @@
+"""Distribute large sweeps over many worker processes through a SQLite work queue.
+
+``submit`` records a sweep spec (asset selection, upgrade sets, sampled config
+bounds, horizon) and splits its scenario space into chunks. Scenario ``i``
+pairs upgrade set ``i // samples`` with sampled config ``i % samples``, so any
+worker can rebuild a chunk from the spec alone. Workers lease one chunk at a
+time, run it through ``run_simulation_batch``, and write an ``.npz`` of summary
+metrics next to the queue file. A chunk whose lease runs out without being
+completed (crashed or stalled worker) goes back to the pool. Result files are
+deterministic and written atomically, so a late duplicate is harmless.
+
+Point every node at the same ``--queue`` path on a shared filesystem to scale
+past one machine; the filesystem must honour SQLite's file locks.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from multiprocessing import Process
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scripts.economy_batch import fit_exponential_batch, run_simulation_batch
+from scripts.economy_simulations import dataset_hash, load_data
+from scripts.economy_sweep import configs_from_params, sample_params
+
+QUEUE_PATH = Path(__file__).resolve().parents[1] / '.cache' / 'queue' / 'queue.sqlite'
+CHUNK_SIZE = 1024
+LEASE_SECONDS = 300.0
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 1.0
+HOUR_COLUMNS = ('hours_freelance', 'hours_survey', 'hours_asset_setup', 'hours_asset_maintenance')
+RESULT_COLUMNS = ('final_cash', 'growth_rate', 'activation_day', 'total_hours', 'assistant_wages')
+COLLECT_COLUMNS = ('scenario', 'upgrade_set', 'upgrades', 'config_index', 'assistants', *RESULT_COLUMNS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweeps (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    spec TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    sweep_id INTEGER NOT NULL REFERENCES sweeps(id),
+    start INTEGER NOT NULL,
+    stop INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS chunks_claimable ON chunks (status, lease_expires);
+"""
+
+
+@dataclass
+class Chunk:
+    id: int
+    sweep: str
+    spec: Dict
+    start: int
+    stop: int
+    token: str
+
+
+class WorkQueue:
+    """Chunk leases for every sweep submitted to one SQLite file."""
+
+    def __init__(self, path: Path = QUEUE_PATH, max_attempts: int = MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        # Autocommit mode; every write below opens its own BEGIN IMMEDIATE.
+        self.connection = sqlite3.connect(self.path, timeout=60.0, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> 'WorkQueue':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def results_dir(self, sweep: str) -> Path:
+        return self.path.parent / 'results' / sweep
+
+    def _write(self, sql: str, params: Sequence = ()) -> sqlite3.Cursor:
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = self.connection.execute(sql, params)
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+        return cursor
+
+    def submit(self, name: str, spec: Dict, chunk_size: int = CHUNK_SIZE) -> int:
+        """Register a sweep and queue its chunks; returns the number of chunks."""
+
+        total = spec['samples'] * len(spec['upgrade_sets'])
+        chunks = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            sweep_id = self.connection.execute(
+                'INSERT INTO sweeps (name, spec, created_at) VALUES (?, ?, ?)',
+                (name, json.dumps(spec), time.time()),
+            ).lastrowid
+            self.connection.executemany(
+                'INSERT INTO chunks (sweep_id, start, stop) VALUES (?, ?, ?)',
+                [(sweep_id, start, stop) for start, stop in chunks],
+            )
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+        return len(chunks)
+
+    def claim(self, worker: str, lease_seconds: float = LEASE_SECONDS) -> Optional[Chunk]:
+        """Lease the next pending chunk, or one whose lease expired; ``None`` if nothing is claimable."""
+
+        now = time.time()
+        token = uuid.uuid4().hex
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            self.connection.execute(
+                "UPDATE chunks SET status = 'failed', error = COALESCE(error, 'lease expired') "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            row = self.connection.execute(
+                "SELECT chunks.id, sweeps.name, sweeps.spec, chunks.start, chunks.stop FROM chunks "
+                "JOIN sweeps ON sweeps.id = chunks.sweep_id "
+                "WHERE (chunks.status = 'pending' OR (chunks.status = 'leased' AND chunks.lease_expires < ?)) "
+                "AND chunks.attempts < ? ORDER BY chunks.id LIMIT 1",
+                (now, self.max_attempts),
+            ).fetchone()
+            if row is not None:
+                self.connection.execute(
+                    "UPDATE chunks SET status = 'leased', worker = ?, lease_token = ?, lease_expires = ?, "
+                    'attempts = attempts + 1 WHERE id = ?',
+                    (worker, token, now + lease_seconds, row[0]),
+                )
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+        if row is None:
+            return None
+        return Chunk(id=row[0], sweep=row[1], spec=json.loads(row[2]), start=row[3], stop=row[4], token=token)
+
+    def complete(self, chunk: Chunk) -> bool:
+        """Mark ``chunk`` done; ``False`` if its lease was lost to another worker meanwhile."""
+
+        cursor = self._write(
+            "UPDATE chunks SET status = 'done', lease_expires = NULL, error = NULL WHERE id = ? AND lease_token = ?",
+            (chunk.id, chunk.token),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, chunk: Chunk, error: str) -> None:
+        """Release ``chunk`` for a retry, or park it as failed once it used up its attempts."""
+
+        self._write(
+            "UPDATE chunks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            'lease_expires = NULL, error = ? WHERE id = ? AND lease_token = ?',
+            (self.max_attempts, error, chunk.id, chunk.token),
+        )
+
+    def release(self, chunk: Chunk, error: str) -> None:
+        """Hand ``chunk`` back untouched, refunding the attempt its claim charged."""
+
+        self._write(
+            "UPDATE chunks SET status = 'pending', worker = NULL, lease_token = NULL, lease_expires = NULL, "
+            'attempts = attempts - 1, error = ? WHERE id = ? AND lease_token = ?',
+            (error, chunk.id, chunk.token),
+        )
+
+    def outstanding(self) -> int:
+        """Chunks that are pending or leased and still have attempts left."""
+
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM chunks WHERE status IN ('pending', 'leased') AND attempts < ?",
+            (self.max_attempts,),
+        ).fetchone()[0]
+
+    def status(self) -> pd.DataFrame:
+        return pd.read_sql_query(
+            'SELECT sweeps.name AS sweep, chunks.status, COUNT(*) AS chunks, SUM(chunks.stop - chunks.start) AS scenarios '
+            'FROM chunks JOIN sweeps ON sweeps.id = chunks.sweep_id GROUP BY sweeps.name, chunks.status '
+            'ORDER BY sweeps.name, chunks.status',
+            self.connection,
+        )
+
+    def spec(self, sweep: str) -> Dict:
+        row = self.connection.execute('SELECT spec FROM sweeps WHERE name = ?', (sweep,)).fetchone()
+        if row is None:
+            raise KeyError(f'Unknown sweep {sweep!r}')
+        return json.loads(row[0])
+
+
+def sweep_spec(
+    data: Dict,
+    samples: int,
+    days: int = 30,
+    upgrade_sets: Sequence[Sequence[str]] = ((),),
+    asset_ids: Optional[Sequence[str]] = None,
+    bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+    max_assistants: int = 3,
+    seed: int = 0,
+) -> Dict:
+    """JSON-ready description of a sweep that every worker can expand identically."""
+
+    if bounds is None:
+        from scripts.economy_sensitivity import DEFAULT_BOUNDS
+
+        bounds = {name: value for name, value in DEFAULT_BOUNDS.items() if name != 'assistants'}
+    return {
+        'dataset_hash': dataset_hash(data),
+        'samples': int(samples),
+        'days': int(days),
+        'upgrade_sets': [list(upgrades) for upgrades in upgrade_sets],
+        'asset_ids': list(asset_ids) if asset_ids is not None else None,
+        'bounds': {name: list(value) for name, value in bounds.items()},
+        'max_assistants': int(max_assistants),
+        'seed': int(seed),
+    }
+
+
+def run_chunk(data: Dict, spec: Dict, start: int, stop: int) -> Dict[str, np.ndarray]:
+    """Simulate scenarios ``start:stop`` of ``spec`` and return their summary columns."""
+
+    # Redrawing the parameter arrays is cheap; only this chunk's rows become configs.
+    params, assistants = sample_params(
+        {name: tuple(value) for name, value in spec['bounds'].items()},
+        spec['samples'],
+        max_assistants=spec['max_assistants'],
+        seed=spec['seed'],
+    )
+    scenario = np.arange(start, stop)
+    upgrade_set = scenario // spec['samples']
+    config_index = scenario % spec['samples']
+    columns = {name: np.empty(len(scenario)) for name in RESULT_COLUMNS}
+    # One batch per upgrade set inside the chunk (a chunk spans at most a few).
+    for set_index in np.unique(upgrade_set):
+        rows = np.flatnonzero(upgrade_set == set_index)
+        picked = config_index[rows]
+        result = run_simulation_batch(
+            data,
+            configs_from_params(params, picked),
+            days=spec['days'],
+            assistants=assistants[picked],
+            asset_ids=spec['asset_ids'],
+            upgrade_ids=spec['upgrade_sets'][set_index],
+        )
+        columns['final_cash'][rows] = result.final_cash
+        columns['growth_rate'][rows] = fit_exponential_batch(result.cash_end).slope
+        columns['activation_day'][rows] = result.activation_day
+        columns['total_hours'][rows] = sum(result.columns[name] for name in HOUR_COLUMNS).sum(axis=1)
+        columns['assistant_wages'][rows] = result.columns['assistant_wages'].sum(axis=1)
+    columns['scenario'] = scenario
+    columns['upgrade_set'] = upgrade_set
+    columns['config_index'] = config_index
+    columns['assistants'] = assistants[config_index]
+    return columns
+
+
+def _save_result(path: Path, columns: Dict[str, np.ndarray]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.stem}.{os.getpid()}.tmp.npz')
+    np.savez(tmp_path, **columns)
+    tmp_path.replace(path)
+
+
+def work(
+    queue_path: Path = QUEUE_PATH,
+    worker: Optional[str] = None,
+    lease_seconds: float = LEASE_SECONDS,
+    poll_seconds: float = POLL_SECONDS,
+    wait: bool = True,
+) -> int:
+    """Claim and run chunks until the queue is drained; returns the number completed.
+
+    With ``wait=True`` the worker keeps polling while other workers still hold
+    leases, so it can pick up their chunks if those leases expire. A worker
+    whose dataset differs from the sweep's releases the chunk without using
+    up an attempt and raises, so a stale node cannot fail a sweep that
+    healthy nodes could still run.
+    """
+
+    worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+    data = load_data()
+    local_hash = dataset_hash(data)
+    completed = 0
+    with WorkQueue(queue_path) as queue:
+        while True:
+            chunk = queue.claim(worker, lease_seconds)
+            if chunk is None:
+                if wait and queue.outstanding():
+                    time.sleep(poll_seconds)
+                    continue
+                return completed
+            if chunk.spec['dataset_hash'] != local_hash:
+                error = f'{worker} has dataset {local_hash[:12]}, sweep expects {chunk.spec["dataset_hash"][:12]}'
+                queue.release(chunk, error)
+                raise RuntimeError(f'{error}; update the dataset on this node before rejoining {chunk.sweep!r}')
+            try:
+                columns = run_chunk(data, chunk.spec, chunk.start, chunk.stop)
+                _save_result(queue.results_dir(chunk.sweep) / f'{chunk.start:012d}.npz', columns)
+            except Exception as error:  # noqa: BLE001 - recorded on the chunk for the retry
+                queue.fail(chunk, f'{type(error).__name__}: {error}')
+                continue
+            completed += queue.complete(chunk)
+
+
+def run_local_workers(
+    count: int,
+    queue_path: Path = QUEUE_PATH,
+    lease_seconds: float = LEASE_SECONDS,
+) -> None:
+    """Start ``count`` worker processes on this machine and wait for them to drain the queue."""
+
+    processes = [
+        Process(target=work, args=(queue_path,), kwargs={'lease_seconds': lease_seconds}) for _ in range(count)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def collect(sweep: str, queue_path: Path = QUEUE_PATH) -> pd.DataFrame:
+    """Concatenate every finished chunk of ``sweep`` into one frame ordered by scenario."""
+
+    with WorkQueue(queue_path) as queue:
+        spec = queue.spec(sweep)
+        results_dir = queue.results_dir(sweep)
+    frames = []
+    for path in sorted(results_dir.glob('*.npz')):
+        with np.load(path) as chunk:
+            frames.append(pd.DataFrame({name: chunk[name] for name in chunk.files}))
+    if not frames:
+        return pd.DataFrame(columns=list(COLLECT_COLUMNS))
+    frame = pd.concat(frames, ignore_index=True).sort_values('scenario', ignore_index=True)
+    frame = frame[[name for name in COLLECT_COLUMNS if name != 'upgrades']]
+    labels = [','.join(upgrades) for upgrades in spec['upgrade_sets']]
+    frame.insert(2, 'upgrades', [labels[i] for i in frame['upgrade_set']])
+    return frame
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Distribute a simulation sweep through a SQLite work queue.')
+    parser.add_argument('--queue', type=Path, default=QUEUE_PATH, help='Queue file; use a shared path across nodes.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help='Queue a sweep of sampled configs x upgrade sets.')
+    submit.add_argument('name')
+    submit.add_argument('--samples', type=int, default=10000)
+    submit.add_argument('--days', type=int, default=30)
+    submit.add_argument('--seed', type=int, default=0)
+    submit.add_argument('--asset', action='append', dest='assets', default=None)
+    submit.add_argument('--upgrade-set', action='append', dest='upgrade_sets', default=None,
+                        help="Comma-separated upgrade ids (repeatable); '' is the no-upgrade set.")
+    submit.add_argument('--all-single-upgrades', action='store_true', help='Add every one-upgrade set.')
+    submit.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    worker = commands.add_parser('work', help='Run workers on this machine until the queue is drained.')
+    worker.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    worker.add_argument('--lease-seconds', type=float, default=LEASE_SECONDS)
+
+    commands.add_parser('status', help='Chunk counts per sweep and status.')
+
+    gather = commands.add_parser('collect', help='Merge finished chunk results into a CSV.')
+    gather.add_argument('name')
+    gather.add_argument('--output', type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == 'submit':
+        data = load_data()
+        upgrade_sets = [[item for item in value.split(',') if item] for value in args.upgrade_sets or ['']]
+        if args.all_single_upgrades:
+            upgrade_sets += [[upgrade_id] for upgrade_id in sorted(data.get('upgrades', {}))]
+        spec = sweep_spec(data, args.samples, args.days, upgrade_sets, args.assets, seed=args.seed)
+        with WorkQueue(args.queue) as queue:
+            chunks = queue.submit(args.name, spec, args.chunk_size)
+        print(f"Queued {args.name}: {args.samples * len(upgrade_sets)} scenarios in {chunks} chunks at {args.queue}")
+    elif args.command == 'work':
+        run_local_workers(args.workers, args.queue, args.lease_seconds)
+    elif args.command == 'status':
+        with WorkQueue(args.queue) as queue:
+            print(queue.status().to_string(index=False))
+    else:
+        frame = collect(args.name, args.queue)
+        if args.output:
+            frame.to_csv(args.output, index=False)
+            print(f'Wrote {len(frame)} scenarios to {args.output}')
+        else:
+            print(frame.sort_values('final_cash', ascending=False).head(20).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""Build ``docs/archive/economy_sim_report_assets`` as a small task graph.
+
+The simulations (baseline plus every assistant count, batched) run first in
+this process. Each CSV and SVG is then an independent task fed only by those
+frames, so the stale ones run concurrently in worker processes on the Agg
+backend. A task is stale when the hash of its inputs (the CSV text of the
+frames it reads plus the report code) differs from the manifest entry recorded
+the last time it wrote its file, or when the file is missing.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from scripts import economy_simulations as sim
+
+MANIFEST_PATH = Path(__file__).resolve().parents[1] / '.cache' / 'economy_report_manifest.json'
+CODE_PATHS = (Path(sim.__file__), Path(__file__))
+REPORT_DAYS = 30
+
+
+@dataclass
+class ReportTask:
+    name: str
+    func: Callable
+    args: Tuple
+    inputs: Tuple[pd.DataFrame, ...]
+
+
+def _write_csv(df: pd.DataFrame, path: Path) -> Path:
+    df.to_csv(path, index=False)
+    return path
+
+
+def _use_agg() -> None:
+    import matplotlib
+
+    matplotlib.use('Agg')
+
+
+def _run_task(func: Callable, args: Tuple):
+    _use_agg()
+    return func(*args)
+
+
+def code_digest() -> str:
+    digest = hashlib.sha256()
+    for path in CODE_PATHS:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def input_digest(task: ReportTask, code: str) -> str:
+    digest = hashlib.sha256(code.encode('utf-8'))
+    digest.update(task.name.encode('utf-8'))
+    for frame in task.inputs:
+        digest.update(frame.to_csv(index=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _load_manifest(path: Path) -> Dict[str, str]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path: Path, manifest: Dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    tmp_path.replace(path)
+
+
+def report_tasks(data: Dict, output_dir: Path) -> Tuple[List[ReportTask], Dict[str, object]]:
+    """Run the simulations and return one task per output plus the printed summaries."""
+
+    baseline_df, baseline_metrics = sim.run_simulation(data, days=REPORT_DAYS)
+    frames = sim.assistant_scenario_frames(data, days=REPORT_DAYS)
+    assistant_summary = sim.summarize_assistant_frames(frames, days=REPORT_DAYS)
+    education_df = sim.compute_education_roi(data, baseline_metrics, baseline_metrics.as_daily())
+    top_education = education_df.head(10)
+    frame_list = tuple(frames.values())
+
+    tasks = [
+        ReportTask('baseline_daily_cashflow.csv', _write_csv,
+                   (baseline_df, output_dir / 'baseline_daily_cashflow.csv'), (baseline_df,)),
+        ReportTask('assistant_summary.csv', _write_csv,
+                   (assistant_summary, output_dir / 'assistant_summary.csv'), (assistant_summary,)),
+        ReportTask('education_roi.csv', _write_csv,
+                   (education_df, output_dir / 'education_roi.csv'), (education_df,)),
+        ReportTask('daily_cashflow.svg', sim.plot_daily_cashflow, (baseline_df, output_dir), (baseline_df,)),
+        ReportTask('cash_vs_time_exponential.svg', sim.plot_exponential_curve, (baseline_df, output_dir), (baseline_df,)),
+        ReportTask('assistant_sustainability.svg', sim.plot_assistant_frames, (frames, output_dir), frame_list),
+        ReportTask('education_roi.svg', sim.plot_education_roi, (top_education, output_dir), (top_education,)),
+    ]
+    _, slope, _ = sim.fit_exponential(baseline_df['day'], baseline_df['cash_end'])
+    summaries = {'slope': slope, 'assistant_summary': assistant_summary, 'education': education_df}
+    return tasks, summaries
+
+
+def run_tasks(tasks: Sequence[ReportTask], jobs: Optional[int] = None) -> None:
+    workers = min(len(tasks), jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        for task in tasks:
+            _run_task(task.func, task.args)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_use_agg) as pool:
+        futures = [pool.submit(_run_task, task.func, task.args) for task in tasks]
+        for future in futures:
+            future.result()
+
+
+def build_report(
+    data: Optional[Dict] = None,
+    output_dir: Path = sim.OUTPUT_DIR,
+    manifest_path: Path = MANIFEST_PATH,
+    force: bool = False,
+    jobs: Optional[int] = None,
+) -> Tuple[List[str], Dict[str, object]]:
+    """Regenerate stale report outputs; returns the names written and the summaries."""
+
+    data = data if data is not None else sim.load_data()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tasks, summaries = report_tasks(data, output_dir)
+
+    manifest_key = str(output_dir.resolve())
+    manifests = _load_manifest(manifest_path)
+    recorded = manifests.get(manifest_key, {})
+    code = code_digest()
+    digests = {task.name: input_digest(task, code) for task in tasks}
+    stale = [
+        task
+        for task in tasks
+        if force or recorded.get(task.name) != digests[task.name] or not (output_dir / task.name).exists()
+    ]
+
+    run_tasks(stale, jobs=jobs)
+    if stale or recorded != digests:
+        manifests[manifest_key] = digests
+        _save_manifest(manifest_path, manifests)
+    return [task.name for task in stale], summaries
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Regenerate the archived economy simulation report assets.')
+    parser.add_argument('--output-dir', type=Path, default=sim.OUTPUT_DIR)
+    parser.add_argument('--force', action='store_true', help='Rewrite every output even if its inputs are unchanged.')
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes for stale outputs (default: CPU count; 1 runs inline).')
+    args = parser.parse_args(argv)
+
+    written, summaries = build_report(output_dir=args.output_dir, force=args.force, jobs=args.jobs)
+    print(f"Updated {len(written)} output(s): {', '.join(written) or 'none'}")
+    print('Baseline exponential slope:', summaries['slope'])
+    print('Assistant summary:')
+    print(summaries['assistant_summary'])
+    print('Top education ROI:')
+    print(summaries['education'].head(5))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,524 @@
+"""Global sensitivity analysis over every numeric ``SimulationConfig`` field.
+
+Sobol indices use the Saltelli sampling scheme: two base designs ``A`` and
+``B`` plus one ``AB_i`` matrix per factor, all evaluated in a single batched
+simulation. First-order indices follow Saltelli (2010) and total-effect
+indices follow Jansen. Morris elementary effects offer a cheaper screen,
+``tornado_summary`` reports the one-at-a-time swing for comparison, and
+``adaptive_curve`` refines a single-parameter curve around its breakpoints.
+"""
+
+import argparse
+import dataclasses
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scripts.economy_batch import final_cash_batch
+from scripts.economy_simulations import SimulationConfig, load_data
+
+try:  # scipy is optional; it only adds the Sobol sequence
+    from scipy.stats import qmc
+except ImportError:  # pragma: no cover - depends on the environment
+    qmc = None
+
+ASSISTANTS_FACTOR = 'assistants'
+
+# Ranges mirror the balancing workbench sliders.
+DEFAULT_BOUNDS: Dict[str, Tuple[float, float]] = {
+    'starting_cash': (0.0, 250.0),
+    'base_day_hours': (8.0, 20.0),
+    'assistant_hire_cost': (0.0, 400.0),
+    'assistant_hourly_rate': (0.0, 25.0),
+    'assistant_hours_per_day': (0.0, 8.0),
+    'blog_income_multiplier': (0.25, 3.0),
+    'freelance_income_multiplier': (0.25, 3.0),
+    'survey_income_multiplier': (0.25, 3.0),
+    'blog_setup_cost_multiplier': (0.25, 3.0),
+    'blog_maintenance_cost_multiplier': (0.25, 3.0),
+    ASSISTANTS_FACTOR: (0.0, 4.0),
+}
+
+EVALUATION_CHUNK = 4096
+
+
+def numeric_config_fields() -> List[str]:
+    """Names of every numeric ``SimulationConfig`` field, in declaration order."""
+
+    defaults = SimulationConfig()
+    return [
+        item.name
+        for item in dataclasses.fields(SimulationConfig)
+        if isinstance(getattr(defaults, item.name), (int, float))
+    ]
+
+
+def resolve_bounds(
+    bounds: Optional[Mapping[str, Tuple[float, float]]] = None,
+    include_assistants: bool = True,
+) -> Dict[str, Tuple[float, float]]:
+    resolved = {name: DEFAULT_BOUNDS[name] for name in numeric_config_fields() if name in DEFAULT_BOUNDS}
+    if include_assistants:
+        resolved[ASSISTANTS_FACTOR] = DEFAULT_BOUNDS[ASSISTANTS_FACTOR]
+    if bounds:
+        resolved.update(bounds)
+    for name, (low, high) in resolved.items():
+        if high <= low:
+            raise ValueError(f'Empty range for {name}: {low}..{high}')
+    return resolved
+
+
+def _latin_hypercube(n: int, dims: int, rng: np.random.Generator) -> np.ndarray:
+    strata = np.argsort(rng.random((dims, n)), axis=1).T
+    return (strata + rng.random((n, dims))) / n
+
+
+def _halton(n: int, dims: int, rng: np.random.Generator) -> np.ndarray:
+    primes: List[int] = []
+    candidate = 2
+    while len(primes) < dims:
+        if all(candidate % p for p in primes):
+            primes.append(candidate)
+        candidate += 1
+    index = np.arange(1, n + 1)
+    points = np.zeros((n, dims))
+    for dim, base in enumerate(primes):
+        remaining = index.copy()
+        scale = 1.0 / base
+        while remaining.any():
+            points[:, dim] += (remaining % base) * scale
+            remaining //= base
+            scale /= base
+    # Random shift keeps the low-discrepancy structure while decorrelating seeds.
+    return (points + rng.random(dims)) % 1.0
+
+
+def unit_design(n: int, dims: int, method: str = 'lhs', seed: Optional[int] = None) -> np.ndarray:
+    """Return ``n`` points in ``[0, 1)^dims`` from a space-filling design.
+
+    ``method`` is ``'lhs'`` (Latin hypercube), ``'halton'``, or ``'sobol'``
+    (requires scipy).
+    """
+
+    rng = np.random.default_rng(seed)
+    if method == 'lhs':
+        return _latin_hypercube(n, dims, rng)
+    if method == 'halton':
+        return _halton(n, dims, rng)
+    if method == 'sobol':
+        if qmc is None:
+            raise ImportError("method='sobol' requires scipy; use 'lhs' or 'halton' instead")
+        return qmc.Sobol(d=dims, scramble=True, seed=seed).random(n)
+    raise ValueError(f'Unknown sampling method: {method}')
+
+
+def _scale(unit: np.ndarray, bounds: Dict[str, Tuple[float, float]]) -> np.ndarray:
+    """Map unit-cube points onto ``bounds``; the assistants factor becomes a whole count.
+
+    Every count in the assistants range gets an equal share of ``[0, 1)``.
+    Rounding a uniform value instead would give the two end counts half weight.
+    """
+
+    low = np.array([b[0] for b in bounds.values()])
+    high = np.array([b[1] for b in bounds.values()])
+    scaled = low + unit * (high - low)
+    if ASSISTANTS_FACTOR in bounds:
+        column = list(bounds).index(ASSISTANTS_FACTOR)
+        fewest, most = math.ceil(bounds[ASSISTANTS_FACTOR][0]), math.floor(bounds[ASSISTANTS_FACTOR][1])
+        scaled[:, column] = np.minimum(np.floor(unit[:, column] * (most - fewest + 1)) + fewest, most)
+    return scaled
+
+
+def evaluate_design(
+    data: Dict,
+    names: Sequence[str],
+    points: np.ndarray,
+    base_config: Optional[SimulationConfig] = None,
+    days: int = 30,
+    assistants: int = 0,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> np.ndarray:
+    """Final cash for every row of ``points`` (columns follow ``names``)."""
+
+    base_config = base_config or SimulationConfig()
+    names = list(names)
+    config_columns = [(i, name) for i, name in enumerate(names) if name != ASSISTANTS_FACTOR]
+    assistant_column = names.index(ASSISTANTS_FACTOR) if ASSISTANTS_FACTOR in names else None
+
+    outcomes = np.empty(len(points))
+    for start in range(0, len(points), EVALUATION_CHUNK):
+        chunk = points[start:start + EVALUATION_CHUNK]
+        configs = [
+            dataclasses.replace(base_config, **{name: float(row[i]) for i, name in config_columns})
+            for row in chunk
+        ]
+        if assistant_column is None:
+            chunk_assistants = assistants
+        else:
+            chunk_assistants = np.rint(chunk[:, assistant_column]).astype(np.int64)
+        outcomes[start:start + len(chunk)] = final_cash_batch(
+            data,
+            configs,
+            days=days,
+            assistants=chunk_assistants,
+            asset_ids=asset_ids,
+            upgrade_ids=upgrade_ids,
+        )
+    return outcomes
+
+
+def sobol_indices(
+    data: Dict,
+    samples: int = 512,
+    bounds: Optional[Mapping[str, Tuple[float, float]]] = None,
+    method: str = 'lhs',
+    seed: Optional[int] = 0,
+    resamples: int = 100,
+    base_config: Optional[SimulationConfig] = None,
+    days: int = 30,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """First-order (``S1``) and total-effect (``ST``) indices for final-day cash.
+
+    Costs ``samples * (factors + 2)`` simulations. ``*_conf`` columns hold
+    95% bootstrap half-widths over ``resamples`` draws.
+    """
+
+    resolved = resolve_bounds(bounds)
+    names = list(resolved)
+    k = len(names)
+    unit = unit_design(samples, 2 * k, method=method, seed=seed)
+    a_unit, b_unit = unit[:, :k], unit[:, k:]
+    blocks = [a_unit, b_unit]
+    for i in range(k):
+        ab = a_unit.copy()
+        ab[:, i] = b_unit[:, i]
+        blocks.append(ab)
+    design = _scale(np.vstack(blocks), resolved)
+
+    outcomes = evaluate_design(
+        data,
+        names,
+        design,
+        base_config=base_config,
+        days=days,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    ).reshape(k + 2, samples)
+    f_a, f_b, f_ab = outcomes[0], outcomes[1], outcomes[2:]
+
+    def estimate(index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        fa, fb, fab = f_a[index], f_b[index], f_ab[:, index]
+        variance = np.var(np.concatenate([fa, fb]))
+        if variance == 0:
+            return np.zeros(k), np.zeros(k)
+        first = np.mean(fb * (fab - fa), axis=1) / variance
+        total = 0.5 * np.mean((fa - fab) ** 2, axis=1) / variance
+        return first, total
+
+    first, total = estimate(np.arange(samples))
+    rng = np.random.default_rng(None if seed is None else seed + 1)
+    draws = [estimate(rng.integers(0, samples, samples)) for _ in range(resamples)]
+    if draws:
+        first_conf = 1.96 * np.std([d[0] for d in draws], axis=0)
+        total_conf = 1.96 * np.std([d[1] for d in draws], axis=0)
+    else:
+        first_conf = total_conf = np.full(k, np.nan)
+
+    df = pd.DataFrame(
+        {
+            'factor': names,
+            'S1': first,
+            'S1_conf': first_conf,
+            'ST': total,
+            'ST_conf': total_conf,
+        }
+    )
+    df['interaction'] = (df['ST'] - df['S1']).clip(lower=0)
+    return df.sort_values('ST', ascending=False, ignore_index=True)
+
+
+def morris_screening(
+    data: Dict,
+    trajectories: int = 50,
+    levels: int = 4,
+    bounds: Optional[Mapping[str, Tuple[float, float]]] = None,
+    seed: Optional[int] = 0,
+    base_config: Optional[SimulationConfig] = None,
+    days: int = 30,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Morris elementary effects: ``mu_star`` ranks influence, ``sigma`` flags non-linearity.
+
+    Costs ``trajectories * (factors + 1)`` simulations.
+    """
+
+    resolved = resolve_bounds(bounds)
+    names = list(resolved)
+    k = len(names)
+    rng = np.random.default_rng(seed)
+    delta = levels / (2 * (levels - 1))
+    grid = np.arange(levels // 2) / (levels - 1)
+
+    points = np.empty((trajectories, k + 1, k))
+    orders = np.empty((trajectories, k), dtype=np.int64)
+    signs = np.empty((trajectories, k))
+    for t in range(trajectories):
+        start = rng.choice(grid, size=k)
+        direction = rng.choice([-1.0, 1.0], size=k)
+        # Start low for upward steps and high for downward steps so every point stays in range.
+        current = np.where(direction > 0, start, start + delta)
+        order = rng.permutation(k)
+        points[t, 0] = current
+        for step, factor in enumerate(order, start=1):
+            current = current.copy()
+            current[factor] += direction[factor] * delta
+            points[t, step] = current
+        orders[t] = order
+        signs[t] = direction
+
+    outcomes = evaluate_design(
+        data,
+        names,
+        _scale(points.reshape(-1, k), resolved),
+        base_config=base_config,
+        days=days,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    ).reshape(trajectories, k + 1)
+
+    effects = np.empty((trajectories, k))
+    for t in range(trajectories):
+        steps = np.diff(outcomes[t])
+        for step, factor in enumerate(orders[t]):
+            effects[t, factor] = steps[step] / (signs[t, factor] * delta)
+
+    df = pd.DataFrame(
+        {
+            'factor': names,
+            'mu': effects.mean(axis=0),
+            'mu_star': np.abs(effects).mean(axis=0),
+            'sigma': effects.std(axis=0, ddof=1) if trajectories > 1 else np.zeros(k),
+        }
+    )
+    return df.sort_values('mu_star', ascending=False, ignore_index=True)
+
+
+def tornado_summary(
+    data: Dict,
+    bounds: Optional[Mapping[str, Tuple[float, float]]] = None,
+    base_config: Optional[SimulationConfig] = None,
+    assistants: int = 0,
+    days: int = 30,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+    indices: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """Final cash with each factor pushed to its low and high bound, sorted by swing.
+
+    Pass the ``sobol_indices`` frame as ``indices`` to merge ``S1``/``ST`` alongside.
+    """
+
+    base_config = base_config or SimulationConfig()
+    resolved = resolve_bounds(bounds)
+    names = list(resolved)
+    baseline = np.array(
+        [assistants if name == ASSISTANTS_FACTOR else getattr(base_config, name) for name in names],
+        dtype=float,
+    )
+    rows = [baseline]
+    for i, (low, high) in enumerate(resolved.values()):
+        for value in (low, high):
+            row = baseline.copy()
+            row[i] = value
+            rows.append(row)
+    outcomes = evaluate_design(
+        data,
+        names,
+        np.array(rows),
+        base_config=base_config,
+        days=days,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+    base_value = outcomes[0]
+    low_values = outcomes[1::2]
+    high_values = outcomes[2::2]
+
+    df = pd.DataFrame(
+        {
+            'factor': names,
+            'baseline': base_value,
+            'low': low_values,
+            'high': high_values,
+            'swing': np.abs(high_values - low_values),
+        }
+    )
+    if indices is not None:
+        df = df.merge(indices[['factor', 'S1', 'ST']], on='factor', how='left')
+    return df.sort_values('swing', ascending=False, ignore_index=True)
+
+
+@dataclass
+class AdaptiveCurve:
+    """Samples from ``adaptive_curve`` sorted by ``x`` plus the breakpoints found."""
+
+    param: str
+    x: np.ndarray
+    y: np.ndarray
+    breakpoints: pd.DataFrame
+    runs: int
+
+
+def adaptive_curve(
+    data: Dict,
+    param: str,
+    lower: float,
+    upper: float,
+    budget: int = 64,
+    initial: int = 5,
+    batch_size: int = 8,
+    x_tolerance: Optional[float] = None,
+    y_tolerance: float = 1e-6,
+    base_config: Optional[SimulationConfig] = None,
+    days: int = 30,
+    assistants: int = 0,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+    on_round: Optional[Callable[[np.ndarray, np.ndarray], None]] = None,
+) -> AdaptiveCurve:
+    """Sample final cash along ``param`` where the curve bends or jumps.
+
+    Final cash is piecewise linear in each knob, with kinks and jumps where an
+    asset purchase day or a hustle run count shifts. Starting from ``initial``
+    evenly spaced points, each round evaluates the midpoints of the
+    ``batch_size`` largest pending intervals in one batch. An interval whose
+    midpoint lies on its chord (within ``y_tolerance``, relative to the value
+    range) is accepted as linear; otherwise both halves stay pending. Intervals
+    narrower than ``x_tolerance`` (default: 1/1000 of the range) become
+    breakpoints, with touching intervals merged into one bracket. Refinement
+    stops once ``budget`` simulations have run; any interval still pending is
+    reported as an unresolved breakpoint bracket.
+
+    ``on_round`` receives the sorted ``x`` and ``y`` sampled so far after the
+    initial points and after every refinement round.
+    """
+
+    if upper <= lower:
+        raise ValueError(f'Empty range for {param}: {lower}..{upper}')
+    x_tolerance = x_tolerance if x_tolerance is not None else (upper - lower) / 1000
+    scope = dict(
+        base_config=base_config,
+        days=days,
+        assistants=assistants,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+
+    def evaluate(values: Sequence[float]) -> np.ndarray:
+        return evaluate_design(data, [param], np.asarray(values, dtype=float)[:, None], **scope)
+
+    xs = list(np.linspace(lower, upper, max(2, min(initial, budget))))
+    values = dict(zip(xs, evaluate(xs)))
+    runs = len(xs)
+    pending = list(zip(xs[:-1], xs[1:]))
+    resolved: List[Tuple[float, float]] = []
+
+    def y_range() -> float:
+        ys = list(values.values())
+        return max(max(ys) - min(ys), 1.0)
+
+    def report() -> None:
+        if on_round is not None:
+            x = np.array(sorted(values))
+            on_round(x, np.array([values[v] for v in x]))
+
+    def score(interval: Tuple[float, float]) -> float:
+        a, b = interval
+        return float(np.hypot((b - a) / (upper - lower), (values[b] - values[a]) / y_range()))
+
+    report()
+    while runs < budget:
+        narrow = [interval for interval in pending if interval[1] - interval[0] <= x_tolerance]
+        resolved.extend(narrow)
+        pending = [interval for interval in pending if interval[1] - interval[0] > x_tolerance]
+        if not pending:
+            break
+        pending.sort(key=score, reverse=True)
+        chosen = pending[:min(batch_size, budget - runs)]
+        pending = pending[len(chosen):]
+        midpoints = [(a + b) / 2 for a, b in chosen]
+        for (a, b), m, y in zip(chosen, midpoints, evaluate(midpoints)):
+            values[m] = y
+            chord_gap = abs(y - (values[a] + values[b]) / 2)
+            if chord_gap > y_tolerance * y_range():
+                pending.extend([(a, m), (m, b)])
+        runs += len(chosen)
+        report()
+
+    rows = []
+    for status, intervals in (('resolved', resolved), ('unresolved', pending)):
+        merged: List[List[float]] = []
+        for a, b in sorted(intervals):
+            if merged and merged[-1][1] == a:
+                merged[-1][1] = b
+            else:
+                merged.append([a, b])
+        for a, b in merged:
+            rows.append(
+                {
+                    'lower': a,
+                    'upper': b,
+                    'location': (a + b) / 2,
+                    'value_before': values[a],
+                    'value_after': values[b],
+                    'jump': values[b] - values[a],
+                    'resolved': status == 'resolved',
+                }
+            )
+    breakpoints = pd.DataFrame(
+        rows, columns=['lower', 'upper', 'location', 'value_before', 'value_after', 'jump', 'resolved']
+    ).sort_values('location', ignore_index=True)
+
+    x = np.array(sorted(values))
+    return AdaptiveCurve(
+        param=param,
+        x=x,
+        y=np.array([values[v] for v in x]),
+        breakpoints=breakpoints,
+        runs=runs,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Global sensitivity of final cash to SimulationConfig fields.')
+    parser.add_argument('--samples', type=int, default=512)
+    parser.add_argument('--method', choices=['lhs', 'halton', 'sobol'], default='lhs')
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--asset', action='append', dest='assets', default=None)
+    parser.add_argument('--upgrade', action='append', dest='upgrades', default=None)
+    parser.add_argument('--morris', type=int, default=0, metavar='TRAJECTORIES',
+                        help='Also run a Morris screen with this many trajectories.')
+    args = parser.parse_args(argv)
+
+    data = load_data()
+    scope = dict(days=args.days, asset_ids=args.assets, upgrade_ids=args.upgrades)
+    indices = sobol_indices(data, samples=args.samples, method=args.method, seed=args.seed, **scope)
+    print('Sobol indices:')
+    print(indices.to_string(index=False))
+    print('Tornado summary:')
+    print(tornado_summary(data, indices=indices, **scope).to_string(index=False))
+    if args.morris:
+        print('Morris screening:')
+        print(morris_screening(data, trajectories=args.morris, seed=args.seed, **scope).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,27 @@
 import ast
+import hashlib
+import itertools
 import json
 import math
 import re
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+if __package__ in (None, ''):
+    # ``python scripts/economy_simulations.py`` puts scripts/ on the path, not the repo root.
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts import economy_kernel as kernel
+
+if TYPE_CHECKING:  # economy_trace imports this module lazily; only the annotation needs it
+    from scripts.economy_trace import DecisionTrace
+
 DATA_PATH = Path('docs/normalized_economy.json')
 OUTPUT_DIR = Path('docs/archive/economy_sim_report_assets')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -40,8 +52,21 @@ class SimulationConfig:
 
 
 def load_data():
-    with DATA_PATH.open() as f:
-        return json.load(f)
+    """Return the dataset as nested dicts, validated once per file version per process.
+
+    The dict is shared with other callers in this process; treat it as read-only.
+    """
+
+    from scripts.economy_dataset import load_dataset
+
+    return load_dataset(DATA_PATH).raw
+
+
+def dataset_hash(data: Dict) -> str:
+    """Stable content hash of a loaded dataset, used to key on-disk caches."""
+
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
 
 
 @dataclass
@@ -107,7 +132,7 @@ def _safe_eval(expr: str) -> float:
 def _evaluate_formula(formula: str, value: float) -> float:
     expr = formula
     for token in ("income", "minutes", "progress", "cash"):
-        expr = re.sub(rf"\\b{token}\\b", str(value), expr)
+        expr = re.sub(rf"\b{token}\b", str(value), expr)
     return _safe_eval(expr)
 
 
@@ -119,54 +144,117 @@ def _average_income(definition: Dict) -> float:
     return float(definition.get('base_income', 0.0))
 
 
-def _matches_tags(entity_tags: Sequence[str], item_tags: Sequence[str]) -> bool:
-    return any(tag in item_tags for tag in entity_tags)
+class TagIndex:
+    """Bitset view of one entity collection (assets or hustles).
+
+    Each entity gets a bit, each tag keeps the mask of entities carrying it, and
+    compiled selectors are cached, so resolving a selector against a selection
+    is one ``&``. Selectors are the text inside ``assets[...]``/``hustles[...]``:
+    ``tag=a|b`` (any), ``tag=a&b`` (all), ``tag!=a|b`` (none), ``id=x|y``, and
+    comma-separated clauses that must all hold (``tag=video,tag!=software``).
+    """
+
+    def __init__(self, entities: Dict[str, Dict]):
+        self.ids: Tuple[str, ...] = tuple(entities)
+        self.position: Dict[str, int] = {entity_id: bit for bit, entity_id in enumerate(self.ids)}
+        self.all_mask = (1 << len(self.ids)) - 1
+        self.tag_members: Dict[str, int] = {}
+        for entity_id, definition in entities.items():
+            for tag in definition.get('tags', []) or []:
+                self.tag_members[tag] = self.tag_members.get(tag, 0) | (1 << self.position[entity_id])
+        self._selectors: Dict[str, int] = {}
+
+    def mask_of(self, entity_ids: Iterable[str]) -> int:
+        mask = 0
+        for entity_id in entity_ids:
+            bit = self.position.get(entity_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def ids_in(self, mask: int, entity_ids: Sequence[str]) -> List[str]:
+        """Members of ``entity_ids`` (order kept) whose bit is set in ``mask``."""
+
+        return [
+            entity_id
+            for entity_id in entity_ids
+            if entity_id in self.position and mask >> self.position[entity_id] & 1
+        ]
+
+    def select(self, selector: str) -> int:
+        """Entity mask matched by ``selector``; unknown fields or malformed clauses match nothing."""
+
+        mask = self._selectors.get(selector)
+        if mask is None:
+            mask = self.all_mask
+            for clause in selector.split(','):
+                mask &= self._clause_mask(clause.strip())
+            self._selectors[selector] = mask
+        return mask
+
+    def _clause_mask(self, clause: str) -> int:
+        if '=' not in clause:
+            return 0
+        field_name, raw = clause.split('=', 1)
+        negate = field_name.endswith('!')
+        field_name = field_name.rstrip('!')
+        require_all = '&' in raw
+        values = raw.split('&' if require_all else '|')
+        if field_name == 'tag':
+            members = [self.tag_members.get(value, 0) for value in values]
+        elif field_name == 'id':
+            members = [self.mask_of([value]) for value in values]
+        else:
+            return 0
+        mask = 0
+        if require_all:
+            mask = self.all_mask
+            for member in members:
+                mask &= member
+        else:
+            for member in members:
+                mask |= member
+        return self.all_mask & ~mask if negate else mask
 
 
-def _resolve_asset_targets(
-    key: str, asset_ids: Sequence[str], assets: Dict[str, Dict]
+_TAG_INDEXES: Dict[int, Tuple[Dict, TagIndex]] = {}
+
+
+def tag_index(entities: Dict[str, Dict]) -> TagIndex:
+    """Return the cached ``TagIndex`` for this (read-only) entity mapping."""
+
+    cached = _TAG_INDEXES.get(id(entities))
+    if cached is None or cached[0] is not entities:
+        if len(_TAG_INDEXES) >= 64:
+            _TAG_INDEXES.clear()
+        cached = (entities, TagIndex(entities))
+        _TAG_INDEXES[id(entities)] = cached
+    return cached[1]
+
+
+def _resolve_targets(
+    key: str, prefix: str, entity_ids: Sequence[str], entities: Dict[str, Dict]
 ) -> List[str]:
-    if key.startswith('asset:'):
+    if key.startswith(prefix + ':'):
         target_id = key.split(':', 1)[1]
-        return [target_id] if target_id in asset_ids else []
-    if key.startswith('assets[') and key.endswith(']'):
-        inner = key[len('assets['):-1]
-        if '=' not in inner:
-            return []
-        field, raw = inner.split('=', 1)
-        values = raw.split('|')
-        if field == 'tag':
-            return [
-                asset_id
-                for asset_id in asset_ids
-                if _matches_tags(values, assets[asset_id].get('tags', []))
-            ]
-        if field == 'id':
-            return [asset_id for asset_id in asset_ids if asset_id in values]
+        return [target_id] if target_id in entity_ids else []
+    if key.startswith(prefix + 's[') and key.endswith(']'):
+        index = tag_index(entities)
+        selected = index.select(key[len(prefix) + 2:-1])
+        return index.ids_in(selected, entity_ids)
     return []
 
 
+def _resolve_asset_targets(
+    key: str, asset_ids: Sequence[str], assets: Dict[str, Dict]
+) -> List[str]:
+    return _resolve_targets(key, 'asset', asset_ids, assets)
+
+
 def _resolve_hustle_targets(
     key: str, hustle_ids: Sequence[str], hustles: Dict[str, Dict]
 ) -> List[str]:
-    if key.startswith('hustle:'):
-        target_id = key.split(':', 1)[1]
-        return [target_id] if target_id in hustle_ids else []
-    if key.startswith('hustles[') and key.endswith(']'):
-        inner = key[len('hustles['):-1]
-        if '=' not in inner:
-            return []
-        field, raw = inner.split('=', 1)
-        values = raw.split('|')
-        if field == 'tag':
-            return [
-                hustle_id
-                for hustle_id in hustle_ids
-                if _matches_tags(values, hustles[hustle_id].get('tags', []))
-            ]
-        if field == 'id':
-            return [hustle_id for hustle_id in hustle_ids if hustle_id in values]
-    return []
+    return _resolve_targets(key, 'hustle', hustle_ids, hustles)
 
 
 def compute_upgrade_effects(
@@ -314,6 +402,8 @@ def run_simulation(
     config: Optional[SimulationConfig] = None,
     asset_ids: Optional[Sequence[str]] = None,
     upgrade_ids: Optional[Sequence[str]] = None,
+    trace: Optional['DecisionTrace'] = None,
+    trace_index: Optional[int] = None,
 ):
     if config is None:
         config = SimulationConfig()
@@ -372,9 +462,6 @@ def run_simulation(
                 'maintenance_minutes': maintenance_minutes,
                 'maintenance_cost': maintenance_cost,
                 'daily_income': adjusted_income,
-                'started': False,
-                'progress_days': 0,
-                'active': False,
             }
         )
 
@@ -395,107 +482,64 @@ def run_simulation(
     )
     survey_limit = survey_def['daily_limit']
 
-    records: List[Dict] = []
+    # Flatten everything the day loop reads for the (optionally JIT-compiled) kernel.
+    asset_matrix = np.zeros((len(asset_states), kernel.ASSET_FIELDS))
+    for slot, asset in enumerate(asset_states):
+        asset_matrix[slot, kernel.SETUP_COST] = asset['setup_cost']
+        asset_matrix[slot, kernel.SETUP_DAYS] = asset['setup_days_required']
+        asset_matrix[slot, kernel.SETUP_HOURS] = asset['setup_minutes_per_day'] / 60
+        asset_matrix[slot, kernel.MAINTENANCE_HOURS] = asset['maintenance_minutes'] / 60
+        asset_matrix[slot, kernel.MAINTENANCE_COST] = asset['maintenance_cost']
+        asset_matrix[slot, kernel.DAILY_INCOME] = asset['daily_income']
+    params = np.zeros(kernel.PARAM_FIELDS)
+    params[kernel.DAY_HOURS] = day_hours
+    params[kernel.WAGES] = assistant_daily_cost
+    params[kernel.FREELANCE_HOURS] = freelance_hours
+    params[kernel.FREELANCE_INCOME] = freelance_income
+    params[kernel.SURVEY_HOURS] = survey_hours
+    params[kernel.SURVEY_INCOME] = survey_income
+    params[kernel.SURVEY_LIMIT] = np.inf if survey_limit is None else survey_limit
+    state = kernel.KernelState(asset_matrix, cash)
+
+    traced_run = None
+    if trace is not None:
+        traced_run = trace.begin(config, assistants, days, [asset['id'] for asset in asset_states], trace_index)
+    if traced_run is None:
+        out, earning = state.run(days, params, asset_matrix)
+    else:
+        out, earning = trace.record(traced_run, state, days, params, asset_matrix)
+    if not days:
+        return pd.DataFrame([]), SimulationMetrics(total_days=days)
+
+    records: Dict[str, List] = {'day': list(range(1, days + 1))}
+    for column, name in enumerate(kernel.OUTPUT_COLUMNS[:-1]):
+        values = out[:, column]
+        records[name] = values.astype(np.int64) if name.endswith('_runs') else values
+    # Keep the config's own number type, as the per-day dicts used to.
+    records['assistant_wages'] = [assistant_daily_cost] * days
+    asset_ids_by_slot = [asset['id'] for asset in asset_states]
+    records['active_assets'] = [', '.join(itertools.compress(asset_ids_by_slot, row)) for row in earning.tolist()]
+    records['active_asset_count'] = earning.sum(axis=1).astype(np.int64)
+    records['time_bonus_minutes'] = [upgrade_effects.time_bonus_minutes] * days
+
+    # Metrics keys keep the order in which each source first earned.
     metrics = SimulationMetrics(total_days=days)
-
-    for day in range(1, days + 1):
-        cash_start = cash
-        hours_left = day_hours
-        hustle_income_today = 0.0
-        asset_income_today = 0.0
-        maintenance_spend_today = 0.0
-        wages_today = assistant_daily_cost
-        setup_hours_today = 0.0
-        maintenance_hours_today = 0.0
-        hours_spent_hustles = {'freelance': 0.0, 'surveySprint': 0.0}
-        hustle_runs_today = {'freelance': 0, 'surveySprint': 0}
-
-        for asset in asset_states:
-            if not asset['started'] and cash >= asset['setup_cost']:
-                cash -= asset['setup_cost']
-                asset['started'] = True
-                asset['progress_days'] = 0
-                if asset['setup_days_required'] == 0:
-                    asset['active'] = True
-
-        for asset in asset_states:
-            if asset['started'] and not asset['active']:
-                if asset['setup_days_required'] == 0 or asset['setup_minutes_per_day'] == 0:
-                    asset['active'] = True
-                    continue
-                required_hours = asset['setup_minutes_per_day'] / 60
-                if hours_left >= required_hours:
-                    hours_left -= required_hours
-                    setup_hours_today += required_hours
-                    asset['progress_days'] += 1
-                    if asset['progress_days'] >= asset['setup_days_required']:
-                        asset['active'] = True
-
-        active_asset_ids: List[str] = []
-        for asset in asset_states:
-            if not asset['active']:
-                continue
-            maintenance_hours = asset['maintenance_minutes'] / 60
-            if maintenance_hours > hours_left and maintenance_hours > 0:
-                continue
-            if maintenance_hours > 0:
-                hours_left -= maintenance_hours
-                maintenance_hours_today += maintenance_hours
-            cash -= asset['maintenance_cost']
-            maintenance_spend_today += asset['maintenance_cost']
-            cash += asset['daily_income']
-            asset_income_today += asset['daily_income']
-            metrics.asset_income[asset['id']] = metrics.asset_income.get(asset['id'], 0.0) + asset['daily_income']
-            active_asset_ids.append(asset['id'])
-
-        if freelance_hours > 0:
-            freelance_runs = int(hours_left // freelance_hours)
-        else:
-            freelance_runs = 0
-        for _ in range(freelance_runs):
-            hours_left -= freelance_hours
-            hours_spent_hustles['freelance'] += freelance_hours
-            cash += freelance_income
-            hustle_income_today += freelance_income
-            metrics.hustle_income['freelance'] = metrics.hustle_income.get('freelance', 0.0) + freelance_income
-            metrics.hustle_runs['freelance'] = metrics.hustle_runs.get('freelance', 0) + 1
-            hustle_runs_today['freelance'] += 1
-
-        if survey_hours > 0:
-            survey_runs_possible = int(hours_left // survey_hours)
-        else:
-            survey_runs_possible = 0
-        survey_runs = min(survey_runs_possible, survey_limit)
-        for _ in range(survey_runs):
-            hours_left -= survey_hours
-            hours_spent_hustles['surveySprint'] += survey_hours
-            cash += survey_income
-            hustle_income_today += survey_income
-            metrics.hustle_income['surveySprint'] = metrics.hustle_income.get('surveySprint', 0.0) + survey_income
-            metrics.hustle_runs['surveySprint'] = metrics.hustle_runs.get('surveySprint', 0) + 1
-            hustle_runs_today['surveySprint'] += 1
-
-        cash -= wages_today
-
-        record = {
-            'day': day,
-            'cash_start': cash_start,
-            'cash_end': cash,
-            'hustle_income': hustle_income_today,
-            'asset_income': asset_income_today,
-            'maintenance_spend': maintenance_spend_today,
-            'assistant_wages': wages_today,
-            'hours_freelance': hours_spent_hustles['freelance'],
-            'hours_survey': hours_spent_hustles['surveySprint'],
-            'hours_asset_setup': setup_hours_today,
-            'hours_asset_maintenance': maintenance_hours_today,
-            'freelance_runs': hustle_runs_today['freelance'],
-            'survey_runs': hustle_runs_today['surveySprint'],
-            'active_assets': ', '.join(active_asset_ids),
-            'active_asset_count': len(active_asset_ids),
-            'time_bonus_minutes': upgrade_effects.time_bonus_minutes,
-        }
-        records.append(record)
+    first_day = np.where(earning.any(axis=0), earning.argmax(axis=0), days)
+    for slot in sorted(np.flatnonzero(first_day < days), key=lambda slot: (first_day[slot], slot)):
+        asset_id = asset_ids_by_slot[slot]
+        metrics.asset_income[asset_id] = metrics.asset_income.get(asset_id, 0.0) + float(state.asset_income_total[slot])
+    hustle_columns = (
+        ('freelance', kernel.OUTPUT_COLUMNS.index('freelance_runs'), 0, 2),
+        ('surveySprint', kernel.OUTPUT_COLUMNS.index('survey_runs'), 1, 3),
+    )
+    hustle_first = []
+    for order, (hustle_id, runs_column, income_index, runs_index) in enumerate(hustle_columns):
+        ran = out[:, runs_column] > 0
+        if ran.any():
+            hustle_first.append((int(ran.argmax()), order, hustle_id, income_index, runs_index))
+    for _, _, hustle_id, income_index, runs_index in sorted(hustle_first):
+        metrics.hustle_income[hustle_id] = float(state.totals[income_index])
+        metrics.hustle_runs[hustle_id] = int(state.totals[runs_index])
 
     df = pd.DataFrame(records)
     return df, metrics
@@ -584,7 +628,7 @@ def compute_education_roi(data, baseline_metrics: SimulationMetrics, baseline_da
     return df
 
 
-def plot_daily_cashflow(df):
+def plot_daily_cashflow(df, output_dir: Optional[Path] = None):
     plt.figure(figsize=(10, 6))
     plt.plot(df['day'], df['cash_end'], marker='o')
     plt.title('Baseline Daily Cashflow (30 Days)')
@@ -592,13 +636,13 @@ def plot_daily_cashflow(df):
     plt.ylabel('Ending Cash ($)')
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    path = OUTPUT_DIR / 'daily_cashflow.svg'
+    path = (output_dir or OUTPUT_DIR) / 'daily_cashflow.svg'
     plt.savefig(path, dpi=150)
     plt.close()
     return path
 
 
-def plot_exponential_curve(df):
+def plot_exponential_curve(df, output_dir: Optional[Path] = None):
     fitted, slope, intercept = fit_exponential(df['day'], df['cash_end'])
     plt.figure(figsize=(10, 6))
     plt.plot(df['day'], df['cash_end'], label='Observed', marker='o')
@@ -609,65 +653,71 @@ def plot_exponential_curve(df):
     plt.legend()
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    path = OUTPUT_DIR / 'cash_vs_time_exponential.svg'
+    path = (output_dir or OUTPUT_DIR) / 'cash_vs_time_exponential.svg'
     plt.savefig(path, dpi=150)
     plt.close()
     return path, slope
 
 
-def plot_assistant_scenarios(data, days=30):
-    plt.figure(figsize=(10, 6))
+def assistant_scenario_frames(data, days=30, counts: Sequence[int] = range(0, 4)) -> Dict[int, pd.DataFrame]:
+    """Baseline runs for each assistant count, simulated together in one batch."""
+
+    from scripts.economy_batch import run_simulation_batch
+
+    counts = list(counts)
+    result = run_simulation_batch(data, [SimulationConfig() for _ in counts], days=days, assistants=np.array(counts))
+    return {assistants: result.frame(i) for i, assistants in enumerate(counts)}
+
+
+def summarize_assistant_frames(frames: Dict[int, pd.DataFrame], days=30) -> pd.DataFrame:
     assistant_results = []
-    for assistants in range(0, 4):
-        df, _ = run_simulation(data, days=days, assistants=assistants)
-        plt.plot(df['day'], df['cash_end'], label=f'{assistants} assistants')
+    for assistants, df in frames.items():
         avg_delta = (df['cash_end'].iloc[-1] - df['cash_start'].iloc[0]) / days
         assistant_results.append({'assistants': assistants, 'avg_daily_change': avg_delta})
+    return pd.DataFrame(assistant_results)
+
+
+def plot_assistant_frames(frames: Dict[int, pd.DataFrame], output_dir: Optional[Path] = None):
+    plt.figure(figsize=(10, 6))
+    for assistants, df in frames.items():
+        plt.plot(df['day'], df['cash_end'], label=f'{assistants} assistants')
     plt.title('Assistant Cost Sustainability')
     plt.xlabel('Day')
     plt.ylabel('Ending Cash ($)')
     plt.legend()
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    path = OUTPUT_DIR / 'assistant_sustainability.svg'
+    path = (output_dir or OUTPUT_DIR) / 'assistant_sustainability.svg'
     plt.savefig(path, dpi=150)
     plt.close()
-    return path, pd.DataFrame(assistant_results)
+    return path
+
 
+def plot_assistant_scenarios(data, days=30, output_dir: Optional[Path] = None):
+    frames = assistant_scenario_frames(data, days=days)
+    path = plot_assistant_frames(frames, output_dir=output_dir)
+    return path, summarize_assistant_frames(frames, days=days)
 
-def plot_education_roi(df):
+
+def plot_education_roi(df, output_dir: Optional[Path] = None):
     plt.figure(figsize=(12, 7))
     plt.barh(df['track'], df['roi_per_hour'])
     plt.title('Education ROI per Study Hour')
     plt.xlabel('Daily Cash Gain per Study Hour ($/day-hour)')
     plt.ylabel('Knowledge Track')
     plt.tight_layout()
-    path = OUTPUT_DIR / 'education_roi.svg'
+    path = (output_dir or OUTPUT_DIR) / 'education_roi.svg'
     plt.savefig(path, dpi=150)
     plt.close()
     return path
 
 
 def main():
-    data = load_data()
-    baseline_df, baseline_metrics = run_simulation(data, days=30)
-    baseline_df.to_csv(OUTPUT_DIR / 'baseline_daily_cashflow.csv', index=False)
-    plot_daily_cashflow(baseline_df)
-    exp_path, slope = plot_exponential_curve(baseline_df)
-
-    assistant_path, assistant_summary = plot_assistant_scenarios(data, days=30)
-    assistant_summary.to_csv(OUTPUT_DIR / 'assistant_summary.csv', index=False)
-
-    baseline_daily = baseline_metrics.as_daily()
-    education_df = compute_education_roi(data, baseline_metrics, baseline_daily)
-    education_df.to_csv(OUTPUT_DIR / 'education_roi.csv', index=False)
-    plot_education_roi(education_df.head(10))
-
-    print('Baseline exponential slope:', slope)
-    print('Assistant summary:')
-    print(assistant_summary)
-    print('Top education ROI:')
-    print(education_df.head(5))
+    """Regenerate the report assets; see ``scripts.economy_report`` for the task graph."""
+
+    from scripts.economy_report import main as report_main
+
+    report_main()
 
 
 if __name__ == '__main__':
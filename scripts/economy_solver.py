@@ -0,0 +1,286 @@
+"""Time-to-target questions answered with batched simulation runs.
+
+``days_to_targets`` reports the first day each cash threshold is crossed for a
+batch of configs, retiring scenarios as soon as every threshold is met.
+``minimal_multiplier`` answers the inverse question by bracketing and bisecting
+a config field until the target day is reached.
+"""
+
+import argparse
+import dataclasses
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from scripts.economy_batch import AssistantSpec, BatchState, compile_batch, step_day
+from scripts.economy_simulations import SimulationConfig, load_data
+
+Threshold = Union[float, str]
+
+BREAK_EVEN = 'break_even'
+
+
+def _threshold_label(threshold: Threshold) -> str:
+    if threshold == BREAK_EVEN:
+        return BREAK_EVEN
+    return f'cash_{threshold:g}'
+
+
+def _threshold_matrix(thresholds: Sequence[Threshold], configs: Sequence[SimulationConfig]) -> np.ndarray:
+    columns = []
+    for threshold in thresholds:
+        if threshold == BREAK_EVEN:
+            columns.append([config.starting_cash for config in configs])
+        elif isinstance(threshold, str):
+            raise ValueError(f'Unknown threshold: {threshold}')
+        else:
+            columns.append([float(threshold)] * len(configs))
+    return np.array(columns, dtype=float).T.reshape(len(configs), len(thresholds))
+
+
+def first_crossing_days(
+    data: Dict,
+    configs: Sequence[SimulationConfig],
+    thresholds: Sequence[Threshold],
+    max_days: int = 365,
+    assistants: AssistantSpec = 0,
+    build_blog: bool = True,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> np.ndarray:
+    """Return a ``(configs, thresholds)`` array of first days with ``cash_end >= threshold``.
+
+    Thresholds never reached within ``max_days`` are ``NaN``. ``'break_even'``
+    resolves to each config's starting cash, i.e. the day hiring costs are recouped.
+    Scenarios drop out of the batch as soon as all of their thresholds are met.
+    """
+
+    configs = list(configs)
+    targets = _threshold_matrix(thresholds, configs)
+    crossed = np.full(targets.shape, np.nan)
+    if not configs or not thresholds:
+        return crossed
+
+    plan = compile_batch(
+        data,
+        configs,
+        assistants=assistants,
+        build_blog=build_blog,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+    state = BatchState.initial(plan)
+    live = np.arange(len(configs))
+
+    for day in range(1, max_days + 1):
+        cash_end = step_day(plan, state)['cash_end']
+        hits = np.isnan(crossed[live]) & (cash_end[:, None] >= targets[live])
+        rows, columns = np.nonzero(hits)
+        crossed[live[rows], columns] = day
+
+        pending = np.isnan(crossed[live]).any(axis=1)
+        if not pending.all():
+            keep = np.flatnonzero(pending)
+            if not len(keep):
+                break
+            plan = plan.take(keep)
+            state = state.take(keep)
+            live = live[keep]
+
+    return crossed
+
+
+def days_to_targets(
+    data: Dict,
+    configs: Sequence[SimulationConfig],
+    thresholds: Sequence[Threshold],
+    max_days: int = 365,
+    assistants: AssistantSpec = 0,
+    build_blog: bool = True,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Tabulate ``first_crossing_days`` with one row per config and one column per threshold."""
+
+    configs = list(configs)
+    crossed = first_crossing_days(
+        data,
+        configs,
+        thresholds,
+        max_days=max_days,
+        assistants=assistants,
+        build_blog=build_blog,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+    df = pd.DataFrame(crossed, columns=[_threshold_label(t) for t in thresholds])
+    df.insert(0, 'assistants', np.broadcast_to(np.asarray(assistants), (len(configs),)))
+    df.insert(0, 'scenario', np.arange(len(configs)))
+    return df
+
+
+def minimal_multiplier(
+    data: Dict,
+    base_configs: Union[SimulationConfig, Sequence[SimulationConfig]],
+    param: str,
+    threshold: Threshold,
+    target_day: int,
+    lower: float = 0.0,
+    upper: float = 1.0,
+    tolerance: float = 1e-3,
+    points_per_round: int = 8,
+    max_expansions: int = 10,
+    max_rounds: int = 100,
+    assistants: AssistantSpec = 0,
+    build_blog: bool = True,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Find the smallest ``param`` value that crosses ``threshold`` by ``target_day``.
+
+    Assumes the crossing day falls monotonically as ``param`` grows (true for the
+    income multipliers). ``upper`` is doubled until it succeeds, then every round
+    evaluates ``points_per_round`` interior values for every base config in one
+    batch and keeps the sub-interval around the first success. The returned
+    ``value`` always succeeds; ``lower`` is the largest value known to fail.
+    Configs that never succeed report ``NaN``. Refinement stops after
+    ``max_rounds`` rounds, or once an interval stops shrinking because
+    ``tolerance`` is below the float spacing at ``value``.
+    """
+
+    if points_per_round < 1:
+        raise ValueError('points_per_round must be at least 1')
+    if not tolerance > 0:
+        raise ValueError('tolerance must be positive')
+    if isinstance(base_configs, SimulationConfig):
+        base_configs = [base_configs]
+    base_configs = list(base_configs)
+    count = len(base_configs)
+    assistant_counts = np.broadcast_to(np.asarray(assistants), (count,))
+    evaluations = np.zeros(count, dtype=np.int64)
+
+    def evaluate(rows: np.ndarray, values: np.ndarray) -> np.ndarray:
+        # values is (len(rows), k); returns the crossing day for each candidate.
+        k = values.shape[1]
+        configs = [
+            dataclasses.replace(base_configs[row], **{param: float(value)})
+            for row, row_values in zip(rows, values)
+            for value in row_values
+        ]
+        days = first_crossing_days(
+            data,
+            configs,
+            [threshold],
+            max_days=target_day,
+            assistants=np.repeat(assistant_counts[rows], k),
+            build_blog=build_blog,
+            asset_ids=asset_ids,
+            upgrade_ids=upgrade_ids,
+        )[:, 0]
+        np.add.at(evaluations, rows, k)
+        return days.reshape(len(rows), k)
+
+    lo = np.full(count, float(lower))
+    hi = np.full(count, float(upper))
+    rows = np.arange(count)
+
+    lower_days = evaluate(rows, lo[:, None])[:, 0]
+    solved_at_lower = ~np.isnan(lower_days)
+    hi[solved_at_lower] = lo[solved_at_lower]
+
+    pending = rows[~solved_at_lower]
+    found = np.zeros(count, dtype=bool)
+    found[solved_at_lower] = True
+    for _ in range(max_expansions + 1):
+        if not len(pending):
+            break
+        hit = ~np.isnan(evaluate(pending, hi[pending, None])[:, 0])
+        found[pending[hit]] = True
+        missed = pending[~hit]
+        lo[missed] = hi[missed]
+        hi[missed] = np.where(hi[missed] > 0, hi[missed] * 2, 1.0)
+        pending = missed
+
+    active = np.flatnonzero(found & ~solved_at_lower)
+    for _ in range(max_rounds):
+        if not len(active):
+            break
+        width = hi[active] - lo[active]
+        fractions = np.arange(1, points_per_round + 1) / (points_per_round + 1)
+        candidates = lo[active, None] + (hi[active] - lo[active])[:, None] * fractions
+        success = ~np.isnan(evaluate(active, candidates))
+        first = np.where(success.any(axis=1), success.argmax(axis=1), points_per_round)
+        new_hi = np.where(
+            first < points_per_round,
+            candidates[np.arange(len(active)), np.minimum(first, points_per_round - 1)],
+            hi[active],
+        )
+        new_lo = np.where(first > 0, candidates[np.arange(len(active)), np.maximum(first - 1, 0)], lo[active])
+        lo[active] = new_lo
+        hi[active] = new_hi
+        remaining = hi[active] - lo[active]
+        active = active[(remaining > tolerance) & (remaining < width)]
+
+    value = np.where(found, hi, np.nan)
+    solved_rows = np.flatnonzero(found)
+    day_reached = np.full(count, np.nan)
+    if len(solved_rows):
+        day_reached[solved_rows] = evaluate(solved_rows, value[solved_rows, None])[:, 0]
+
+    return pd.DataFrame(
+        {
+            'scenario': np.arange(count),
+            'param': param,
+            'value': value,
+            'lower': np.where(found & ~solved_at_lower, lo, np.nan),
+            'day_reached': day_reached,
+            'evaluations': evaluations,
+        }
+    )
+
+
+def _parse_threshold(raw: str) -> Threshold:
+    return BREAK_EVEN if raw == BREAK_EVEN else float(raw)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Report the first day each cash threshold is crossed.')
+    parser.add_argument('--threshold', action='append', type=_parse_threshold, default=None,
+                        help="Cash target (repeatable); use 'break_even' to recoup starting cash.")
+    parser.add_argument('--days', type=int, default=365, help='Horizon to search before giving up.')
+    parser.add_argument('--assistants', type=int, nargs='+', default=[0, 1, 2, 3])
+    parser.add_argument('--asset', action='append', dest='assets', default=None)
+    parser.add_argument('--upgrade', action='append', dest='upgrades', default=None)
+    parser.add_argument('--solve', metavar='PARAM', help='Also solve for the minimal PARAM hitting --target-day.')
+    parser.add_argument('--target-day', type=int, default=30)
+    args = parser.parse_args(argv)
+
+    thresholds = args.threshold or [1000.0, BREAK_EVEN]
+    data = load_data()
+    configs = [SimulationConfig() for _ in args.assistants]
+    print(days_to_targets(
+        data,
+        configs,
+        thresholds,
+        max_days=args.days,
+        assistants=np.array(args.assistants),
+        asset_ids=args.assets,
+        upgrade_ids=args.upgrades,
+    ).to_string(index=False))
+
+    if args.solve:
+        print(minimal_multiplier(
+            data,
+            configs,
+            args.solve,
+            thresholds[0],
+            args.target_day,
+            assistants=np.array(args.assistants),
+            asset_ids=args.assets,
+            upgrade_ids=args.upgrades,
+        ).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+"""Precomputed interpolation tables that answer workbench queries instantly.
+
+A surrogate covers one fixed horizon, assistant count, asset list, and upgrade
+list. It stores the daily ``cash_end`` curve at every node of a regular grid
+over the workbench slider ranges and answers new configs by multilinear
+interpolation.
+
+The error estimate is heuristic. Cash jumps wherever a purchase day shifts,
+so no cheap guaranteed bound exists. The raw estimate comes from the grid's
+second differences along each axis (the linear-interpolation error term).
+Grids with fewer than three nodes per axis fall back to the spread of the
+enclosing cell's corners. At build time each day's raw estimate gets its own
+``error_scale``: the ``CALIBRATION_COVERAGE`` quantile of the exact-error
+to raw-estimate ratio over ``CALIBRATION_SAMPLES`` held-out random configs.
+The band is therefore expected to hold for about that share of in-bounds
+queries, not for all of them.
+"""
+
+import hashlib
+import itertools
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scripts.economy_batch import BatchState, compile_batch, step_day
+from scripts.economy_sensitivity import DEFAULT_BOUNDS
+from scripts.economy_simulations import SimulationConfig, dataset_hash
+
+CACHE_DIR = Path(__file__).resolve().parents[1] / '.cache' / 'surrogates'
+
+SURROGATE_FIELDS = (
+    'starting_cash',
+    'base_day_hours',
+    'assistant_hire_cost',
+    'assistant_hourly_rate',
+    'assistant_hours_per_day',
+    'blog_income_multiplier',
+    'blog_setup_cost_multiplier',
+    'blog_maintenance_cost_multiplier',
+    'freelance_income_multiplier',
+    'survey_income_multiplier',
+)
+
+# Assistant pricing has no effect without assistants, so those axes are dropped.
+ASSISTANT_FIELDS = ('assistant_hire_cost', 'assistant_hourly_rate', 'assistant_hours_per_day')
+
+DEFAULT_MAX_POINTS = 200000
+BUILD_CHUNK = 4096
+CALIBRATION_SAMPLES = 256
+CALIBRATION_COVERAGE = 0.95
+# Ratios are taken against at least this many dollars so flat cells do not blow up the scale.
+CALIBRATION_FLOOR = 1.0
+
+
+@dataclass
+class SurrogatePrediction:
+    cash_end: np.ndarray
+    # Calibrated, not guaranteed: see the module docstring.
+    error_estimate: np.ndarray
+    extrapolated: bool
+
+
+@dataclass
+class Surrogate:
+    key: str
+    names: Tuple[str, ...]
+    axes: List[np.ndarray]
+    cash: np.ndarray
+    # The ``surrogate_payload`` the key was derived from, so caches can be re-keyed.
+    payload: Optional[Dict] = None
+    # Per-day multiplier on the raw interpolation error, fitted against held-out exact runs.
+    error_scale: Optional[np.ndarray] = None
+
+    @property
+    def days(self) -> int:
+        return self.cash.shape[-1]
+
+    def predict(self, config: SimulationConfig) -> SurrogatePrediction:
+        """Interpolate the daily ``cash_end`` curve for ``config`` with its calibrated error estimate."""
+
+        estimate, raw_error, extrapolated = self._interpolate(config)
+        return SurrogatePrediction(
+            cash_end=estimate,
+            error_estimate=raw_error if self.error_scale is None else self.error_scale * raw_error,
+            extrapolated=extrapolated,
+        )
+
+    def _interpolate(self, config: SimulationConfig) -> Tuple[np.ndarray, np.ndarray, bool]:
+        lower_index = []
+        fractions = []
+        extrapolated = False
+        for name, axis in zip(self.names, self.axes):
+            value = float(getattr(config, name))
+            if value < axis[0] or value > axis[-1]:
+                extrapolated = True
+                value = float(np.clip(value, axis[0], axis[-1]))
+            cell = int(np.clip(np.searchsorted(axis, value, side='right') - 1, 0, len(axis) - 2))
+            lower_index.append(cell)
+            fractions.append((value - axis[cell]) / (axis[cell + 1] - axis[cell]))
+
+        dims = len(self.names)
+        offsets = np.array(list(itertools.product((0, 1), repeat=dims)))
+        corner_index = np.asarray(lower_index) + offsets
+        fractions = np.asarray(fractions)
+        weights = np.prod(np.where(offsets == 1, fractions, 1.0 - fractions), axis=1)
+        corners = self.cash[tuple(corner_index.T)].astype(float)
+        estimate = weights @ corners
+        spread = np.abs(corners - estimate).max(axis=0)
+
+        curvature_error = np.zeros_like(estimate)
+        for dim, axis in enumerate(self.axes):
+            if len(axis) < 3:
+                curvature_error = spread
+                break
+            center = corner_index.copy()
+            center[:, dim] = np.clip(center[:, dim], 1, len(axis) - 2)
+            below = center.copy()
+            below[:, dim] -= 1
+            above = center.copy()
+            above[:, dim] += 1
+            second = np.abs(
+                self.cash[tuple(below.T)].astype(float)
+                - 2 * self.cash[tuple(center.T)]
+                + self.cash[tuple(above.T)]
+            ).max(axis=0)
+            curvature_error += 0.5 * fractions[dim] * (1 - fractions[dim]) * second
+        return estimate, curvature_error, extrapolated
+
+    def calibrate(self, configs: Sequence[SimulationConfig], exact_cash: np.ndarray) -> np.ndarray:
+        """Fit ``error_scale`` so each day's estimate covers ``CALIBRATION_COVERAGE`` of the exact errors."""
+
+        ratios = []
+        for config, exact in zip(configs, exact_cash):
+            estimate, raw_error, _ = self._interpolate(config)
+            ratios.append(np.abs(exact - estimate) / np.maximum(raw_error, CALIBRATION_FLOOR))
+        self.error_scale = np.maximum(1.0, np.quantile(np.array(ratios), CALIBRATION_COVERAGE, axis=0))
+        return self.error_scale
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        path = path or surrogate_path(self.key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez_compressed(
+            tmp_path,
+            names=np.array(self.names),
+            cash=self.cash,
+            payload=np.array(json.dumps(self.payload or {}, sort_keys=True)),
+            error_scale=np.ones(self.days) if self.error_scale is None else self.error_scale,
+            **{f'axis_{i}': axis for i, axis in enumerate(self.axes)},
+        )
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, key: str, path: Optional[Path] = None) -> Optional['Surrogate']:
+        path = path or surrogate_path(key)
+        if not path.exists():
+            return None
+        with np.load(path) as archive:
+            names = tuple(str(name) for name in archive['names'])
+            axes = [archive[f'axis_{i}'] for i in range(len(names))]
+            cash = archive['cash']
+            payload = json.loads(str(archive['payload'])) if 'payload' in archive.files else None
+            error_scale = archive['error_scale'] if 'error_scale' in archive.files else None
+        return cls(key=key, names=names, axes=axes, cash=cash, payload=payload or None, error_scale=error_scale)
+
+
+def surrogate_fields(assistants: int) -> Tuple[str, ...]:
+    if assistants:
+        return SURROGATE_FIELDS
+    return tuple(name for name in SURROGATE_FIELDS if name not in ASSISTANT_FIELDS)
+
+
+def surrogate_payload(
+    data: Dict,
+    days: int,
+    assistants: int,
+    asset_ids: Sequence[str],
+    upgrade_ids: Sequence[str],
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> Dict:
+    return {
+        'dataset': dataset_hash(data),
+        'days': int(days),
+        'assistants': int(assistants),
+        'assets': list(asset_ids),
+        'upgrades': list(upgrade_ids),
+        'bounds': {name: list(DEFAULT_BOUNDS[name]) for name in surrogate_fields(assistants)},
+        'max_points': int(max_points),
+        'calibration': [CALIBRATION_SAMPLES, CALIBRATION_COVERAGE],
+    }
+
+
+def payload_key(payload: Dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:20]
+
+
+def surrogate_key(
+    data: Dict,
+    days: int,
+    assistants: int,
+    asset_ids: Sequence[str],
+    upgrade_ids: Sequence[str],
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> str:
+    return payload_key(surrogate_payload(data, days, assistants, asset_ids, upgrade_ids, max_points=max_points))
+
+
+def surrogate_path(key: str) -> Path:
+    return CACHE_DIR / f'{key}.npz'
+
+
+def build_surrogate(
+    data: Dict,
+    days: int,
+    assistants: int,
+    asset_ids: Sequence[str],
+    upgrade_ids: Sequence[str],
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> Surrogate:
+    """Simulate every grid node with the batch runner and return the table.
+
+    Each axis gets the same node count, chosen so the grid stays within
+    ``max_points`` simulations. ``CALIBRATION_SAMPLES`` extra held-out runs
+    then fit ``error_scale``.
+    """
+
+    names = surrogate_fields(assistants)
+    nodes = max(2, int(np.floor(max_points ** (1.0 / len(names)) + 1e-9)))
+    axes = [np.linspace(*DEFAULT_BOUNDS[name], nodes) for name in names]
+    grid = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, len(names))
+    cash = _simulate_cash(data, names, grid, days, assistants, asset_ids, upgrade_ids).astype(np.float32)
+
+    payload = surrogate_payload(data, days, assistants, asset_ids, upgrade_ids, max_points=max_points)
+    surrogate = Surrogate(
+        key=payload_key(payload),
+        names=names,
+        axes=axes,
+        cash=cash.reshape(*([nodes] * len(names)), days),
+        payload=payload,
+    )
+
+    # Held-out points come from a fixed seed so rebuilding the same key gives the same scale.
+    rng = np.random.default_rng(0)
+    held_out = np.column_stack([rng.uniform(axis[0], axis[-1], CALIBRATION_SAMPLES) for axis in axes])
+    exact = _simulate_cash(data, names, held_out, days, assistants, asset_ids, upgrade_ids)
+    surrogate.calibrate([SimulationConfig(**dict(zip(names, map(float, row)))) for row in held_out], exact)
+    return surrogate
+
+
+def _simulate_cash(
+    data: Dict,
+    names: Sequence[str],
+    points: np.ndarray,
+    days: int,
+    assistants: int,
+    asset_ids: Sequence[str],
+    upgrade_ids: Sequence[str],
+) -> np.ndarray:
+    """Daily ``cash_end`` for every row of ``points`` (columns follow ``names``)."""
+
+    cash = np.empty((len(points), days))
+    for start in range(0, len(points), BUILD_CHUNK):
+        chunk = points[start:start + BUILD_CHUNK]
+        configs = [SimulationConfig(**dict(zip(names, map(float, row)))) for row in chunk]
+        plan = compile_batch(
+            data,
+            configs,
+            assistants=assistants,
+            asset_ids=list(asset_ids),
+            upgrade_ids=list(upgrade_ids),
+        )
+        state = BatchState.initial(plan)
+        for day in range(days):
+            cash[start:start + len(chunk), day] = step_day(plan, state)['cash_end']
+    return cash
+
+
+def load_or_build_surrogate(
+    data: Dict,
+    days: int,
+    assistants: int,
+    asset_ids: Sequence[str],
+    upgrade_ids: Sequence[str],
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> Surrogate:
+    """Return the persisted surrogate for this selection, building and saving it if missing."""
+
+    key = surrogate_key(data, days, assistants, asset_ids, upgrade_ids, max_points=max_points)
+    surrogate = Surrogate.load(key)
+    if surrogate is None:
+        surrogate = build_surrogate(data, days, assistants, asset_ids, upgrade_ids, max_points=max_points)
+        surrogate.save()
+    return surrogate
@@ -0,0 +1,310 @@
+"""Large parameter sweeps written straight into memory-mapped ``.npy`` files.
+
+A sweep directory holds one ``(scenarios, days)`` array per ``DAY_COLUMNS``
+entry, one ``(scenarios,)`` array per ``SUMMARY_COLUMNS`` entry (the fitted
+growth rate), the sampled inputs, and a small ``sweep.json`` header. The parent
+preallocates the files, worker processes each run a contiguous chunk of
+scenarios through ``run_simulation_batch`` and write their rows in place, and
+only the chunk bounds travel back over the pool. Readers get ``np.memmap``
+views, so a finished sweep can be reopened later without loading it.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scripts.economy_batch import DAY_COLUMNS, fit_exponential_batch, run_simulation_batch
+from scripts.economy_simulations import SimulationConfig, load_data
+from scripts.economy_trace import DecisionTrace, trace_scenarios
+
+SWEEP_DIR = Path(__file__).resolve().parents[1] / '.cache' / 'sweeps'
+HEADER_NAME = 'sweep.json'
+TRACE_NAME = 'trace.jsonl'
+CHUNK_SIZE = 2048
+INTEGER_COLUMNS = ('freelance_runs', 'survey_runs', 'active_asset_count')
+SUMMARY_COLUMNS = ('growth_rate',)
+
+# Dataset handed to pool workers once by the initializer instead of per chunk.
+_WORKER_DATA: Optional[Dict] = None
+
+
+def sample_params(
+    bounds: Mapping[str, tuple],
+    samples: int,
+    max_assistants: int = 3,
+    seed: Optional[int] = 0,
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """The draws behind ``sample_configs``: one uniform array per bounded field plus assistant counts."""
+
+    rng = np.random.default_rng(seed)
+    params = {name: rng.uniform(low, high, samples) for name, (low, high) in bounds.items()}
+    assistants = rng.integers(0, max_assistants + 1, samples)
+    return params, assistants
+
+
+def configs_from_params(
+    params: Mapping[str, np.ndarray],
+    indices: Iterable[int],
+    base_config: Optional[SimulationConfig] = None,
+) -> List[SimulationConfig]:
+    """``SimulationConfig`` objects for rows ``indices`` of ``params`` only."""
+
+    base_config = base_config or SimulationConfig()
+    return [
+        SimulationConfig(**{**base_config.__dict__, **{name: float(values[i]) for name, values in params.items()}})
+        for i in indices
+    ]
+
+
+def sample_configs(
+    bounds: Mapping[str, tuple],
+    samples: int,
+    base_config: Optional[SimulationConfig] = None,
+    max_assistants: int = 3,
+    seed: Optional[int] = 0,
+) -> Tuple[List[SimulationConfig], Dict[str, np.ndarray], np.ndarray]:
+    """Uniform random configs inside ``bounds`` plus a random assistant count per config."""
+
+    params, assistants = sample_params(bounds, samples, max_assistants, seed)
+    return configs_from_params(params, range(samples), base_config), params, assistants
+
+
+class SweepStore:
+    """Memory-mapped per-day columns for every scenario of a sweep."""
+
+    def __init__(self, path: Path, header: Dict, mode: str = 'r'):
+        self.path = Path(path)
+        self.header = header
+        self.mode = mode
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.load(self.path / f'{name}.npy', mmap_mode=mode) for name in header['columns']
+        }
+        # Sweeps written before summaries existed have none.
+        self.summaries: Dict[str, np.ndarray] = {
+            name: np.load(self.path / f'{name}.npy', mmap_mode=mode) for name in header.get('summaries', [])
+        }
+        self.params: Dict[str, np.ndarray] = {
+            name: np.load(self.path / f'param_{name}.npy', mmap_mode='r') for name in header['params']
+        }
+        self.assistants = np.load(self.path / 'assistants.npy', mmap_mode='r')
+
+    @classmethod
+    def create(
+        cls,
+        path: Path,
+        scenarios: int,
+        days: int,
+        params: Optional[Mapping[str, np.ndarray]] = None,
+        assistants: Optional[np.ndarray] = None,
+    ) -> 'SweepStore':
+        """Preallocate the column files (sparse on disk until written) and record the inputs."""
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in DAY_COLUMNS:
+            dtype = np.int64 if name in INTEGER_COLUMNS else np.float64
+            column = np.lib.format.open_memmap(path / f'{name}.npy', mode='w+', dtype=dtype, shape=(scenarios, days))
+            del column
+        for name in SUMMARY_COLUMNS:
+            column = np.lib.format.open_memmap(path / f'{name}.npy', mode='w+', dtype=np.float64, shape=(scenarios,))
+            del column
+        params = dict(params or {})
+        for name, values in params.items():
+            np.save(path / f'param_{name}.npy', np.asarray(values, dtype=float))
+        counts = np.zeros(scenarios, dtype=np.int64) if assistants is None else assistants
+        np.save(path / 'assistants.npy', np.broadcast_to(np.asarray(counts, dtype=np.int64), (scenarios,)))
+        header = {
+            'scenarios': int(scenarios),
+            'days': int(days),
+            'columns': list(DAY_COLUMNS),
+            'summaries': list(SUMMARY_COLUMNS),
+            'params': list(params),
+            'complete': False,
+        }
+        _write_header(path, header)
+        return cls(path, header, mode='r+')
+
+    @classmethod
+    def open(cls, path: Path, mode: str = 'r') -> 'SweepStore':
+        path = Path(path)
+        header = json.loads((path / HEADER_NAME).read_text())
+        return cls(path, header, mode=mode)
+
+    @property
+    def size(self) -> int:
+        return self.header['scenarios']
+
+    @property
+    def days(self) -> int:
+        return self.header['days']
+
+    @property
+    def cash_end(self) -> np.ndarray:
+        return self.columns['cash_end']
+
+    @property
+    def final_cash(self) -> np.ndarray:
+        return self.columns['cash_end'][:, -1]
+
+    @property
+    def growth_rate(self) -> np.ndarray:
+        """Slope of each scenario's log-linear cash fit (``fit_exponential_batch``)."""
+
+        return self.summaries['growth_rate']
+
+    def write(self, start: int, columns: Mapping[str, np.ndarray]) -> None:
+        """Copy a chunk's ``(rows, days)`` columns or ``(rows,)`` summaries into rows ``start:start + rows``."""
+
+        for name, values in columns.items():
+            target = self.summaries[name] if name in self.summaries else self.columns[name]
+            target[start:start + len(values)] = values
+
+    def flush(self) -> None:
+        for column in [*self.columns.values(), *self.summaries.values()]:
+            if isinstance(column, np.memmap):
+                column.flush()
+
+    def mark_complete(self) -> None:
+        self.flush()
+        self.header['complete'] = True
+        _write_header(self.path, self.header)
+
+    def frame(self, index: int) -> pd.DataFrame:
+        """Per-day columns of one scenario as a DataFrame (like ``BatchResult.frame`` minus asset names)."""
+
+        frame = pd.DataFrame({name: np.asarray(column[index]) for name, column in self.columns.items()})
+        frame.insert(0, 'day', np.arange(1, self.days + 1))
+        return frame
+
+    def inputs(self) -> pd.DataFrame:
+        frame = pd.DataFrame({name: np.asarray(values) for name, values in self.params.items()})
+        frame['assistants'] = np.asarray(self.assistants)
+        return frame
+
+
+def _write_header(path: Path, header: Dict) -> None:
+    tmp_path = path / f'{HEADER_NAME}.tmp'
+    tmp_path.write_text(json.dumps(header, indent=2))
+    tmp_path.replace(path / HEADER_NAME)
+
+
+def _init_worker(data: Optional[Dict]) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def _run_chunk(
+    path: str,
+    start: int,
+    configs: Sequence[SimulationConfig],
+    assistants: np.ndarray,
+    days: int,
+    asset_ids: Optional[Sequence[str]],
+    upgrade_ids: Optional[Sequence[str]],
+) -> Tuple[int, int]:
+    data = _WORKER_DATA if _WORKER_DATA is not None else load_data()
+    result = run_simulation_batch(
+        data,
+        configs,
+        days=days,
+        assistants=assistants,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+    store = SweepStore.open(Path(path), mode='r+')
+    store.write(start, {**result.columns, 'growth_rate': fit_exponential_batch(result.cash_end).slope})
+    store.flush()
+    return start, start + len(configs)
+
+
+def run_sweep(
+    configs: Sequence[SimulationConfig],
+    path: Path,
+    days: int = 30,
+    assistants=0,
+    data: Optional[Dict] = None,
+    params: Optional[Mapping[str, np.ndarray]] = None,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+    jobs: Optional[int] = None,
+) -> SweepStore:
+    """Simulate ``configs`` into a sweep directory at ``path`` and return read-only views.
+
+    With ``data=None`` each worker loads and validates the dataset itself,
+    once per process; otherwise ``data`` is sent to every worker once. Each
+    task pickles its own slice of ``configs``. ``jobs=1`` runs the
+    chunks inline.
+    """
+
+    scenarios = len(configs)
+    counts = np.broadcast_to(np.asarray(assistants, dtype=np.int64), (scenarios,))
+    store = SweepStore.create(path, scenarios, days, params=params, assistants=counts)
+    chunks = [(start, min(start + chunk_size, scenarios)) for start in range(0, scenarios, chunk_size)]
+    tasks = [
+        (str(store.path), start, list(configs[start:stop]), counts[start:stop], days, asset_ids, upgrade_ids)
+        for start, stop in chunks
+    ]
+
+    workers = min(len(tasks), jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        _init_worker(data)
+        try:
+            for task in tasks:
+                _run_chunk(*task)
+        finally:
+            _init_worker(None)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+            for future in [pool.submit(_run_chunk, *task) for task in tasks]:
+                future.result()
+
+    store.mark_complete()
+    return SweepStore.open(store.path)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from scripts.economy_sensitivity import DEFAULT_BOUNDS
+
+    parser = argparse.ArgumentParser(description='Run a random config sweep into memory-mapped .npy columns.')
+    parser.add_argument('name', help=f'Sweep directory (relative names go under {SWEEP_DIR}).')
+    parser.add_argument('--samples', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--jobs', type=int, default=None, help='Worker processes (default: CPU count; 1 runs inline).')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--trace-every', type=int, default=0,
+                        help=f'Also write decision traces for 1 in N scenarios to {TRACE_NAME} (0: off).')
+    args = parser.parse_args(argv)
+
+    path = Path(args.name) if Path(args.name).is_absolute() else SWEEP_DIR / args.name
+    bounds = {name: value for name, value in DEFAULT_BOUNDS.items() if name != 'assistants'}
+    configs, params, assistants = sample_configs(bounds, args.samples, seed=args.seed)
+    store = run_sweep(
+        configs,
+        path,
+        days=args.days,
+        assistants=assistants,
+        params=params,
+        chunk_size=args.chunk_size,
+        jobs=args.jobs,
+    )
+    final_cash = np.asarray(store.final_cash)
+    print(f'Wrote {store.size} scenarios x {store.days} days to {store.path}')
+    print(f'Final cash: median {np.median(final_cash):,.2f}, p90 {np.percentile(final_cash, 90):,.2f}')
+    print(f'Growth rate: median {np.nanmedian(store.growth_rate):.4f}/day')
+    if args.trace_every:
+        trace = DecisionTrace(every=args.trace_every)
+        traced = trace_scenarios(load_data(), configs, trace, days=args.days, assistants=assistants)
+        events = trace.write_jsonl(store.path / TRACE_NAME)
+        print(f'Traced {len(traced)} scenarios ({events} events, {trace.dropped} dropped) to {store.path / TRACE_NAME}')
+
+
+if __name__ == '__main__':
+    main()
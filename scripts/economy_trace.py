@@ -0,0 +1,292 @@
+"""Sampled decision traces for ``run_simulation``.
+
+Daily totals say what happened but not why. A ``DecisionTrace`` passed as
+``run_simulation(..., trace=...)`` picks a sample of runs, either 1 in
+``every`` calls or only those matching ``predicate``. For each sampled run it
+records the decisions behind the totals:
+
+- which asset was bought on which day, and with how much cash in hand;
+- each day of setup work, and each day setup stalled for lack of hours;
+- when an asset went live;
+- when maintenance was skipped because ``maintenance_hours > hours_left``;
+- how the rest of the day went to freelancing, surveys and idle time.
+
+Events are fixed-width records in a NumPy ring buffer (``EVENT_DTYPE``, 40
+bytes each, padded so the float fields are 8-byte aligned). Once ``capacity`` events are stored, the oldest are overwritten.
+
+Unsampled runs take the normal one-call kernel path, so tracing costs them
+one ``None`` check. Sampled runs step the same kernel one day at a time and
+read the decisions off the state changes between days, so their results stay
+identical to an untraced run. ``trace_scenarios`` replays the sampled
+scenarios of a batch or sweep through the scalar path.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from scripts import economy_kernel as kernel
+
+PURCHASED, SETUP_WORKED, SETUP_STALLED, ACTIVATED, MAINTAINED, MAINTENANCE_SKIPPED, FREELANCE, SURVEY, IDLE = range(9)
+EVENT_NAMES = (
+    'purchased',
+    'setup_worked',
+    'setup_stalled',
+    'activated',
+    'maintained',
+    'maintenance_skipped',
+    'freelance',
+    'survey',
+    'idle',
+)
+
+# ``amount`` is the cost or the hours involved, ``hours_left`` the hours still
+# free when the decision was made, ``cash`` the cash in hand for purchases, and
+# ``count`` the setup progress or hustle runs. ``slot`` is -1 for day-level events.
+EVENT_DTYPE = np.dtype(
+    [
+        ('run', np.int32),
+        ('day', np.int32),
+        ('kind', np.int8),
+        ('slot', np.int16),
+        ('count', np.int32),
+        ('amount', np.float64),
+        ('hours_left', np.float64),
+        ('cash', np.float64),
+    ],
+    align=True,
+)
+DEFAULT_CAPACITY = 1 << 20
+
+_HUSTLE_COLUMNS = (
+    (FREELANCE, kernel.OUTPUT_COLUMNS.index('hours_freelance'), kernel.OUTPUT_COLUMNS.index('freelance_runs'),
+     kernel.FREELANCE_HOURS),
+    (SURVEY, kernel.OUTPUT_COLUMNS.index('hours_survey'), kernel.OUTPUT_COLUMNS.index('survey_runs'),
+     kernel.SURVEY_HOURS),
+)
+
+# Called with (call index, config, assistants); returning True traces the run.
+TracePredicate = Callable[[int, object, int], bool]
+
+
+class DecisionTrace:
+    """Sampling policy plus a ring buffer of decision events."""
+
+    def __init__(
+        self,
+        every: int = 1,
+        predicate: Optional[TracePredicate] = None,
+        capacity: int = DEFAULT_CAPACITY,
+    ):
+        if every < 1:
+            raise ValueError('every must be at least 1')
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.every = every
+        self.predicate = predicate
+        self.capacity = capacity
+        self.runs: Dict[int, Dict] = {}
+        self._events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self._written = 0
+        self._calls = 0
+
+    @property
+    def dropped(self) -> int:
+        """Events overwritten after the buffer filled up."""
+
+        return max(0, self._written - self.capacity)
+
+    def begin(self, config, assistants: int, days: int, asset_ids: Sequence[str], index: Optional[int] = None) -> Optional[int]:
+        """Decide whether this run is traced; returns its run id or ``None``.
+
+        ``index`` overrides the call counter (``trace_scenarios`` passes the
+        scenario index so sampling does not depend on call order).
+        """
+
+        if index is None:
+            index = self._calls
+            self._calls += 1
+        if index % self.every:
+            return None
+        if self.predicate is not None and not self.predicate(index, config, assistants):
+            return None
+        run = len(self.runs)
+        self.runs[run] = {'index': int(index), 'assistants': int(assistants), 'days': int(days), 'assets': list(asset_ids)}
+        return run
+
+    def emit(self, run: int, day: int, kind: int, slot: int = -1, count: int = 0,
+             amount: float = 0.0, hours_left: float = np.nan, cash: float = np.nan) -> None:
+        self._events[self._written % self.capacity] = (run, day, kind, slot, count, amount, hours_left, cash)
+        self._written += 1
+
+    def record(self, run: int, state: kernel.KernelState, days: int, params: np.ndarray, assets: np.ndarray):
+        """Step ``state`` through ``days`` days, emitting events; returns ``(out, earning)`` like ``KernelState.run``."""
+
+        out = np.zeros((days, len(kernel.OUTPUT_COLUMNS)))
+        earning = np.zeros((days, len(assets)), dtype=np.bool_)
+        values, fixed = assets.tolist(), params.tolist()
+        for day in range(days):
+            started, active, progress = state.started.tolist(), state.active.tolist(), state.progress.tolist()
+            out[day] = state.step(params, assets)
+            earning[day] = state.earning
+            self._explain_day(run, day + 1, fixed, values, started, active, progress, state, out[day])
+        return out, earning
+
+    def _explain_day(self, run, day, params, assets, started, active, progress, state, out) -> None:
+        # Replays the kernel's hour bookkeeping in the same order so ``hours_left`` matches what it saw.
+        cash = out[0]
+        for slot, asset in enumerate(assets):
+            if state.started[slot] and not started[slot]:
+                self.emit(run, day, PURCHASED, slot, amount=asset[kernel.SETUP_COST], cash=cash)
+                cash -= asset[kernel.SETUP_COST]
+                progress[slot] = 0
+                if asset[kernel.SETUP_DAYS] == 0:
+                    active[slot] = True
+                    self.emit(run, day, ACTIVATED, slot)
+
+        hours_left = params[kernel.DAY_HOURS]
+        for slot, asset in enumerate(assets):
+            if not state.started[slot] or active[slot]:
+                continue
+            required = asset[kernel.SETUP_HOURS]
+            if state.progress[slot] > progress[slot]:
+                self.emit(run, day, SETUP_WORKED, slot, count=int(state.progress[slot]), amount=required,
+                          hours_left=hours_left)
+                hours_left -= required
+            elif asset[kernel.SETUP_DAYS] and required:
+                self.emit(run, day, SETUP_STALLED, slot, count=int(state.progress[slot]), amount=required,
+                          hours_left=hours_left)
+            if state.active[slot]:
+                self.emit(run, day, ACTIVATED, slot)
+
+        for slot, asset in enumerate(assets):
+            if not state.active[slot]:
+                continue
+            maintenance_hours = asset[kernel.MAINTENANCE_HOURS]
+            if state.earning[slot]:
+                self.emit(run, day, MAINTAINED, slot, amount=maintenance_hours, hours_left=hours_left)
+                if maintenance_hours > 0:
+                    hours_left -= maintenance_hours
+            else:
+                self.emit(run, day, MAINTENANCE_SKIPPED, slot, amount=maintenance_hours, hours_left=hours_left)
+
+        for kind, hours_column, runs_column, hours_field in _HUSTLE_COLUMNS:
+            runs = int(out[runs_column])
+            self.emit(run, day, kind, count=runs, amount=out[hours_column], hours_left=hours_left)
+            for _ in range(runs):
+                hours_left -= params[hours_field]
+        self.emit(run, day, IDLE, amount=hours_left, hours_left=hours_left)
+
+    def events(self) -> np.ndarray:
+        """The retained events, oldest first."""
+
+        if self._written <= self.capacity:
+            return self._events[:self._written].copy()
+        start = self._written % self.capacity
+        return np.concatenate([self._events[start:], self._events[:start]])
+
+    def frame(self) -> pd.DataFrame:
+        events = self.events()
+        runs = [self.runs[run] for run in events['run'].tolist()]
+        return pd.DataFrame(
+            {
+                'run': events['run'],
+                'index': [run['index'] for run in runs],
+                'day': events['day'],
+                'event': np.array(EVENT_NAMES, dtype=object)[events['kind']],
+                'asset': [run['assets'][slot] if slot >= 0 else '' for run, slot in zip(runs, events['slot'].tolist())],
+                'count': events['count'],
+                'amount': events['amount'],
+                'hours_left': events['hours_left'],
+                'cash': events['cash'],
+            }
+        )
+
+    def write_jsonl(self, path: Path) -> int:
+        """Write one JSON object per retained event (empty fields omitted); returns the event count."""
+
+        frame = self.frame()
+        tmp_path = Path(f'{path}.tmp')
+        with tmp_path.open('w') as handle:
+            for row in frame.to_dict('records'):
+                handle.write(json.dumps({key: value for key, value in row.items() if value == value and value != ''}) + '\n')
+        tmp_path.replace(path)
+        return len(frame)
+
+
+def trace_scenarios(
+    data: Dict,
+    configs: Sequence,
+    trace: DecisionTrace,
+    days: int = 30,
+    assistants=0,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+) -> List[int]:
+    """Replay the scenarios ``trace`` samples from a batch or sweep; returns their indices.
+
+    ``run_simulation`` matches ``run_simulation_batch`` exactly, so these
+    traces explain the batch's own rows. Only sampled scenarios are simulated.
+    """
+
+    from scripts.economy_simulations import run_simulation
+
+    counts = np.broadcast_to(np.asarray(assistants, dtype=np.int64), (len(configs),))
+    traced = []
+    for index, config in enumerate(configs):
+        if index % trace.every:
+            continue
+        before = len(trace.runs)
+        run_simulation(
+            data,
+            days=days,
+            assistants=int(counts[index]),
+            config=config,
+            asset_ids=asset_ids,
+            upgrade_ids=upgrade_ids,
+            trace=trace,
+            trace_index=index,
+        )
+        if len(trace.runs) > before:
+            traced.append(index)
+    return traced
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from scripts.economy_simulations import SimulationConfig, load_data, run_simulation
+
+    parser = argparse.ArgumentParser(description='Trace the decisions behind one simulation run.')
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--assistants', type=int, default=0)
+    parser.add_argument('--asset', action='append', default=None, help='Asset ids to build, in order (repeatable).')
+    parser.add_argument('--upgrade', action='append', default=None, help='Upgrade ids owned (repeatable).')
+    parser.add_argument('--output', type=Path, default=None, help='Write the events as JSONL instead of printing them.')
+    parser.add_argument('--skip-routine', action='store_true',
+                        help='Hide maintained/freelance/survey/idle events when printing.')
+    args = parser.parse_args(argv)
+
+    trace = DecisionTrace()
+    run_simulation(
+        load_data(),
+        days=args.days,
+        assistants=args.assistants,
+        config=SimulationConfig(),
+        asset_ids=args.asset,
+        upgrade_ids=args.upgrade,
+        trace=trace,
+    )
+    if args.output is not None:
+        print(f'Wrote {trace.write_jsonl(args.output)} events to {args.output}')
+        return
+    frame = trace.frame()
+    if args.skip_routine:
+        frame = frame[~frame['event'].isin(['maintained', 'freelance', 'survey', 'idle'])]
+    print(frame.drop(columns=['run', 'index']).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+"""Local SQLite warehouse for simulation results.
+
+Every recorded scenario becomes one ``runs`` row: dataset hash, horizon,
+assistant count, the asset and upgrade selection, every numeric
+``SimulationConfig`` field, and the summary metrics. Per-day series are
+optional and go to ``daily``. Inserts are batched with ``executemany`` inside a
+single transaction. Lookups such as "best final cash with at most one assistant
+and blog+vlog" hit the ``run_assets`` and column indexes instead of
+re-simulating. Keeping the dataset hash on every row means the same scenario
+can be compared across dataset revisions.
+"""
+
+import argparse
+import dataclasses
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from scripts.economy_batch import DAY_COLUMNS, BatchResult, fit_exponential_batch, run_simulation_batch
+from scripts.economy_simulations import SimulationConfig, dataset_hash, load_data
+
+DB_PATH = Path(__file__).resolve().parents[1] / '.cache' / 'economy_results.sqlite'
+INSERT_BATCH = 5000
+
+_DEFAULTS = SimulationConfig()
+CONFIG_COLUMNS = tuple(
+    item.name for item in dataclasses.fields(SimulationConfig) if isinstance(getattr(_DEFAULTS, item.name), (int, float))
+)
+METRIC_COLUMNS = ('final_cash', 'growth_rate', 'activation_day', 'total_hours', 'assistant_wages')
+HOUR_COLUMNS = ('hours_freelance', 'hours_survey', 'hours_asset_setup', 'hours_asset_maintenance')
+RUN_COLUMNS = ('dataset_hash', 'days', 'assistants', 'assets', 'upgrades', 'recorded_at') + CONFIG_COLUMNS + METRIC_COLUMNS
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    dataset_hash TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    assistants INTEGER NOT NULL,
+    assets TEXT NOT NULL,
+    upgrades TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    {', '.join(f'{name} REAL' for name in CONFIG_COLUMNS + METRIC_COLUMNS)}
+);
+CREATE TABLE IF NOT EXISTS run_assets (
+    asset_id TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    PRIMARY KEY (asset_id, run_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    day INTEGER NOT NULL,
+    {', '.join(f'{name} REAL' for name in DAY_COLUMNS)},
+    PRIMARY KEY (run_id, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_scope ON runs (dataset_hash, days, assistants, final_cash);
+CREATE INDEX IF NOT EXISTS runs_selection ON runs (assets, upgrades, days);
+{''.join(f'CREATE INDEX IF NOT EXISTS runs_{name} ON runs ({name});' + chr(10) for name in CONFIG_COLUMNS)}
+"""
+
+
+def _selection_key(ids: Iterable[str]) -> str:
+    return ','.join(sorted(ids))
+
+
+def _chunks(rows: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class ResultsWarehouse:
+    """Thin wrapper around the SQLite file; use as a context manager or call ``close``."""
+
+    def __init__(self, path: Path = DB_PATH, check_same_thread: bool = True):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; record_batch opens its own BEGIN IMMEDIATE.
+        self.connection = sqlite3.connect(
+            self.path, timeout=60.0, isolation_level=None, check_same_thread=check_same_thread
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('PRAGMA foreign_keys=ON')
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> 'ResultsWarehouse':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def record_batch(
+        self,
+        result: BatchResult,
+        configs: Sequence[SimulationConfig],
+        data_hash: str,
+        upgrade_ids: Optional[Sequence[str]] = None,
+        daily: bool = False,
+        batch_size: int = INSERT_BATCH,
+    ) -> List[int]:
+        """Insert one row per scenario of ``result``; returns the new run ids in order.
+
+        ``upgrade_ids`` must match what was passed to ``run_simulation_batch``
+        (``None`` means each config's own ``upgrade_ids``).
+        """
+
+        recorded_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        hours = sum(result.columns[name] for name in HOUR_COLUMNS).sum(axis=1)
+        metrics = np.column_stack(
+            [
+                result.final_cash,
+                fit_exponential_batch(result.cash_end).slope,
+                result.activation_day,
+                hours,
+                result.columns['assistant_wages'].sum(axis=1),
+            ]
+        )
+        config_values = np.array([[getattr(config, name) for name in CONFIG_COLUMNS] for config in configs], dtype=float)
+        rows = []
+        for index, config in enumerate(configs):
+            upgrades = upgrade_ids if upgrade_ids is not None else config.upgrade_ids
+            rows.append(
+                (
+                    data_hash,
+                    result.days,
+                    int(result.plan.assistants[index]),
+                    _selection_key(result.plan.asset_ids[index]),
+                    _selection_key(upgrades),
+                    recorded_at,
+                    *config_values[index].tolist(),
+                    *[None if np.isnan(value) else value for value in metrics[index].tolist()],
+                )
+            )
+
+        placeholders = ', '.join('?' for _ in range(len(RUN_COLUMNS)))
+        insert_run = f"INSERT INTO runs ({', '.join(RUN_COLUMNS)}) VALUES ({placeholders})"
+        # The write lock is taken before reading MAX(id), so no other writer can
+        # interleave: the rows SQLite numbers above it are exactly ours, in order.
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            previous = self.connection.execute('SELECT COALESCE(MAX(id), 0) FROM runs').fetchone()[0]
+            for chunk in _chunks(rows, batch_size):
+                self.connection.executemany(insert_run, chunk)
+            ids = [row[0] for row in self.connection.execute('SELECT id FROM runs WHERE id > ? ORDER BY id', (previous,))]
+            asset_rows = [
+                (asset_id, run_id) for index, run_id in enumerate(ids) for asset_id in result.plan.asset_ids[index]
+            ]
+            for chunk in _chunks(asset_rows, batch_size):
+                self.connection.executemany('INSERT OR IGNORE INTO run_assets (asset_id, run_id) VALUES (?, ?)', chunk)
+            if daily:
+                self._insert_daily(ids, result, batch_size)
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+        return ids
+
+    def _insert_daily(self, ids: Sequence[int], result: BatchResult, batch_size: int) -> None:
+        day_numbers = np.arange(1, result.days + 1, dtype=float)
+        stacked = np.stack([result.columns[name].astype(float) for name in DAY_COLUMNS], axis=2)
+        insert = f"INSERT INTO daily (run_id, day, {', '.join(DAY_COLUMNS)}) VALUES ({', '.join('?' for _ in range(len(DAY_COLUMNS) + 2))})"
+        rows_per_chunk = max(1, batch_size // max(result.days, 1))
+        for start in range(0, len(ids), rows_per_chunk):
+            block = stacked[start:start + rows_per_chunk]
+            run_ids = np.repeat(np.asarray(ids[start:start + rows_per_chunk], dtype=float), result.days)
+            table = np.column_stack([run_ids, np.tile(day_numbers, len(block)), block.reshape(-1, len(DAY_COLUMNS))])
+            self.connection.executemany(
+                insert,
+                [(int(row[0]), int(row[1]), *row[2:]) for row in table.tolist()],
+            )
+
+    def query(
+        self,
+        data_hash: Optional[str] = None,
+        days: Optional[int] = None,
+        max_assistants: Optional[int] = None,
+        assets: Optional[Sequence[str]] = None,
+        exact_assets: bool = False,
+        upgrades: Optional[Sequence[str]] = None,
+        order_by: str = 'final_cash',
+        descending: bool = True,
+        limit: Optional[int] = 20,
+    ) -> pd.DataFrame:
+        """Recorded runs matching the filters, best first.
+
+        ``assets`` keeps runs that include every listed asset, or exactly those
+        assets with ``exact_assets=True``. ``upgrades`` always matches exactly.
+        """
+
+        if order_by not in RUN_COLUMNS + ('id',):
+            raise ValueError(f'Cannot order by {order_by!r}')
+        clauses: List[str] = []
+        params: List = []
+        if data_hash is not None:
+            clauses.append('dataset_hash = ?')
+            params.append(data_hash)
+        if days is not None:
+            clauses.append('days = ?')
+            params.append(days)
+        if max_assistants is not None:
+            clauses.append('assistants <= ?')
+            params.append(max_assistants)
+        if assets:
+            if exact_assets:
+                clauses.append('assets = ?')
+                params.append(_selection_key(assets))
+            else:
+                wanted = sorted(set(assets))
+                clauses.append(
+                    f"id IN (SELECT run_id FROM run_assets WHERE asset_id IN ({', '.join('?' for _ in wanted)}) "
+                    'GROUP BY run_id HAVING COUNT(*) = ?)'
+                )
+                params.extend(wanted)
+                params.append(len(wanted))
+        if upgrades is not None:
+            clauses.append('upgrades = ?')
+            params.append(_selection_key(upgrades))
+
+        sql = 'SELECT * FROM runs'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def daily(self, run_id: int) -> pd.DataFrame:
+        return pd.read_sql_query('SELECT * FROM daily WHERE run_id = ? ORDER BY day', self.connection, params=(run_id,))
+
+    def history(self, assets: Sequence[str], upgrades: Sequence[str] = (), days: Optional[int] = None) -> pd.DataFrame:
+        """Best and mean final cash for one selection per dataset revision, oldest first."""
+
+        params: List = [_selection_key(assets), _selection_key(upgrades)]
+        sql = (
+            'SELECT dataset_hash, days, COUNT(*) AS runs, MAX(final_cash) AS best_final_cash, '
+            'AVG(final_cash) AS mean_final_cash, MIN(recorded_at) AS first_recorded '
+            'FROM runs WHERE assets = ? AND upgrades = ?'
+        )
+        if days is not None:
+            sql += ' AND days = ?'
+            params.append(days)
+        sql += ' GROUP BY dataset_hash, days ORDER BY first_recorded'
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+
+def record_runs(
+    data: Dict,
+    configs: Sequence[SimulationConfig],
+    days: int = 30,
+    assistants=0,
+    asset_ids: Optional[Sequence[str]] = None,
+    upgrade_ids: Optional[Sequence[str]] = None,
+    daily: bool = False,
+    path: Path = DB_PATH,
+) -> List[int]:
+    """Simulate ``configs`` in one batch and record every scenario."""
+
+    result = run_simulation_batch(
+        data,
+        configs,
+        days=days,
+        assistants=assistants,
+        asset_ids=asset_ids,
+        upgrade_ids=upgrade_ids,
+    )
+    with ResultsWarehouse(path) as warehouse:
+        return warehouse.record_batch(result, configs, dataset_hash(data), upgrade_ids=upgrade_ids, daily=daily)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Record simulation sweeps into, or query, the SQLite results warehouse.')
+    parser.add_argument('--db', type=Path, default=DB_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help='Sample random configs, simulate them, and store the results.')
+    record.add_argument('--samples', type=int, default=1000)
+    record.add_argument('--days', type=int, default=30)
+    record.add_argument('--seed', type=int, default=0)
+    record.add_argument('--asset', action='append', dest='assets', default=None)
+    record.add_argument('--upgrade', action='append', dest='upgrades', default=None)
+    record.add_argument('--daily', action='store_true', help='Also store every per-day series.')
+
+    query = commands.add_parser('query', help='Print the best recorded runs for a filter.')
+    query.add_argument('--days', type=int, default=None)
+    query.add_argument('--max-assistants', type=int, default=None)
+    query.add_argument('--asset', action='append', dest='assets', default=None)
+    query.add_argument('--exact', action='store_true', help='Match the asset selection exactly.')
+    query.add_argument('--all-revisions', action='store_true', help='Include runs recorded against older datasets.')
+    query.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    data = load_data()
+    if args.command == 'record':
+        from scripts.economy_sensitivity import DEFAULT_BOUNDS
+        from scripts.economy_sweep import sample_configs
+
+        bounds = {name: value for name, value in DEFAULT_BOUNDS.items() if name != 'assistants'}
+        configs, _, assistants = sample_configs(bounds, args.samples, seed=args.seed)
+        ids = record_runs(
+            data,
+            configs,
+            days=args.days,
+            assistants=assistants,
+            asset_ids=args.assets,
+            upgrade_ids=args.upgrades,
+            daily=args.daily,
+            path=args.db,
+        )
+        print(f'Recorded {len(ids)} runs in {args.db}')
+        return
+
+    with ResultsWarehouse(args.db) as warehouse:
+        best = warehouse.query(
+            data_hash=None if args.all_revisions else dataset_hash(data),
+            days=args.days,
+            max_assistants=args.max_assistants,
+            assets=args.assets,
+            exact_assets=args.exact,
+            limit=args.limit,
+        )
+    print(best.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import dataclasses
 import io
-import json
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, Tuple
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -20,16 +23,45 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from scripts import economy_simulations as sim
+from scripts.economy_dataset import load_dataset
+from scripts.economy_pareto import pareto_mask, sample_sweep
+from scripts.economy_sensitivity import AdaptiveCurve, adaptive_curve
 from scripts.economy_simulations import SimulationConfig, compute_education_roi, summarize_asset_plan
+from scripts.economy_surrogate import Surrogate, load_or_build_surrogate, surrogate_key
+from scripts.economy_warehouse import DB_PATH, ResultsWarehouse, record_runs
 DATA_PATH = ROOT / "docs" / "normalized_economy.json"
 OUTPUT_DIR = ROOT / "docs" / "archive" / "economy_sim_report_assets"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+SURROGATE_JOB_LIMIT = 8
+PREFETCH_CACHE_SIZE = 64
+PREFETCH_WORKERS = 2
+SENSITIVITY_CACHE_SIZE = 16
+SENSITIVITY_POLL_SECONDS = 0.5
+
+# (min, max, step) for every sidebar slider that feeds the simulation.
+SLIDER_SPECS: Dict[str, Tuple[float, float, float]] = {
+    "days": (10, 120, 5),
+    "assistants": (0, 4, 1),
+    "starting_cash": (0, 250, 5),
+    "base_day_hours": (8, 20, 1),
+    "assistant_hire_cost": (0, 400, 10),
+    "assistant_hourly_rate": (0, 25, 1),
+    "assistant_hours_per_day": (0, 8, 1),
+    "blog_income_multiplier": (0.25, 3.0, 0.05),
+    "blog_setup_cost_multiplier": (0.25, 3.0, 0.05),
+    "blog_maintenance_cost_multiplier": (0.25, 3.0, 0.05),
+    "freelance_income_multiplier": (0.25, 3.0, 0.05),
+    "survey_income_multiplier": (0.25, 3.0, 0.05),
+}
+
+
+# ``st.fragment`` graduated from ``st.experimental_fragment`` after the pinned 1.34 release.
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
 
 
 @st.cache_data(show_spinner=False)
 def load_data() -> Dict:
-    with DATA_PATH.open() as handle:
-        return json.load(handle)
+    return load_dataset(DATA_PATH).raw
 
 
 def build_config(base: SimulationConfig | None = None, **changes) -> SimulationConfig:
@@ -38,6 +70,128 @@ def build_config(base: SimulationConfig | None = None, **changes) -> SimulationC
     return SimulationConfig(**values)
 
 
+def input_slider(name: str, label: str, value: float) -> float:
+    low, high, step = SLIDER_SPECS[name]
+    chosen = st.slider(label, min_value=low, max_value=high, value=value, step=step)
+    # Float sliders can drift by an ulp; rounding keeps prefetch keys stable.
+    return round(chosen, 6) if isinstance(chosen, float) else chosen
+
+
+SimulationRequest = Tuple[int, int, SimulationConfig]
+
+
+def simulation_key(days: int, assistants: int, config: SimulationConfig) -> Hashable:
+    return days, assistants, dataclasses.astuple(config)
+
+
+class SimulationPrefetcher:
+    """Bounded LRU of simulation results plus a pool that fills it speculatively.
+
+    Every ``prefetch`` call starts a new generation: queued jobs from the previous
+    one are cancelled and any that are already running discard their results.
+    """
+
+    def __init__(self, max_entries: int = PREFETCH_CACHE_SIZE, workers: int = PREFETCH_WORKERS) -> None:
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._cache: OrderedDict[Hashable, Tuple[pd.DataFrame, sim.SimulationMetrics]] = OrderedDict()
+        self._pending: List[Future] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[pd.DataFrame, sim.SimulationMetrics] | None:
+        with self._lock:
+            if key not in self._cache:
+                return None
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+    def put(
+        self, key: Hashable, result: Tuple[pd.DataFrame, sim.SimulationMetrics], generation: int | None = None
+    ) -> None:
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._generation += 1
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.cancel()
+
+    def prefetch(self, data: Dict, requests: Iterable[SimulationRequest]) -> None:
+        self.cancel()
+        with self._lock:
+            generation = self._generation
+            missing = [r for r in requests if simulation_key(*r) not in self._cache]
+            self._pending = [self._executor.submit(self._run, generation, data, *r) for r in missing]
+
+    def _run(self, generation: int, data: Dict, days: int, assistants: int, config: SimulationConfig) -> None:
+        if generation != self._generation:
+            return
+        result = run_workbench_simulation(data, days, assistants, config)
+        self.put(simulation_key(days, assistants, config), result, generation)
+
+
+@st.cache_resource
+def simulation_prefetcher() -> SimulationPrefetcher:
+    return SimulationPrefetcher()
+
+
+def run_workbench_simulation(
+    data: Dict, days: int, assistants: int, config: SimulationConfig
+) -> Tuple[pd.DataFrame, sim.SimulationMetrics]:
+    return sim.run_simulation(
+        data,
+        days=days,
+        assistants=assistants,
+        config=config,
+        asset_ids=list(config.asset_ids),
+        upgrade_ids=list(config.upgrade_ids),
+    )
+
+
+def slider_values(days: int, assistants: int, config: SimulationConfig) -> Dict[str, float]:
+    values = {"days": days, "assistants": assistants}
+    values.update({name: getattr(config, name) for name in SLIDER_SPECS if name not in values})
+    return values
+
+
+def last_moved_slider(inputs: Dict[str, float]) -> str | None:
+    """Remember which slider changed between reruns so prefetch can follow it."""
+    previous = st.session_state.get("previous_inputs")
+    if previous is not None:
+        moved = [name for name, value in inputs.items() if previous.get(name) != value]
+        if moved:
+            st.session_state["last_moved_slider"] = moved[0]
+    st.session_state["previous_inputs"] = dict(inputs)
+    return st.session_state.get("last_moved_slider")
+
+
+def neighbor_requests(days: int, assistants: int, config: SimulationConfig, slider: str | None) -> List[SimulationRequest]:
+    """The ±1-step settings of ``slider`` around the current inputs."""
+    if slider not in SLIDER_SPECS:
+        return []
+    low, high, step = SLIDER_SPECS[slider]
+    current = slider_values(days, assistants, config)[slider]
+    requests = []
+    for value in (round(current - step, 6), round(current + step, 6)):
+        if not low <= value <= high:
+            continue
+        if slider == "days":
+            requests.append((value, assistants, config))
+        elif slider == "assistants":
+            requests.append((days, value, config))
+        else:
+            requests.append((days, assistants, build_config(config, **{slider: value})))
+    return requests
+
+
 def relevant_upgrades(data: Dict) -> list[str]:
     upgrades = data.get("upgrades", {})
     if not upgrades:
@@ -51,9 +205,128 @@ def relevant_upgrades(data: Dict) -> list[str]:
     return sorted(impactful_sources, key=lambda key: upgrades[key]["name"])
 
 
-def render_cashflow_plot(df: pd.DataFrame, title: str) -> Tuple[plt.Figure, io.BytesIO]:
+@st.cache_resource
+def results_warehouse() -> Tuple[ResultsWarehouse, threading.Lock]:
+    """One connection shared by every session; the lock serialises queries across script threads."""
+    return ResultsWarehouse(check_same_thread=False), threading.Lock()
+
+
+@st.cache_resource
+def surrogate_builder() -> Tuple[ThreadPoolExecutor, Dict[str, Future]]:
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="surrogate"), {}
+
+
+def request_surrogate(
+    data: Dict, days: int, assistants: int, asset_ids: Sequence[str], upgrade_ids: Sequence[str]
+) -> Surrogate | None:
+    """Return the surrogate for this selection, queueing a background build the first time it is asked for."""
+    executor, jobs = surrogate_builder()
+    key = surrogate_key(data, days, assistants, asset_ids, upgrade_ids)
+    job = jobs.get(key)
+    if job is None:
+        for stale in [k for k, j in jobs.items() if j.done()][: max(0, len(jobs) - SURROGATE_JOB_LIMIT + 1)]:
+            jobs.pop(stale)
+        jobs[key] = executor.submit(
+            load_or_build_surrogate, data, days, assistants, list(asset_ids), list(upgrade_ids)
+        )
+        return None
+    if not job.done():
+        return None
+    if job.exception() is not None:
+        jobs.pop(key)
+        return None
+    return job.result()
+
+
+ProgressCallback = Callable[[np.ndarray, np.ndarray], None]
+
+
+class ScanCancelled(Exception):
+    """Raised from a progress report once newer inputs have superseded the scan."""
+
+
+@dataclasses.dataclass
+class SensitivityProgress:
+    x: np.ndarray
+    y: np.ndarray
+    breakpoints: pd.DataFrame
+    planned: int
+    done: bool = False
+    error: BaseException | None = None
+
+
+class SensitivityScanner:
+    """Runs one sensitivity scan at a time in the background and keeps finished curves.
+
+    ``request`` returns whatever points the scan has produced so far. Asking for
+    a different scan supersedes the running one, which stops at its next
+    progress report; finished curves are served from a small LRU.
+    """
+
+    def __init__(self, max_entries: int = SENSITIVITY_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sensitivity")
+        self._finished: OrderedDict[Hashable, SensitivityProgress] = OrderedDict()
+        self._key: Hashable | None = None
+        self._future: Future | None = None
+        self._progress: SensitivityProgress | None = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def request(
+        self, key: Hashable, job: Callable[[ProgressCallback], SensitivityProgress], planned: int
+    ) -> SensitivityProgress:
+        with self._lock:
+            if key in self._finished:
+                self._finished.move_to_end(key)
+                return self._finished[key]
+            if key != self._key:
+                self._generation += 1
+                if self._future is not None:
+                    self._future.cancel()
+                self._key = key
+                self._progress = SensitivityProgress(np.array([]), np.array([]), pd.DataFrame(), planned)
+                self._future = self._executor.submit(self._run, self._generation, key, job)
+            return self._progress
+
+    def _run(self, generation: int, key: Hashable, job: Callable[[ProgressCallback], SensitivityProgress]) -> None:
+        def report(x: np.ndarray, y: np.ndarray) -> None:
+            with self._lock:
+                if generation != self._generation:
+                    raise ScanCancelled
+                self._progress = dataclasses.replace(self._progress, x=x, y=y)
+
+        try:
+            result = job(report)
+        except ScanCancelled:
+            return
+        except Exception as error:  # surfaced in the panel instead of dying in the worker thread
+            with self._lock:
+                if generation == self._generation:
+                    self._progress = dataclasses.replace(self._progress, done=True, error=error)
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._progress = result
+            self._finished[key] = result
+            while len(self._finished) > self.max_entries:
+                self._finished.popitem(last=False)
+
+
+@st.cache_resource
+def sensitivity_scanner() -> SensitivityScanner:
+    return SensitivityScanner()
+
+
+def render_cashflow_plot(
+    df: pd.DataFrame, title: str, band: Iterable[float] | None = None
+) -> Tuple[plt.Figure, io.BytesIO]:
     fig, ax = plt.subplots(figsize=(8, 4.5))
     ax.plot(df["day"], df["cash_end"], marker="o", color="#6b5dd3")
+    if band is not None:
+        band = np.asarray(band)
+        ax.fill_between(df["day"], df["cash_end"] - band, df["cash_end"] + band, color="#6b5dd3", alpha=0.15)
     ax.set_title(title)
     ax.set_xlabel("Day")
     ax.set_ylabel("Ending Cash ($)")
@@ -79,9 +352,13 @@ def render_roi_plot(df: pd.DataFrame) -> Tuple[plt.Figure, io.BytesIO]:
     return fig, buffer
 
 
-def render_sensitivity_plot(x: Iterable[float], y: Iterable[float], label: str) -> Tuple[plt.Figure, io.BytesIO]:
+def render_sensitivity_plot(
+    x: Iterable[float], y: Iterable[float], label: str, breakpoints: Iterable[float] = ()
+) -> Tuple[plt.Figure, io.BytesIO]:
     fig, ax = plt.subplots(figsize=(8, 4.5))
     ax.plot(x, y, marker="o", color="#ff8a65")
+    for location in breakpoints:
+        ax.axvline(location, color="#6b5dd3", alpha=0.35, linestyle="--", linewidth=1)
     ax.set_title(f"Sensitivity – {label}")
     ax.set_xlabel(label)
     ax.set_ylabel("Final Day Cash ($)")
@@ -93,6 +370,27 @@ def render_sensitivity_plot(x: Iterable[float], y: Iterable[float], label: str)
     return fig, buffer
 
 
+def render_frontier_plot(
+    sweep: pd.DataFrame, frontier: pd.Series, current: Tuple[float, float] | None = None
+) -> Tuple[plt.Figure, io.BytesIO]:
+    fig, ax = plt.subplots(figsize=(8, 4.5))
+    ax.scatter(sweep["total_hours"], sweep["final_cash"], s=6, color="#b0b0b0", alpha=0.4, label="Sampled configs")
+    front = sweep[frontier].sort_values("total_hours")
+    ax.scatter(front["total_hours"], front["final_cash"], s=18, color="#6b5dd3", label="Pareto frontier")
+    if current is not None:
+        ax.scatter([current[0]], [current[1]], s=80, marker="*", color="#ff8a65", label="Current inputs")
+    ax.set_title("Final Cash vs Hours Worked")
+    ax.set_xlabel("Total Hours Worked")
+    ax.set_ylabel("Final Day Cash ($)")
+    ax.grid(alpha=0.25)
+    ax.legend(loc="lower right")
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=150)
+    buffer.seek(0)
+    return fig, buffer
+
+
 def save_snapshot(name: str, buffers: Dict[str, io.BytesIO]) -> None:
     timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
     for label, buffer in buffers.items():
@@ -101,6 +399,21 @@ def save_snapshot(name: str, buffers: Dict[str, io.BytesIO]) -> None:
             handle.write(buffer.getvalue())
 
 
+def coarse_to_fine(count: int) -> List[int]:
+    """Indices ``0..count-1`` ordered so every prefix is spread across the whole range."""
+    if count <= 2:
+        return list(range(count))
+    order = [0, count - 1]
+    intervals = [(0, count - 1)]
+    while intervals:
+        low, high = intervals.pop(0)
+        middle = (low + high) // 2
+        if low < middle < high:
+            order.append(middle)
+            intervals.extend([(low, middle), (middle, high)])
+    return order
+
+
 def compute_sensitivity(
     data: Dict,
     base_config: SimulationConfig,
@@ -110,10 +423,14 @@ def compute_sensitivity(
     assistants: int,
     asset_ids: Iterable[str],
     upgrade_ids: Iterable[str],
+    on_progress: ProgressCallback | None = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
-    outcomes = []
-    for value in values:
-        config = build_config(base_config, **{param: value})
+    """Final cash at each of ``values``, reporting the points finished so far after every run."""
+    values = np.asarray(list(values), dtype=float)
+    outcomes = np.zeros(len(values))
+    finished = np.zeros(len(values), dtype=bool)
+    for index in coarse_to_fine(len(values)):
+        config = build_config(base_config, **{param: float(values[index])})
         df, _ = sim.run_simulation(
             data,
             days=days,
@@ -122,8 +439,129 @@ def compute_sensitivity(
             asset_ids=list(asset_ids),
             upgrade_ids=list(upgrade_ids),
         )
-        outcomes.append(df["cash_end"].iloc[-1])
-    return np.array(list(values)), np.array(outcomes)
+        outcomes[index] = df["cash_end"].iloc[-1]
+        finished[index] = True
+        if on_progress is not None:
+            on_progress(values[finished], outcomes[finished])
+    return values, outcomes
+
+
+def compute_adaptive_sensitivity(
+    data: Dict,
+    base_config: SimulationConfig,
+    param: str,
+    lower: float,
+    upper: float,
+    budget: int,
+    days: int,
+    assistants: int,
+    asset_ids: Iterable[str],
+    upgrade_ids: Iterable[str],
+    on_progress: ProgressCallback | None = None,
+) -> AdaptiveCurve:
+    return adaptive_curve(
+        data,
+        param,
+        lower,
+        upper,
+        budget=budget,
+        base_config=base_config,
+        days=days,
+        assistants=assistants,
+        asset_ids=list(asset_ids),
+        upgrade_ids=list(upgrade_ids),
+        on_round=on_progress,
+    )
+
+
+def request_sensitivity(
+    data: Dict,
+    config: SimulationConfig,
+    param: str,
+    sampling: str,
+    lower: float,
+    upper: float,
+    runs: int,
+    days: int,
+    assistants: int,
+) -> SensitivityProgress:
+    """Start (or look up) the scan for these inputs without waiting for it."""
+    key = (sampling, param, lower, upper, runs, days, assistants, dataclasses.astuple(config))
+    scope = (days, assistants, config.asset_ids, config.upgrade_ids)
+
+    def job(report: ProgressCallback) -> SensitivityProgress:
+        if sampling == "Uniform":
+            values = np.linspace(lower, upper, runs)
+            x, y = compute_sensitivity(data, config, param, values, *scope, on_progress=report)
+            return SensitivityProgress(x, y, pd.DataFrame(), runs, done=True)
+        curve = compute_adaptive_sensitivity(data, config, param, lower, upper, runs, *scope, on_progress=report)
+        return SensitivityProgress(curve.x, curve.y, curve.breakpoints, runs, done=True)
+
+    return sensitivity_scanner().request(key, job, runs)
+
+
+def show_sensitivity(progress: SensitivityProgress, label: str, sampling: str) -> io.BytesIO:
+    breakpoints = progress.breakpoints
+    fig, buffer = render_sensitivity_plot(
+        progress.x, progress.y, label, breakpoints["location"] if not breakpoints.empty else ()
+    )
+    st.pyplot(fig)
+    plt.close(fig)
+    if progress.error is not None:
+        st.error(f"Sensitivity scan failed: {progress.error}")
+    elif not progress.done:
+        st.caption(f"Scanning in the background… {len(progress.x)} of {progress.planned} simulations done.")
+    elif sampling == "Adaptive":
+        st.caption(f"{len(progress.x)} simulations • {len(breakpoints)} breakpoints where final cash jumps or bends.")
+        if not breakpoints.empty:
+            st.dataframe(breakpoints, use_container_width=True)
+    return buffer
+
+
+@fragment(run_every=SENSITIVITY_POLL_SECONDS)
+def stream_sensitivity(
+    data: Dict,
+    config: SimulationConfig,
+    param: str,
+    sampling: str,
+    lower: float,
+    upper: float,
+    runs: int,
+    days: int,
+    assistants: int,
+    label: str,
+) -> None:
+    """Redraw the running scan on a timer, then rerun the page once it settles."""
+    progress = request_sensitivity(data, config, param, sampling, lower, upper, runs, days, assistants)
+    if progress.done:
+        # A full rerun swaps this polling fragment for the static panel and refreshes the snapshot buffer.
+        st.rerun()
+    show_sensitivity(progress, label, sampling)
+
+
+@st.cache_data(show_spinner="Sampling configs for the frontier…", max_entries=8)
+def compute_frontier(
+    _data: Dict,
+    data_digest: str,
+    samples: int,
+    days: int,
+    config: SimulationConfig,
+    asset_ids: Iterable[str],
+    upgrade_ids: Iterable[str],
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """Sample the slider ranges and flag the Pareto frontier; cached per inputs (``data_digest`` stands in for ``_data``)."""
+    bounds = {name: SLIDER_SPECS[name][:2] for name in SLIDER_SPECS if name not in ("days", "assistants")}
+    sweep = sample_sweep(
+        _data,
+        bounds,
+        samples,
+        base_config=config,
+        days=days,
+        max_assistants=int(SLIDER_SPECS["assistants"][1]),
+        asset_ids=list(asset_ids),
+        upgrade_ids=list(upgrade_ids),
+    )
+    return sweep, pd.Series(pareto_mask(sweep), index=sweep.index)
 
 
 def main() -> None:
@@ -137,13 +575,13 @@ def main() -> None:
 
     with st.sidebar:
         st.header("Simulation Inputs")
-        days = st.slider("Days", min_value=10, max_value=120, value=30, step=5)
-        assistants = st.slider("Assistants", min_value=0, max_value=4, value=0, step=1)
-        starting_cash = st.slider("Starting Cash", min_value=0, max_value=250, value=sim.STARTING_CASH, step=5)
-        base_hours = st.slider("Base Day Hours", min_value=8, max_value=20, value=sim.BASE_DAY_HOURS, step=1)
-        assistant_hire_cost = st.slider("Assistant Hire Cost", min_value=0, max_value=400, value=sim.ASSISTANT_HIRE_COST, step=10)
-        assistant_hourly_rate = st.slider("Assistant Hourly Rate", min_value=0, max_value=25, value=sim.ASSISTANT_HOURLY_RATE, step=1)
-        assistant_hours_per_day = st.slider("Assistant Hours/Day", min_value=0, max_value=8, value=sim.ASSISTANT_HOURS_PER_DAY, step=1)
+        days = input_slider("days", "Days", 30)
+        assistants = input_slider("assistants", "Assistants", 0)
+        starting_cash = input_slider("starting_cash", "Starting Cash", sim.STARTING_CASH)
+        base_hours = input_slider("base_day_hours", "Base Day Hours", sim.BASE_DAY_HOURS)
+        assistant_hire_cost = input_slider("assistant_hire_cost", "Assistant Hire Cost", sim.ASSISTANT_HIRE_COST)
+        assistant_hourly_rate = input_slider("assistant_hourly_rate", "Assistant Hourly Rate", sim.ASSISTANT_HOURLY_RATE)
+        assistant_hours_per_day = input_slider("assistant_hours_per_day", "Assistant Hours/Day", sim.ASSISTANT_HOURS_PER_DAY)
 
         st.header("Asset Mix")
         asset_catalog = data["assets"]
@@ -172,13 +610,21 @@ def main() -> None:
         st.caption("We follow your selection order when spending setup time, so front-load favorites!")
 
         st.header("Economy Multipliers")
-        blog_income_multiplier = st.slider("Blog Income Multiplier", min_value=0.25, max_value=3.0, value=1.0, step=0.05)
-        blog_setup_cost_multiplier = st.slider("Blog Setup Cost Multiplier", min_value=0.25, max_value=3.0, value=1.0, step=0.05)
-        blog_maintenance_cost_multiplier = st.slider(
-            "Blog Maintenance Cost Multiplier", min_value=0.25, max_value=3.0, value=1.0, step=0.05
+        blog_income_multiplier = input_slider("blog_income_multiplier", "Blog Income Multiplier", 1.0)
+        blog_setup_cost_multiplier = input_slider("blog_setup_cost_multiplier", "Blog Setup Cost Multiplier", 1.0)
+        blog_maintenance_cost_multiplier = input_slider(
+            "blog_maintenance_cost_multiplier", "Blog Maintenance Cost Multiplier", 1.0
+        )
+        freelance_income_multiplier = input_slider("freelance_income_multiplier", "Freelance Income Multiplier", 1.0)
+        survey_income_multiplier = input_slider("survey_income_multiplier", "Survey Sprint Income Multiplier", 1.0)
+
+        st.header("Preview")
+        use_surrogate = st.checkbox(
+            "Surrogate Preview",
+            value=False,
+            help="Answer from a precomputed interpolation grid first, then swap in the exact run. "
+            "The grid for each asset/upgrade/day/assistant combo builds once in the background and is cached in .cache/.",
         )
-        freelance_income_multiplier = st.slider("Freelance Income Multiplier", min_value=0.25, max_value=3.0, value=1.0, step=0.05)
-        survey_income_multiplier = st.slider("Survey Sprint Income Multiplier", min_value=0.25, max_value=3.0, value=1.0, step=0.05)
 
         st.header("Sensitivity Scan")
         param_choice = st.selectbox(
@@ -195,7 +641,25 @@ def main() -> None:
             }[key],
         )
         span = st.slider("Sensitivity Span", min_value=0.5, max_value=2.0, value=1.2, step=0.1)
-        samples = st.slider("Samples", min_value=3, max_value=15, value=7, step=2)
+        sampling = st.radio(
+            "Sampling",
+            options=["Uniform", "Adaptive"],
+            horizontal=True,
+            help="Adaptive sampling spends its run budget where final cash bends or jumps.",
+        )
+        if sampling == "Uniform":
+            samples = st.slider("Samples", min_value=3, max_value=99, value=7, step=2)
+        else:
+            run_budget = st.slider("Run Budget", min_value=10, max_value=200, value=40, step=5)
+
+        st.header("Trade-off Frontier")
+        show_frontier = st.checkbox(
+            "Compute Pareto Frontier",
+            value=False,
+            help="Sample configs across the slider ranges and keep the ones no other config beats on final cash, "
+            "hours worked, days to first asset, and assistant wages.",
+        )
+        frontier_samples = st.slider("Sampled Configs", min_value=500, max_value=20000, value=4000, step=500)
 
     config = SimulationConfig(
         starting_cash=starting_cash,
@@ -282,17 +746,41 @@ def main() -> None:
 
     st.markdown("---")
 
-    df, metrics = sim.run_simulation(
-        data,
-        days=days,
-        assistants=assistants,
-        config=config,
-        asset_ids=selected_assets,
-        upgrade_ids=selected_upgrades,
-    )
-    daily_fig, daily_buffer = render_cashflow_plot(df, "Daily Ending Cash")
     st.subheader("Daily Cashflow")
-    st.pyplot(daily_fig)
+    cashflow_slot = st.empty()
+    if use_surrogate:
+        surrogate = request_surrogate(data, days, assistants, selected_assets, selected_upgrades)
+        with cashflow_slot.container():
+            if surrogate is None:
+                st.caption("Building the surrogate grid in the background — exact results below in the meantime.")
+            else:
+                prediction = surrogate.predict(config)
+                preview_df = pd.DataFrame({"day": np.arange(1, days + 1), "cash_end": prediction.cash_end})
+                preview_fig, _ = render_cashflow_plot(
+                    preview_df, "Daily Ending Cash (surrogate preview)", band=prediction.error_estimate
+                )
+                st.pyplot(preview_fig)
+                plt.close(preview_fig)
+                note = "outside the grid, clamped to its edges" if prediction.extrapolated else "interpolated"
+                st.caption(
+                    f"Preview {note}: final cash ≈ ${prediction.cash_end[-1]:,.0f} "
+                    f"± ${prediction.error_estimate[-1]:,.0f} (typical error, not a guarantee). Exact run in progress…"
+                )
+
+    prefetcher = simulation_prefetcher()
+    moved_slider = last_moved_slider(slider_values(days, assistants, config))
+    run_key = simulation_key(days, assistants, config)
+    cached_run = prefetcher.get(run_key)
+    if cached_run is None:
+        prefetcher.cancel()
+        df, metrics = run_workbench_simulation(data, days, assistants, config)
+        prefetcher.put(run_key, (df, metrics))
+    else:
+        df, metrics = cached_run
+    prefetcher.prefetch(data, neighbor_requests(days, assistants, config, moved_slider))
+    daily_fig, daily_buffer = render_cashflow_plot(df, "Daily Ending Cash")
+    # Replaces the whole slot, including the preview's "exact run in progress" caption.
+    cashflow_slot.pyplot(daily_fig)
 
     baseline_daily = metrics.as_daily()
     roi_df = compute_education_roi(data, metrics, baseline_daily, horizon_days=days)
@@ -302,36 +790,95 @@ def main() -> None:
     st.pyplot(roi_fig)
 
     base_value = getattr(config, param_choice)
-    values = np.linspace(base_value / span, base_value * span, samples)
-    x, y = compute_sensitivity(
-        data,
-        config,
+    scan = (
         param_choice,
-        values,
+        sampling,
+        base_value / span,
+        base_value * span,
+        samples if sampling == "Uniform" else run_budget,
         days,
         assistants,
-        selected_assets,
-        selected_upgrades,
     )
-    sensitivity_fig, sensitivity_buffer = render_sensitivity_plot(x, y, {
+    sensitivity_label = {
         "blog_income_multiplier": "Blog Income Multiplier",
         "freelance_income_multiplier": "Freelance Income Multiplier",
         "survey_income_multiplier": "Survey Income Multiplier",
-    }[param_choice])
+    }[param_choice]
 
     st.subheader("Sensitivity Explorer")
-    st.pyplot(sensitivity_fig)
+    progress = request_sensitivity(data, config, *scan)
+    if progress.done:
+        sensitivity_buffer = show_sensitivity(progress, sensitivity_label, sampling)
+    else:
+        stream_sensitivity(data, config, *scan, sensitivity_label)
+        # Snapshots taken mid-scan export the partial curve.
+        partial_fig, sensitivity_buffer = render_sensitivity_plot(progress.x, progress.y, sensitivity_label)
+        plt.close(partial_fig)
+
+    snapshot_buffers = {
+        "cashflow": daily_buffer,
+        "education_roi": roi_buffer,
+        "sensitivity": sensitivity_buffer,
+    }
+    if show_frontier:
+        st.subheader("Trade-off Frontier")
+        sweep, frontier = compute_frontier(
+            data,
+            load_dataset(DATA_PATH).digest,
+            frontier_samples,
+            days,
+            config,
+            tuple(selected_assets),
+            tuple(selected_upgrades),
+        )
+        hours_columns = ["hours_freelance", "hours_survey", "hours_asset_setup", "hours_asset_maintenance"]
+        current = (float(df[hours_columns].to_numpy().sum()), float(df["cash_end"].iloc[-1]))
+        frontier_fig, frontier_buffer = render_frontier_plot(sweep, frontier, current)
+        st.pyplot(frontier_fig)
+        st.caption(f"{int(frontier.sum())} of {len(sweep)} sampled configs are non-dominated.")
+        st.dataframe(sweep[frontier].sort_values("final_cash", ascending=False), use_container_width=True)
+        snapshot_buffers["frontier"] = frontier_buffer
+
+    with st.expander("Results Warehouse"):
+        st.caption(f"Recorded runs live in `{DB_PATH.relative_to(ROOT)}`; lookups skip re-simulating.")
+        if st.button("Record This Run"):
+            record_runs(
+                data,
+                [config],
+                days=days,
+                assistants=assistants,
+                asset_ids=selected_assets,
+                upgrade_ids=selected_upgrades,
+                daily=True,
+            )
+            st.success("Recorded the current inputs.")
+        if not DB_PATH.exists():
+            st.info("Nothing recorded yet — record a run or use `python -m scripts.economy_warehouse record`.")
+        else:
+            max_recorded_assistants = st.number_input(
+                "Max Assistants", min_value=0, max_value=10, value=int(assistants)
+            )
+            exact_assets = st.checkbox(
+                "Exact Asset Mix", value=False, help="Otherwise any run that includes these assets matches."
+            )
+            warehouse, warehouse_lock = results_warehouse()
+            with warehouse_lock:
+                best_runs = warehouse.query(
+                    data_hash=load_dataset(DATA_PATH).digest,
+                    days=days,
+                    max_assistants=int(max_recorded_assistants),
+                    assets=selected_assets,
+                    exact_assets=exact_assets,
+                    limit=10,
+                )
+            if best_runs.empty:
+                st.info("No recorded runs match these filters yet.")
+            else:
+                st.dataframe(best_runs, use_container_width=True)
 
     st.subheader("Snapshot")
     if st.button("Save PNG Snapshots"):
-        save_snapshot(
-            "balancing_workbench",
-            {
-                "cashflow": daily_buffer,
-                "education_roi": roi_buffer,
-                "sensitivity": sensitivity_buffer,
-            },
-        )
+        save_snapshot("balancing_workbench", snapshot_buffers)
         st.success("Saved current plots to docs/archive/economy_sim_report_assets")
 
     st.markdown("---")